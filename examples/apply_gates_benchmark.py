@@ -0,0 +1,44 @@
+# example/apply_gates_benchmark.py
+#    2026/10/19
+#    Author: Peixun Long
+#    Computing Center, Institute of High Energy Physics, CAS
+
+# Building a random circuit of 10^5 gates by apply_gate calls vs. one apply_gates call,
+#   on CircuitIO and on the installed quantum frameworks
+
+import importlib, sys, time
+# The frameworks should be imported before PyQuantumKit
+for module in ('qiskit', 'pyqpanda3.core', 'quafu', 'quafu.elements.element_gates', 'cqlib'):
+    try:
+        importlib.import_module(module)
+    except ImportError:
+        pass
+import pyquantumkit as PQK
+from qasm_benchmark import random_gates
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 100000     # number of gates
+NQ = 20                                                     # number of qubits
+
+
+def build_by_apply_gate(framework : str, gates : list):
+    qc = PQK.new_circuit(framework, NQ)
+    for (g, qbits, paras) in gates:
+        PQK.apply_gate(qc, g, qbits, paras)
+    return qc
+
+def build_by_apply_gates(framework : str, gates : list):
+    return PQK.apply_gates(PQK.new_circuit(framework, NQ), gates)
+
+
+if __name__ == '__main__':
+    gates = random_gates(N, NQ)
+    for framework in ['pyquantumkit'] + list(PQK.Framework_Namespace):
+        start = time.perf_counter()
+        qc1 = build_by_apply_gate(framework, gates)
+        t_gate = time.perf_counter() - start
+        start = time.perf_counter()
+        qc2 = build_by_apply_gates(framework, gates)
+        t_gates = time.perf_counter() - start
+        assert PQK.get_circuit_hash(qc1) == PQK.get_circuit_hash(qc2)
+        print('%-12s gates=%d  apply_gate=%.3fs  apply_gates=%.3fs  speedup=%.1fx' %
+              (framework, N, t_gate, t_gates, t_gate / t_gates))
@@ -0,0 +1,47 @@
+# example/binary_benchmark.py
+#    2026/10/19
+#    Author: Peixun Long
+#    Computing Center, Institute of High Energy Physics, CAS
+
+# Size and save/load time of a random circuit of 10^5 gates in the binary format (procedure/circuit_binary.py),
+#   compared with pickle and OpenQASM
+
+import io, os, pickle, sys, tempfile, time
+import pyquantumkit as PQK
+from pyquantumkit.procedure.circuit_binary import circuit_to_bytes, circuit_from_bytes, \
+                                                  save_circuit_binary, load_circuit_binary
+from pyquantumkit.procedure.qasm import circuit_to_qasm, circuit_from_qasm
+from qasm_benchmark import random_gates
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 100000     # number of gates
+NQ = 20                                                     # number of qubits
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    ret = func(*args)
+    return (ret, time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    cio = PQK.CircuitIO(NQ)
+    for (g, qbits, paras) in random_gates(N, NQ):
+        cio.apply_gate(g, qbits, paras)
+
+    formats = [
+        ('pickle', pickle.dumps, pickle.loads),
+        ('OpenQASM 2', circuit_to_qasm, circuit_from_qasm),
+        ('binary', circuit_to_bytes, circuit_from_bytes),
+    ]
+    for (name, dumps, loads) in formats:
+        (data, t_save) = timed(dumps, cio)
+        (loaded, t_load) = timed(loads, data)
+        assert loaded.get_hash() == cio.get_hash()
+        print('%-11s gates=%d  size=%8.1f KB  save=%.3fs  load=%.3fs' % (name, len(cio), len(data) / 1024, t_save, t_load))
+
+    fname = os.path.join(tempfile.mkdtemp(prefix='pqk_'), 'circuit.pqkc')
+    (_, t_save) = timed(save_circuit_binary, cio, fname)
+    (_, t_load) = timed(load_circuit_binary, fname)
+    print('%-11s gates=%d  size=%8.1f KB  save=%.3fs  load=%.3fs' %
+          ('binary file', len(cio), os.path.getsize(fname) / 1024, t_save, t_load))
+    os.remove(fname)
@@ -0,0 +1,57 @@
+# example/fusion_benchmark.py
+#    2026/10/19
+#    Author: Peixun Long
+#    Computing Center, Institute of High Energy Physics, CAS
+
+# Speedup of gate fusion in StatevectorSimulator, on the Trotter circuit of examples/tf_ising.py
+#   (built by apply_exp_pauli) and on layers built by create_state_by_sqgate_str / multi_apply_sqgate
+
+import sys, time
+import pyquantumkit as PQK
+import pyquantumkit.library.hamiltonian as PQKHami
+from pyquantumkit.state_prepare.by_string import create_state_by_sqgate_str
+from pyquantumkit.simulator.fusion import fuse_gates
+from pyquantumkit.simulator.statevector import StatevectorSimulator
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 20      # number of qubits
+Fusion = [0, 1, 2, 3, 4]                                # maximum qubits of fused blocks
+
+
+def trotter_circuit(nqbits : int, t : float = 1.0, n : int = 20) -> PQK.CircuitIO:
+    TFIsing = PQKHami.PauliHamiltonian(nqbits)
+    for i in range(nqbits):
+        zz = ['I'] * nqbits
+        zz[i] = zz[(i + 1) % nqbits] = 'Z'
+        TFIsing.append_pauli(''.join(zz), -1.0)
+        x = ['I'] * nqbits
+        x[i] = 'X'
+        TFIsing.append_pauli(''.join(x), -1.0)
+    cio = PQK.CircuitIO(nqbits)
+    PQKHami.pqk_hsim_paulis_trotter(cio, TFIsing, t, n, list(range(nqbits)))
+    return cio
+
+
+def layered_circuit(nqbits : int, nlayers : int = 10) -> PQK.CircuitIO:
+    cio = PQK.CircuitIO(nqbits)
+    for layer in range(nlayers):
+        create_state_by_sqgate_str(cio, ('HSTX' * nqbits)[layer % 4 : layer % 4 + nqbits], list(range(nqbits)))
+        PQK.multi_apply_sqgate(cio, 'RY', list(range(nqbits)), [0.1 * layer])
+        for i in range(layer % 2, nqbits - 1, 2):
+            PQK.apply_gate(cio, 'CX', [i, i + 1])
+            PQK.apply_gate(cio, 'RZ', [i + 1], [0.3])
+            PQK.apply_gate(cio, 'CX', [i, i + 1])
+    return cio
+
+
+if __name__ == '__main__':
+    print('Qubits:', N)
+    for (name, cio) in (('Trotter', trotter_circuit(N)), ('Layered', layered_circuit(N))):
+        base = None
+        for k in Fusion:
+            qvm = StatevectorSimulator(fusion=k)
+            start = time.perf_counter()
+            qvm.get_statevector(cio)
+            elapsed = time.perf_counter() - start
+            base = elapsed if base is None else base
+            print('%-8s fusion=%d  gates=%-6d blocks=%-6d time=%8.3fs  speedup=%5.2f' %
+                  (name, k, len(cio), len(fuse_gates(cio, k)), elapsed, base / elapsed))
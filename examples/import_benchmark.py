@@ -0,0 +1,36 @@
+# example/import_benchmark.py
+#    2026/10/19
+#    Author: Peixun Long
+#    Computing Center, Institute of High Energy Physics, CAS
+
+# Importing a random circuit of 10^5 gates built natively in the installed quantum frameworks into CircuitIO
+
+import importlib, sys, time
+# The frameworks should be imported before PyQuantumKit
+for module in ('qiskit', 'pyqpanda3.core', 'quafu', 'quafu.elements.element_gates', 'cqlib'):
+    try:
+        importlib.import_module(module)
+    except ImportError:
+        pass
+import pyquantumkit as PQK
+from qasm_benchmark import random_gates
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 100000     # number of gates
+NQ = 20                                                     # number of qubits
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    ret = func(*args)
+    return (ret, time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    gates = random_gates(N, NQ)
+    expected = PQK.apply_gates(PQK.CircuitIO(NQ), gates).get_hash()
+    for framework in PQK.Framework_Namespace:
+        qc = PQK.apply_gates(PQK.new_circuit(framework, NQ), gates)
+        (cio, t_import) = timed(PQK.import_circuit, qc)
+        same = 'same' if cio.get_hash() == expected else 'decomposed'
+        print('%-12s gates=%d  imported=%d (%s)  import=%.3fs  %.0f gates/s' %
+              (framework, N, len(cio), same, t_import, len(cio) / t_import))
@@ -0,0 +1,54 @@
+# example/pickle_benchmark.py
+#    2026/10/19
+#    Author: Peixun Long
+#    Computing Center, Institute of High Energy Physics, CAS
+
+# Bytes and time of pickling CircuitIO objects of 10^5 gates (numeric and symbolic parameters):
+#   pickling the nested gate lists vs. CircuitIO.__reduce__ (compact binary format, lazily decoded),
+#   and the round trip through a ProcessPoolExecutor worker
+
+import pickle, sys, time, sympy
+from concurrent.futures import ProcessPoolExecutor
+import pyquantumkit as PQK
+from qasm_benchmark import random_gates
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 100000     # number of gates
+NQ = 20                                                     # number of qubits
+
+
+def build(symbolic : bool) -> PQK.CircuitIO:
+    thetas = sympy.symbols('theta0:%d' % NQ, real=True)
+    cio = PQK.CircuitIO(NQ)
+    for (g, qbits, paras) in random_gates(N, NQ):
+        if symbolic and paras is not None:
+            paras = [2 * thetas[qbits[0]] + paras[0]]
+        cio.apply_gate(g, qbits, paras)
+    return cio
+
+def ngates(cio : PQK.CircuitIO) -> int:
+    return len(cio)
+
+def timed(func, *args):
+    start = time.perf_counter()
+    ret = func(*args)
+    return (ret, time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    for symbolic in (False, True):
+        cio = build(symbolic)
+        name = 'symbolic' if symbolic else 'numeric'
+        state = (cio.get_nqbits(), cio.get_ncbits(), list(cio))
+        (data, t_dump) = timed(pickle.dumps, state)
+        (_, t_load) = timed(pickle.loads, data)
+        print('%-8s gate lists  bytes=%9d  dumps=%.3fs  loads=%.3fs' % (name, len(data), t_dump, t_load))
+        (data, t_dump) = timed(pickle.dumps, cio)
+        (loaded, t_load) = timed(pickle.loads, data)
+        (_, t_first) = timed(ngates, loaded)
+        print('%-8s CircuitIO   bytes=%9d  dumps=%.3fs  loads=%.3fs  first use=%.3fs' %
+              (name, len(data), t_dump, t_load, t_first))
+        with ProcessPoolExecutor(1) as pool:
+            pool.submit(ngates, PQK.CircuitIO()).result()
+            (n, t_pool) = timed(lambda : pool.submit(ngates, cio).result())
+        assert n == len(cio)
+        print('%-8s ProcessPoolExecutor round trip=%.3fs' % (name, t_pool))
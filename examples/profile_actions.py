@@ -0,0 +1,42 @@
+# example/profile_actions.py
+#    2026/10/19
+#    Author: Peixun Long
+#    Computing Center, Institute of High Energy Physics, CAS
+
+# Profiling the quantum actions of building and running a random program on the installed quantum frameworks:
+#   the table of call counts and cumulative time, and the timeline in the Chrome trace format
+#   (open the written file in chrome://tracing or https://ui.perfetto.dev)
+
+import importlib, os, sys, tempfile
+# The frameworks should be imported before PyQuantumKit
+for module in ('qiskit', 'qiskit_aer', 'pyqpanda3.core', 'quafu', 'quafu.elements.element_gates', 'cqlib'):
+    try:
+        importlib.import_module(module)
+    except ImportError:
+        pass
+import pyquantumkit as PQK
+from pyquantumkit.simulator.statevector import StatevectorSimulator
+from qasm_benchmark import random_gates
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 2000     # number of gates
+NQ = 10                                                   # number of qubits
+MACHINES = {'pyquantumkit' : StatevectorSimulator(seed=1)}
+if 'qiskit_aer' in sys.modules:
+    MACHINES['qiskit'] = sys.modules['qiskit_aer'].Aer.get_backend('aer_simulator')
+
+
+if __name__ == '__main__':
+    gates = random_gates(N, NQ)
+    with PQK.profile() as p:
+        for (framework, machine) in MACHINES.items():
+            qp = PQK.new_program(framework, NQ, NQ)
+            for (g, qbits, paras) in gates[:N // 2]:
+                PQK.apply_gate(qp, g, qbits, paras)
+            PQK.apply_gates(qp, gates[N // 2:])
+            PQK.apply_measure(qp, list(range(NQ)), list(range(NQ)))
+            PQK.run_and_get_counts(machine, qp, 1000)
+    print(p.summary())
+    print(p.to_dict()['gates'])
+    fname = os.path.join(tempfile.mkdtemp(prefix='pqk_'), 'trace.json')
+    p.to_chrome_trace(fname)
+    print('Chrome trace written into', fname)
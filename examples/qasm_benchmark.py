@@ -0,0 +1,52 @@
+# example/qasm_benchmark.py
+#    2026/10/19
+#    Author: Peixun Long
+#    Computing Center, Institute of High Energy Physics, CAS
+
+# Loading a circuit from an OpenQASM file (load_qasm) vs. rebuilding it by apply_gate calls,
+#   on a random circuit of 10^5 gates
+
+import os, random, sys, tempfile, time
+import pyquantumkit as PQK
+from pyquantumkit.procedure.qasm import load_qasm, save_qasm
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 100000     # number of gates
+NQ = 20                                                     # number of qubits
+
+
+def random_gates(ngates : int, nqbits : int) -> list:
+    rng = random.Random(2026)
+    gates = []
+    for i in range(ngates):
+        r = rng.random()
+        if r < 0.4:
+            gates.append((rng.choice(['H', 'X', 'S', 'T', 'SX']), [rng.randrange(nqbits)], None))
+        elif r < 0.7:
+            gates.append((rng.choice(['RX', 'RY', 'RZ']), [rng.randrange(nqbits)], [rng.uniform(-3, 3)]))
+        else:
+            gates.append((rng.choice(['CX', 'CZ', 'RZZ']), rng.sample(range(nqbits), 2), None))
+            if gates[-1][0] == 'RZZ':
+                gates[-1] = ('RZZ', gates[-1][1], [rng.uniform(-3, 3)])
+    return gates
+
+
+if __name__ == '__main__':
+    gates = random_gates(N, NQ)
+    start = time.perf_counter()
+    cio = PQK.CircuitIO(NQ)
+    for (g, qbits, paras) in gates:
+        PQK.apply_gate(cio, g, qbits, paras)
+    t_build = time.perf_counter() - start
+
+    fname = os.path.join(tempfile.mkdtemp(prefix='pqk_'), 'circuit.qasm')
+    for version in (2, 3):
+        start = time.perf_counter()
+        save_qasm(cio, fname, version)
+        t_save = time.perf_counter() - start
+        start = time.perf_counter()
+        loaded = load_qasm(fname)
+        t_load = time.perf_counter() - start
+        assert loaded.get_hash() == cio.get_hash()
+        print('OpenQASM %d  gates=%d  file=%.1f MB  save=%.3fs  load=%.3fs  apply_gate=%.3fs  load/apply_gate=%.2f' %
+              (version, len(cio), os.path.getsize(fname) / 2 ** 20, t_save, t_load, t_build, t_load / t_build))
+    os.remove(fname)
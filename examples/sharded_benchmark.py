@@ -0,0 +1,56 @@
+# example/sharded_benchmark.py
+#    2026/10/19
+#    Author: Peixun Long
+#    Computing Center, Institute of High Energy Physics, CAS
+
+# Throughput of ShardedStatevectorSimulator vs. the number of worker processes,
+#   on QFT (pqk_qft_bilo) and Trotter circuits of the transverse-field Ising model
+
+import os, sys, time
+import pyquantumkit as PQK
+import pyquantumkit.library.hamiltonian as PQKHami
+from pyquantumkit.library.qft import pqk_qft_bilo
+from pyquantumkit.simulator.sharded import ShardedStatevectorSimulator
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 24      # number of qubits
+Workers = [1, 2, 4, 8, 16]                              # numbers of worker processes
+Nshots = 1000
+
+
+def qft_circuit(nqbits : int) -> PQK.CircuitIO:
+    cio = PQK.CircuitIO(nqbits, nqbits)
+    for i in range(0, nqbits, 2):
+        PQK.apply_gate(cio, 'X', [i])
+    pqk_qft_bilo(cio, list(range(nqbits)))
+    PQK.apply_measure(cio, list(range(nqbits)), list(range(nqbits)))
+    return cio
+
+
+def trotter_circuit(nqbits : int, t : float = 1.0, n : int = 4) -> PQK.CircuitIO:
+    TFIsing = PQKHami.PauliHamiltonian(nqbits)
+    for i in range(nqbits):
+        zz = ['I'] * nqbits
+        zz[i] = zz[(i + 1) % nqbits] = 'Z'
+        TFIsing.append_pauli(''.join(zz), -1.0)
+        x = ['I'] * nqbits
+        x[i] = 'X'
+        TFIsing.append_pauli(''.join(x), -1.0)
+    cio = PQK.CircuitIO(nqbits, nqbits)
+    PQKHami.pqk_hsim_paulis_trotter(cio, TFIsing, t, n, list(range(nqbits)))
+    PQK.apply_measure(cio, list(range(nqbits)), list(range(nqbits)))
+    return cio
+
+
+if __name__ == '__main__':
+    print('Qubits:', N, ' Cores:', os.cpu_count())
+    for (name, cio) in (('QFT', qft_circuit(N)), ('Trotter', trotter_circuit(N))):
+        ngates = len(cio)
+        base = None
+        for nworkers in Workers:
+            with ShardedStatevectorSimulator(nworkers, seed=2026) as qvm:
+                start = time.perf_counter()
+                qvm.run(cio, Nshots)
+                elapsed = time.perf_counter() - start
+            base = elapsed if base is None else base
+            print('%-8s workers=%-3d shards=%-3d time=%8.3fs  gates/s=%10.1f  speedup=%5.2f' %
+                  (name, nworkers, qvm.get_nshards(N), elapsed, ngates / elapsed, base / elapsed))
@@ -33,6 +33,18 @@ def FN(fm_name : str, index : int = 0):
 class PyQuantumKitError(Exception):
     pass
 
+# the error raised when running quantum programs on quantum machines
+class QuantumRunError(PyQuantumKitError):
+    pass
+
+# the error of transient failures in running (e.g. network or queue), which can be retried
+class TransientRunError(QuantumRunError):
+    pass
+
+# the error raised when running exceeds the timeout
+class RunTimeoutError(QuantumRunError, TimeoutError):
+    pass
+
 def pyquantumkit_init():
     # Load and initialize supported quantum frameworks
     current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -5,8 +5,11 @@
 
 from .extra._qsharp import CODE as QSharp_CODE
 from .extra._isq import CODE as isQ_CODE
+from .extra._qasm import CODE2 as QASM2_CODE, CODE3 as QASM3_CODE
 
 Extra_Languages_CODE = {
     'QSharp' : QSharp_CODE, 'Q#' : QSharp_CODE,
     'isQ' : isQ_CODE,
+    'OpenQASM2' : QASM2_CODE, 'QASM2' : QASM2_CODE,
+    'OpenQASM3' : QASM3_CODE, 'QASM3' : QASM3_CODE,
 }
@@ -13,6 +13,12 @@ REVERSE_OUTPUT_STRING = False
 SUPPORT_INVERSE = False
 # Wether support remap the index of bits
 SUPPORT_REMAP = False
+# Wether support running a list of programs in one submission
+SUPPORT_BATCH_RUN = False
+# Wether RUN can be called concurrently from several threads
+SUPPORT_PARALLEL_RUN = False
+# Wether support native parameterized circuits
+SUPPORT_PARAMETER = False
 # List of supported algorithms
 SUPPORT_ALGORITHMS = []
 
@@ -119,8 +125,11 @@ def CODE(cir_name : str, gate_lib_name : str,
     return execstr
 
 
+# The gate library name in the code of GATE
+GATE_LIB = "FN('cqlib')"
+
 def GATE(gate_name : str, qbits : list[int], paras : list) -> str:
-    return CODE("qc", "FN('cqlib')", gate_name, qbits, paras)
+    return CODE("qc", GATE_LIB, gate_name, qbits, paras)
 
 
 def CIRCUIT(is_remap : bool, is_inv : bool) -> str:
@@ -147,3 +156,56 @@ def RUN(line : int, **kwargs) -> str:
     # unsupport
     raise PyQuantumKitError('Running are not supported by cqlib.')
 
+
+def RUN_BATCH(line : int, **kwargs) -> str:
+    # unsupport
+    raise PyQuantumKitError('Running are not supported by cqlib.')
+
+
+def PARAM() -> str:
+    # unsupport
+    raise PyQuantumKitError('Native parameterized circuits are not supported by cqlib.')
+
+
+def BIND() -> str:
+    # unsupport
+    raise PyQuantumKitError('Native parameterized circuits are not supported by cqlib.')
+
+
+# Canonical text of the circuit, used by the structural hash
+def TEXT() -> str:
+    return "qc.qcis"
+
+
+def _import_fixed_rotation(std : str, theta : float) -> callable:
+    # The gate is the rotation <std> of the fixed angle <theta>
+    return lambda qbits, paras : [(std, qbits, [theta])]
+
+# The standard gate names of the cqlib instructions which can be imported into CircuitIO (keyed by the upper names)
+IMPORT_GATE_NAME = {
+    'I' : lambda qbits, paras : [('I', qbits, None)],     # the parameter of I gate is its duration
+    'X' : 'X', 'Y' : 'Y', 'Z' : 'Z', 'S' : 'S', 'T' : 'T', 'H' : 'H', 'SD' : 'SD', 'TD' : 'TD',
+    'CX' : 'CX', 'CY' : 'CY', 'CZ' : 'CZ', 'SWAP' : 'SW', 'CCX' : 'CCX',
+    'RX' : 'RX', 'RY' : 'RY', 'RZ' : 'RZ', 'CRX' : 'CRX', 'CRY' : 'CRY', 'CRZ' : 'CRZ', 'U' : 'U3',
+    'X2P' : _import_fixed_rotation('RX', math.pi / 2), 'X2M' : _import_fixed_rotation('RX', -math.pi / 2),
+    'Y2P' : _import_fixed_rotation('RY', math.pi / 2), 'Y2M' : _import_fixed_rotation('RY', -math.pi / 2),
+    'M' : 'M', 'MEASURE' : 'M',
+}
+# The instructions without effect on the gates, which are skipped in importing
+IMPORT_IGNORED = {'B', 'BARRIER'}
+
+# Translate the circuit into the list <records> of (instruction name, qubits, parameters or cbits),
+#   and the numbers <nqbits> and <ncbits> of qubits and cbits.
+#   The measurements of cqlib have no cbits, so the results are put in the cbits by the order of measuring.
+def IMPORT() -> str:
+    return "records=[]\n" + \
+           "ncbits=0\n" + \
+           "for ins in qc.circuit_data:\n" + \
+           "    name=ins.instruction.name.upper()\n" + \
+           "    qbits=[q.index for q in ins.qubits]\n" + \
+           "    if name in ('M','MEASURE'):\n" + \
+           "        records.append((name,qbits,list(range(ncbits,ncbits+len(qbits)))))\n" + \
+           "        ncbits+=len(qbits)\n" + \
+           "    else:\n" + \
+           "        records.append((name,qbits,list(ins.instruction.params)))\n" + \
+           "nqbits=" + BITS(False, False)
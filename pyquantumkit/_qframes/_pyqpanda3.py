@@ -4,6 +4,7 @@
 #    Computing Center, Institute of High Energy Physics, CAS
 
 from .code_translate import get_standard_gatename
+from pyquantumkit import PyQuantumKitError
 
 # Whether the reverse of output 0/1 string is required to let the index of characters match corresponding cbits
 REVERSE_OUTPUT_STRING = True
@@ -11,6 +12,12 @@ REVERSE_OUTPUT_STRING = True
 SUPPORT_INVERSE = True
 # Wether support remap the index of bits
 SUPPORT_REMAP = True
+# Wether support running a list of programs in one submission
+SUPPORT_BATCH_RUN = False
+# Wether RUN can be called concurrently from several threads
+SUPPORT_PARALLEL_RUN = False
+# Wether support native parameterized circuits
+SUPPORT_PARAMETER = False
 # List of supported algorithms
 SUPPORT_ALGORITHMS = []
 
@@ -78,8 +85,11 @@ def CODE(cir_name : str, gate_lib_name : str,
 
 
 # Translate the gate applying into the code of calling in pyqpanda3
+# The gate library name in the code of GATE
+GATE_LIB = "FN('pyqpanda3')"
+
 def GATE(gate_name : str, qbits : list[int], paras : list) -> str:
-    return CODE("qc", "FN('pyqpanda3')", gate_name, qbits, paras)
+    return CODE("qc", GATE_LIB, gate_name, qbits, paras)
 
 
 # Translate the circuit applying into the code of calling in pyqpanda3
@@ -123,3 +133,74 @@ def RUN(line : int, **kwargs) -> str:
     if line == 2:
         return "qvm.result().get_counts()"
     return ""
+
+
+def RUN_BATCH(line : int, **kwargs) -> str:
+    # unsupport: the result is stored in the qvm, so the programs are run one by one
+    raise PyQuantumKitError('Batch running is not supported by pyqpanda3.')
+
+
+def PARAM() -> str:
+    # unsupport
+    raise PyQuantumKitError('Native parameterized circuits are not supported by pyqpanda3.')
+
+
+def BIND() -> str:
+    # unsupport
+    raise PyQuantumKitError('Native parameterized circuits are not supported by pyqpanda3.')
+
+
+# Canonical text of the circuit, used by the structural hash
+def TEXT() -> str:
+    return "qc.originir()"
+
+
+# The standard gate names of the pyqpanda3 gates which can be imported into CircuitIO,
+#   keyed by 'C' * <number of control qubits> + <gate name> (+ '.dagger' for the daggered gates)
+IMPORT_GATE_NAME = {
+    'I' : 'I', 'X' : 'X', 'Y' : 'Y', 'Z' : 'Z', 'S' : 'S', 'T' : 'T', 'H' : 'H',
+    'S.dagger' : 'SD', 'T.dagger' : 'TD', 'CNOT' : 'CX', 'CX' : 'CX', 'CZ' : 'CZ',
+    'SWAP' : 'SW', 'ISWAP' : 'ISW', 'TOFFOLI' : 'CCX', 'CCNOT' : 'CCX',
+    'CH' : 'CH', 'CY' : 'CY', 'CS' : 'CS', 'CS.dagger' : 'CSD', 'CCZ' : 'CCZ', 'CSWAP' : 'CSW',
+    'RX' : 'RX', 'RY' : 'RY', 'RZ' : 'RZ', 'RXX' : 'RXX', 'RYY' : 'RYY', 'RZZ' : 'RZZ',
+    'CRX' : 'CRX', 'CRY' : 'CRY', 'CRZ' : 'CRZ', 'U1' : 'U1', 'P' : 'U1', 'CR' : 'CU1', 'CP' : 'CU1',
+    'CU1' : 'CU1', 'U3' : 'U3', 'MEASURE' : 'M',
+}
+
+def _import_dagger_rotation(std : str) -> callable:
+    # The dagger of a rotation gate is the gate of negative angle
+    return lambda qbits, paras : [(std, qbits, [-paras[0]])]
+
+# The daggers of the self-inverse gates and of the rotations
+IMPORT_GATE_NAME.update({g + '.dagger' : IMPORT_GATE_NAME[g] for g in
+                         ('I', 'X', 'Y', 'Z', 'H', 'CNOT', 'CX', 'CZ', 'SWAP', 'TOFFOLI', 'CCNOT',
+                          'CH', 'CY', 'CCZ', 'CSWAP')})
+IMPORT_GATE_NAME.update({g + '.dagger' : _import_dagger_rotation(IMPORT_GATE_NAME[g]) for g in
+                         ('RX', 'RY', 'RZ', 'RXX', 'RYY', 'RZZ', 'CRX', 'CRY', 'CRZ', 'U1', 'P', 'CR', 'CP', 'CU1')})
+IMPORT_GATE_NAME['U3.dagger'] = lambda qbits, paras : [('U3', qbits, [-paras[0], -paras[2], -paras[1]])]
+# The instructions without effect on the gates, which are skipped in importing
+IMPORT_IGNORED = {'BARRIER', 'BARRIER.dagger'}
+
+# Translate the circuit into the list <records> of (instruction name, qubits, parameters or cbits),
+#   and the numbers <nqbits> and <ncbits> of qubits and cbits.
+#   The sub-circuits are walked into (the daggered or controlled sub-circuits are rejected),
+#   and the controlled gates are named with a 'C' for each control qubit.
+def IMPORT() -> str:
+    return "records=[]\n" + \
+           "def walk(ops):\n" + \
+           "    for op in ops:\n" + \
+           "        kind=type(op).__name__\n" + \
+           "        if kind in ('QCircuit','QProg'):\n" + \
+           "            if (getattr(op,'is_dagger',None) and op.is_dagger()) or " + \
+           "(getattr(op,'control_qubits',None) and list(op.control_qubits())):\n" + \
+           "                raise PyQuantumKitError('The daggered or controlled sub-circuit cannot be imported!')\n" + \
+           "            walk(op.operations())\n" + \
+           "        elif kind=='QMeasure':\n" + \
+           "            records.append(('MEASURE',list(op.qubits()),list(op.cbits())))\n" + \
+           "        else:\n" + \
+           "            ctrl=list(op.control_qubits())\n" + \
+           "            records.append(('C'*len(ctrl)+op.name()+('.dagger' if op.is_dagger() else '')," + \
+           "ctrl+[q for q in op.qubits() if q not in ctrl],list(op.parameters())))\n" + \
+           "walk(qc.operations())\n" + \
+           "nqbits=" + BITS(False, False) + "\n" + \
+           "ncbits=" + BITS(True, False)
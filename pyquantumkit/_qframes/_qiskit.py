@@ -11,6 +11,12 @@ REVERSE_OUTPUT_STRING = True
 SUPPORT_INVERSE = True
 # Wether support remap the index of bits
 SUPPORT_REMAP = True
+# Wether support running a list of programs in one submission
+SUPPORT_BATCH_RUN = True
+# Wether RUN can be called concurrently from several threads
+SUPPORT_PARALLEL_RUN = True
+# Wether support native parameterized circuits
+SUPPORT_PARAMETER = True
 # List of supported algorithms
 SUPPORT_ALGORITHMS = []
 
@@ -56,8 +62,11 @@ def CODE(cir_name : str, gate_lib_name : str,
     return execstr
 
 
+# The gate library name in the code of GATE
+GATE_LIB = "FN('qiskit')"
+
 def GATE(gate_name : str, qbits : list[int], paras : list) -> str:
-    return CODE("qc", "FN('qiskit')", gate_name, qbits, paras)
+    return CODE("qc", GATE_LIB, gate_name, qbits, paras)
 
 
 def CIRCUIT(is_remap : bool, is_inv : bool) -> str:
@@ -93,9 +102,78 @@ def BITS(ret_cbit : bool, ret_list : bool) -> str:
         return "qc.num_clbits" if ret_cbit else "qc.num_qubits"
 
 
+# Circuits are transpiled only if they contain instructions not supported by the backend
+_TRANSPILE = "if not set(tqc.count_ops())<=set(getattr(qvm,'operation_names',tqc.count_ops())):\n" + \
+             "    tqc=FN('qiskit').transpile(tqc,qvm)\n"
+
+# Programs without measurements have no counts in qiskit results, return {} for them
 def RUN(line : int, **kwargs) -> str:
     if line == 1:
-        return "job=qvm.run(qc,shots=run_shots)"
+        return "tqc=qc\n" + _TRANSPILE + "job=qvm.run(tqc,shots=run_shots)"
     if line == 2:
-        return "job.result().get_counts()"
+        return "job.result().get_counts() if qc.count_ops().get('measure') else {}"
     return ""
+
+
+def RUN_BATCH(line : int, **kwargs) -> str:
+    if line == 1:
+        return "tqcs=[]\n" + \
+               "for tqc in qcs:\n" + \
+               "    " + _TRANSPILE.replace("\n", "\n    ").rstrip() + "\n" + \
+               "    tqcs.append(tqc)\n" + \
+               "job=qvm.run(tqcs,shots=run_shots)\n" + \
+               "res=job.result()\n" + \
+               "counts=[]\n" + \
+               "for i in range(len(qcs)):\n" + \
+               "    counts.append(res.get_counts(i) if qcs[i].count_ops().get('measure') else {})"
+    if line == 2:
+        return "counts"
+    return ""
+
+
+def PARAM() -> str:
+    return "FN('qiskit').circuit.Parameter(param_name)"
+
+
+def BIND() -> str:
+    return "qc.assign_parameters(bind_dict)"
+
+
+# Canonical text of the circuit, used by the structural hash
+def TEXT() -> str:
+    return "FN('qiskit').qasm3.dumps(qc)"
+
+
+# The standard gate names of the qiskit instructions which can be imported into CircuitIO
+IMPORT_GATE_NAME = {
+    'id' : 'I', 'x' : 'X', 'y' : 'Y', 'z' : 'Z', 's' : 'S', 't' : 'T', 'h' : 'H',
+    'sdg' : 'SD', 'tdg' : 'TD', 'sx' : 'SX', 'sxdg' : 'SXD',
+    'cx' : 'CX', 'cy' : 'CY', 'cz' : 'CZ', 'ch' : 'CH', 'swap' : 'SW', 'iswap' : 'ISW',
+    'cs' : 'CS', 'csdg' : 'CSD', 'ccx' : 'CCX', 'ccz' : 'CCZ', 'cswap' : 'CSW',
+    'rx' : 'RX', 'ry' : 'RY', 'rz' : 'RZ', 'rxx' : 'RXX', 'ryy' : 'RYY', 'rzz' : 'RZZ',
+    'crx' : 'CRX', 'cry' : 'CRY', 'crz' : 'CRZ', 'p' : 'U1', 'cp' : 'CU1', 'u' : 'U3',
+    'u1' : 'U1', 'cu1' : 'CU1', 'u3' : 'U3', 'measure' : 'M',
+}
+# The instructions without effect on the gates, which are skipped in importing
+IMPORT_IGNORED = {'barrier', 'delay'}
+
+# Translate the circuit into the list <records> of (instruction name, qubits, parameters or cbits),
+#   the numbers <nqbits> and <ncbits> of qubits and cbits, and the global phase <gphase>.
+#   The instructions not in <names> or <ignored> are decomposed by their definitions,
+#   and the global phases of the definitions are added to <gphase>.
+def IMPORT() -> str:
+    return "records=[]\n" + \
+           "def walk(circ,qmap,cmap):\n" + \
+           "    phase=circ.global_phase\n" + \
+           "    qidx={b:qmap[i] for (i,b) in enumerate(circ.qubits)}\n" + \
+           "    cidx={b:cmap[i] for (i,b) in enumerate(circ.clbits)}\n" + \
+           "    for inst in circ.data:\n" + \
+           "        qbits=[qidx[b] for b in inst.qubits]\n" + \
+           "        if inst.name in names or inst.name in ignored or inst.operation.definition is None:\n" + \
+           "            records.append((inst.name,qbits,[cidx[b] for b in inst.clbits] if inst.clbits else inst.params))\n" + \
+           "        else:\n" + \
+           "            phase=phase+walk(inst.operation.definition,qbits,[cidx[b] for b in inst.clbits])\n" + \
+           "    return phase\n" + \
+           "nqbits=qc.num_qubits\n" + \
+           "ncbits=qc.num_clbits\n" + \
+           "gphase=walk(qc,range(nqbits),range(ncbits))"
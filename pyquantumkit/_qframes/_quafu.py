@@ -12,6 +12,12 @@ REVERSE_OUTPUT_STRING = False
 SUPPORT_INVERSE = False
 # Wether support remap the index of bits
 SUPPORT_REMAP = False
+# Wether support running a list of programs in one submission
+SUPPORT_BATCH_RUN = False
+# Wether RUN can be called concurrently from several threads
+SUPPORT_PARALLEL_RUN = True
+# Wether support native parameterized circuits
+SUPPORT_PARAMETER = False
 # List of supported algorithms
 SUPPORT_ALGORITHMS = []
 
@@ -74,8 +80,11 @@ def CODE(cir_name : str, gate_lib_name : str,
     return execstr
 
 
+# The gate library name in the code of GATE
+GATE_LIB = "FN('quafu',1)"
+
 def GATE(gate_name : str, qbits : list[int], paras : list) -> str:
-    return CODE("qc", "FN('quafu',1)", gate_name, qbits, paras)
+    return CODE("qc", GATE_LIB, gate_name, qbits, paras)
 
 
 def CIRCUIT(is_remap : bool, is_inv : bool) -> str:
@@ -107,3 +116,59 @@ def RUN(line : int, **kwargs) -> str:
     if line == 2:
         return "res.counts"
     return ""
+
+
+def RUN_BATCH(line : int, **kwargs) -> str:
+    # unsupport: the programs are run concurrently by threads
+    raise PyQuantumKitError('Batch running is not supported by quafu.')
+
+
+def PARAM() -> str:
+    # unsupport
+    raise PyQuantumKitError('Native parameterized circuits are not supported by quafu.')
+
+
+def BIND() -> str:
+    # unsupport
+    raise PyQuantumKitError('Native parameterized circuits are not supported by quafu.')
+
+
+# Canonical text of the circuit, used by the structural hash
+def TEXT() -> str:
+    return "qc.to_openqasm()"
+
+
+def _import_multi_controlled(names : dict) -> callable:
+    # The multi-controlled gate is imported by the number of its control qubits
+    def ret(qbits : list[int], paras : list) -> list:
+        g = names.get(len(qbits) - 1)
+        if g is None:
+            raise PyQuantumKitError('Gate with ' + str(len(qbits) - 1) + ' control qubits ' +
+                                    'cannot be imported into CircuitIO!')
+        return [(g, qbits, paras)]
+    return ret
+
+# The standard gate names of the quafu gates which can be imported into CircuitIO (keyed by the upper names)
+IMPORT_GATE_NAME = {
+    'ID' : 'I', 'X' : 'X', 'Y' : 'Y', 'Z' : 'Z', 'S' : 'S', 'T' : 'T', 'H' : 'H',
+    'SDG' : 'SD', 'TDG' : 'TD', 'SX' : 'SX', 'SXDG' : 'SXD',
+    'CX' : 'CX', 'CNOT' : 'CX', 'CY' : 'CY', 'CZ' : 'CZ', 'CH' : 'CH', 'CS' : 'CS', 'CSDG' : 'CSD',
+    'SWAP' : 'SW', 'ISWAP' : 'ISW', 'CCX' : 'CCX', 'TOFFOLI' : 'CCX', 'CSWAP' : 'CSW', 'FREDKIN' : 'CSW',
+    'RX' : 'RX', 'RY' : 'RY', 'RZ' : 'RZ', 'RXX' : 'RXX', 'RYY' : 'RYY', 'RZZ' : 'RZZ',
+    'CRX' : 'CRX', 'CRY' : 'CRY', 'CRZ' : 'CRZ', 'P' : 'U1', 'CP' : 'CU1', 'U3' : 'U3',
+    'MCX' : _import_multi_controlled({0 : 'X', 1 : 'CX', 2 : 'CCX'}),
+    'MCZ' : _import_multi_controlled({0 : 'Z', 1 : 'CZ', 2 : 'CCZ'}),
+    'MEASURE' : 'M',
+}
+# The instructions without effect on the gates, which are skipped in importing
+IMPORT_IGNORED = {'BARRIER', 'DELAY'}
+
+# Translate the circuit into the list <records> of (instruction name, qubits, parameters or cbits),
+#   and the numbers <nqbits> and <ncbits> of qubits and cbits.
+#   The measurements of quafu are kept apart from the gates, so they are imported after the gates.
+def IMPORT() -> str:
+    return "records=[(g.name.upper(),g.pos if isinstance(g.pos,list) else [g.pos]," + \
+           "g.paras if isinstance(g.paras,list) else [] if g.paras is None else [g.paras]) for g in qc.gates]\n" + \
+           "records+=[('MEASURE',[q],[c]) for (q,c) in qc.measures.items()]\n" + \
+           "nqbits=qc.num\n" + \
+           "ncbits=" + BITS(True, False)
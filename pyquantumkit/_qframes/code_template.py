@@ -0,0 +1,139 @@
+# _qframes/code_template.py
+#    2026/10/19
+#    Author: Peixun Long
+#    Computing Center, Institute of High Energy Physics, CAS
+
+import re
+from functools import lru_cache
+from pyquantumkit._qframes.framework_map import gate_applying_code
+
+# Cached code templates of gates: the CODE function of a language is called once for each
+#   (language, gate, number of qubits, number of parameters) with placeholder qubits and parameters,
+#   and its output is turned into a format string. A template is used only if it reproduces the CODE
+#   function on sample arguments, otherwise the CODE function is called for every gate.
+
+_Para_Base = 700000.25
+
+class _QubitSlot(int):
+    def __str__(self) -> str:
+        return '\x00q' + str(int(self)) + 's\x00'
+    __repr__ = __str__
+
+class _ParaSlot(float):
+    def __new__(cls, index : int):
+        ret = super().__new__(cls, _Para_Base + index)
+        ret.index = index
+        return ret
+    def __str__(self) -> str:
+        return '\x00p' + str(self.index) + 's\x00'
+    def __repr__(self) -> str:
+        return '\x00p' + str(self.index) + 'r\x00'
+
+
+def float_literal(x) -> str:
+    """
+    Return the float literal of a number, which always contains '.' or 'e' (e.g. '1.0', '1e-05')
+    """
+    ret = str(float(x))
+    return ret if '.' in ret or 'e' in ret else ret + '.0'
+
+_Converters = {'s' : str, 'r' : repr, 'f' : float_literal}
+
+
+@lru_cache(maxsize=None)
+def gate_code_template(language : str, cir_name : str, gate_lib_name : str, gate_name : str,
+                       nqbits : int, nparas : int) -> tuple:
+    """
+    Return the cached code template (format string, slots) of a gate, or None if no template applies,
+        where each slot is (kind 'q'/'p', index, conversion 's'/'r'/'f')
+
+        nparas : the number of parameters (None means the parameters are None)
+    """
+    qbits = [_QubitSlot(i) for i in range(nqbits)]
+    paras = None if nparas is None else [_ParaSlot(i) for i in range(nparas)]
+    try:
+        text = gate_applying_code(language, cir_name, gate_lib_name, gate_name, qbits, paras)
+    except Exception:
+        return None
+    text = text.replace('{', '{{').replace('}', '}}')
+    slots = []
+    pattern = '\x00([qp])([0-9]+)([sr])\x00'
+    if nparas:
+        # the parameters converted by float() are found by their values
+        pattern += '|' + '|'.join('(' + re.escape(float_literal(_Para_Base + i)) + ')' for i in range(nparas))
+    def replace(match):
+        if match.group(1) is not None:
+            slots.append((match.group(1), int(match.group(2)), match.group(3)))
+        else:
+            index = next(i for i in range(nparas) if match.group(4 + i) is not None)
+            slots.append(('p', index, 'f'))
+        return '{}'
+    fmt = re.sub(pattern, replace, text)
+    if '\x00' in fmt:
+        return None
+    template = (fmt, tuple(slots))
+    # Check the template on sample arguments
+    for seed in (1, 2, 3):
+        sqbits = [3 * seed + 7 * i for i in range(nqbits)]
+        sparas = None if nparas is None else [0.125 * seed + 1.5 * i - 2 for i in range(nparas)]
+        if seed == 3 and nparas:
+            sparas[0] = -1e-05      # written in the exponent form
+        try:
+            if render_template(template, sqbits, sparas) != \
+               gate_applying_code(language, cir_name, gate_lib_name, gate_name, sqbits, sparas):
+                return None
+        except Exception:
+            return None
+    return template
+
+
+def render_template(template : tuple, qbits : list[int], paras : list) -> str:
+    """
+    Return the code of a gate from its template (see gate_code_template)
+    """
+    (fmt, slots) = template
+    args = [_Converters[conv](qbits[index] if kind == 'q' else paras[index]) for (kind, index, conv) in slots]
+    return fmt.format(*args)
+
+
+@lru_cache(maxsize=None)
+def _compile_template(template : tuple) -> callable:
+    # Compile a template into a function (qbits, paras) -> str
+    (fmt, slots) = template
+    args = ''.join(', ' + {'s' : 'str', 'r' : 'repr', 'f' : 'float_literal'}[conv] +
+                   ('(q[' if kind == 'q' else '(p[') + str(index) + '])' for (kind, index, conv) in slots)
+    return eval('lambda q, p : fmt.format(' + args[2:] + ')' if slots else 'lambda q, p : fmt',
+                {'fmt' : fmt, 'float_literal' : float_literal})
+
+
+def gate_code_renderer(language : str, cir_name : str, gate_lib_name : str) -> callable:
+    """
+    Return a function (gate_name, qbits, paras) -> str, which returns the code of applying a gate
+        (the same as gate_applying_code) by the cached templates
+    """
+    renderers = {}
+    def ret(gate_name : str, qbits : list[int], paras : list) -> str:
+        if type(qbits) is not list or not (paras is None or type(paras) is list):
+            # e.g. range objects, which are written as they are by some languages
+            return gate_applying_code(language, cir_name, gate_lib_name, gate_name, qbits, paras)
+        key = (gate_name, len(qbits), None if paras is None else len(paras))
+        render = renderers.get(key)
+        if render is None:
+            template = gate_code_template(language, cir_name, gate_lib_name, *key)
+            render = False if template is None else _compile_template(template)
+            renderers[key] = render
+        if render:
+            try:
+                return render(qbits, paras)
+            except (TypeError, ValueError):
+                pass        # e.g. a symbolic parameter, which cannot be converted by float()
+        return gate_applying_code(language, cir_name, gate_lib_name, gate_name, qbits, paras)
+    return ret
+
+
+def gate_code(language : str, cir_name : str, gate_lib_name : str,
+              gate_name : str, qbits : list[int], paras : list) -> str:
+    """
+    Return the code of applying a gate (the same as gate_applying_code), using cached templates
+    """
+    return gate_code_renderer(language, cir_name, gate_lib_name)(gate_name, qbits, paras)
@@ -3,6 +3,7 @@
 #    Author: Peixun Long
 #    Computing Center, Institute of High Energy Physics, CAS
 
+from functools import lru_cache
 from pyquantumkit import PyQuantumKitError
 
 Standard_Gate_Name = {
@@ -23,6 +24,7 @@ def get_args_assign_str(argname : str, nargs : int) -> str:
     return s
 
 # Map the original gate name into standard name
+@lru_cache(maxsize=None)
 def get_standard_gatename(origin_gate_name : str) -> str:
     g = origin_gate_name.upper()
 
@@ -0,0 +1,73 @@
+# _qframes/extra/_qasm.py
+#    2026/10/19
+#    Author: Peixun Long
+#    Computing Center, Institute of High Energy Physics, CAS
+
+from pyquantumkit import PyQuantumKitError
+from ..code_translate import get_standard_gatename
+
+# Gate names in OpenQASM 2.0 (qelib1.inc) and 3.0 (stdgates.inc)
+QASM2_Gate_Name = {
+    'I' : 'id', 'X' : 'x', 'Y' : 'y', 'Z' : 'z', 'S' : 's', 'T' : 't', 'H' : 'h',
+    'SD' : 'sdg', 'TD' : 'tdg', 'SX' : 'sx', 'SXD' : 'sxdg',
+    'CX' : 'cx', 'CY' : 'cy', 'CZ' : 'cz', 'CH' : 'ch', 'SW' : 'swap', 'ISW' : 'iswap',
+    'CS' : 'cs', 'CSD' : 'csdg', 'CCX' : 'ccx', 'CCZ' : 'ccz', 'CSW' : 'cswap',
+    'RX' : 'rx', 'RY' : 'ry', 'RZ' : 'rz', 'RXX' : 'rxx', 'RYY' : 'ryy', 'RZZ' : 'rzz',
+    'CRX' : 'crx', 'CRY' : 'cry', 'CRZ' : 'crz', 'U1' : 'u1', 'CU1' : 'cu1', 'U3' : 'u3',
+}
+QASM3_Gate_Name = dict(QASM2_Gate_Name, U1='p', CU1='cp')
+
+# Definitions of the gates not in the standard include file, written before they are used
+QASM2_Gate_Definition = {
+    'ISW' : 'gate iswap a, b { s a; s b; h a; cx a, b; cx b, a; h b; }',
+    'RYY' : 'gate ryy(theta) a, b { rx(pi/2) a; rx(pi/2) b; cx a, b; rz(theta) b; cx a, b; rx(-pi/2) a; rx(-pi/2) b; }',
+    'CCZ' : 'gate ccz a, b, c { h c; ccx a, b, c; h c; }',
+    'CS' : 'gate cs a, b { cu1(pi/2) a, b; }',
+    'CSD' : 'gate csdg a, b { cu1(-pi/2) a, b; }',
+}
+QASM3_Gate_Definition = dict(QASM2_Gate_Definition,
+    SXD='gate sxdg a { s a; h a; s a; }',
+    RXX='gate rxx(theta) a, b { h a; h b; cx a, b; rz(theta) b; cx a, b; h a; h b; }',
+    RZZ='gate rzz(theta) a, b { cx a, b; rz(theta) b; cx a, b; }',
+    CS='gate cs a, b { cp(pi/2) a, b; }',
+    CSD='gate csdg a, b { cp(-pi/2) a, b; }',
+)
+
+
+def para_str(x, version : int) -> str:
+    if hasattr(x, 'free_symbols') and x.free_symbols:
+        if version == 2:
+            raise PyQuantumKitError('OpenQASM 2.0 does not support symbolic parameter "' + str(x) + '"!')
+        return str(x)
+    ret = str(float(x))
+    return ret if '.' in ret or 'e' in ret else ret + '.0'
+
+def _code(version : int, cir_name : str, gate_lib_name : str,
+          gate_name : str, qbits : list[int], paras : list) -> str:
+    g = get_standard_gatename(gate_name)
+    # <gate_lib_name> is the name of classical register
+    creg = 'c' if gate_lib_name is None else gate_lib_name
+
+    # Measurement
+    if g == 'M':
+        execstr = ""
+        for (q, c) in zip(qbits, paras):
+            if version == 2:
+                execstr += "measure " + cir_name + "[" + str(q) + "] -> " + creg + "[" + str(c) + "]; "
+            else:
+                execstr += creg + "[" + str(c) + "] = measure " + cir_name + "[" + str(q) + "]; "
+        return execstr[:-1]
+
+    execstr = (QASM2_Gate_Name if version == 2 else QASM3_Gate_Name)[g]
+    if paras:
+        execstr += "(" + ", ".join(para_str(x, version) for x in paras) + ")"
+    execstr += " " + ", ".join(cir_name + "[" + str(q) + "]" for q in qbits) + ";"
+    return execstr
+
+def CODE2(cir_name : str, gate_lib_name : str,
+          gate_name : str, qbits : list[int], paras : list) -> str:
+    return _code(2, cir_name, gate_lib_name, gate_name, qbits, paras)
+
+def CODE3(cir_name : str, gate_lib_name : str,
+          gate_name : str, qbits : list[int], paras : list) -> str:
+    return _code(3, cir_name, gate_lib_name, gate_name, qbits, paras)
@@ -7,7 +7,7 @@ from ..code_translate import get_standard_gatename
 
 def float_str(num : int|float) -> str:
     ret = str(float(num))
-    if '.' in ret:
+    if '.' in ret or 'e' in ret:
         return ret
     else:
         return ret + '.0'
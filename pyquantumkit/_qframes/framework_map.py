@@ -4,10 +4,15 @@
 #    Computing Center, Institute of High Energy Physics, CAS
 
 from enum import Enum, auto
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 import importlib
+import time
 from pyquantumkit import PyQuantumKitError
 from pyquantumkit import Supported_Frameworks, FN, get_framework_from_object
 from pyquantumkit.classical.common import indexlist_length
+from pyquantumkit.procedure.execution import RetryPolicy, execute_run
+from pyquantumkit.procedure.profiling import Active_Profiles, record_action
 from pyquantumkit._qframes.__extra_lang import Extra_Languages_CODE
 
 Translate_Namespace = {}
@@ -29,14 +34,43 @@ def get_support_remap(framework : str) -> bool:
         return True
     return Translate_Namespace[framework].SUPPORT_REMAP
 
+def get_support_batch_run(framework : str) -> bool:
+    if framework == 'pyquantumkit':
+        return False
+    return Translate_Namespace[framework].SUPPORT_BATCH_RUN
+
+def get_support_parallel_run(framework : str) -> bool:
+    if framework == 'pyquantumkit':
+        return False
+    return Translate_Namespace[framework].SUPPORT_PARALLEL_RUN
+
+def get_support_parameter(framework : str) -> bool:
+    if framework == 'pyquantumkit':
+        return True
+    return Translate_Namespace[framework].SUPPORT_PARAMETER
+
 
 class Action(Enum):
     NEW     = auto()
     GATE    = auto()
+    GATES   = auto()
     CIRCUIT = auto()
     PROGRAM = auto()
     BITS    = auto()
     RUN     = auto()
+    BATCH   = auto()
+    PARAM   = auto()
+    BIND    = auto()
+    TEXT    = auto()
+    IMPORT  = auto()
+
+# The number of gates in a chunk of code executed by Action.GATES
+Gates_Exec_Chunk = 1024
+
+# The code templates of RUN are compiled only once
+@lru_cache(maxsize=None)
+def compile_template(code : str, mode : str):
+    return compile(code, '<pyquantumkit>', mode)
 
 def gate_applying_code(language : str, cir_name : str, gate_lib_name : str,
                        gate_name : str, qbits : list[int], paras : list) -> str:
@@ -49,12 +83,105 @@ def gate_applying_code(language : str, cir_name : str, gate_lib_name : str,
     raise PyQuantumKitError('Language "' + language + '" is not supported.')
 
 
+@lru_cache(maxsize=None)
+def gate_function(framework : str, gate_name : str, nqbits : int, nparas : int) -> callable:
+    """
+    Return the compiled function (qc, qbits, paras) -> None of applying a gate in a framework,
+        which is built from the code template of GATE, or None if no template applies
+
+        NOTE: the function is only valid for the qubits of int and the parameters of int or float
+    """
+    from pyquantumkit._qframes.code_template import gate_code_template
+    template = gate_code_template(framework, 'qc', Translate_Namespace[framework].GATE_LIB,
+                                  gate_name, nqbits, nparas)
+    if template is None:
+        return None
+    (fmt, slots) = template
+    code = fmt.format(*[('q[' if kind == 'q' else 'float(p[' if conv == 'f' else 'p[') + str(index) +
+                        ('])' if kind == 'p' and conv == 'f' else ']') for (kind, index, conv) in slots])
+    env = {}
+    exec(compile_template('def gate(qc, q, p):\n    ' + code, 'exec'), globals(), env)
+    return env['gate']
+
+def _import_para(x):
+    # The parameter of an imported gate: float, or sympy expression for unbound parameters
+    try:
+        return float(x)
+    except (TypeError, ValueError):
+        pass
+    if hasattr(x, 'sympify'):
+        return x.sympify()
+    if hasattr(x, 'free_symbols'):
+        return x
+    raise PyQuantumKitError('Parameter "' + str(x) + '" cannot be imported into CircuitIO!')
+
+def import_records(framework : str, records) -> list:
+    """
+    Return the gate list of CircuitIO from the records (instruction name, qbits, paras or cbits)
+        of a circuit in a framework (see IMPORT in the translation module of the framework)
+    An entry of IMPORT_GATE_NAME is either a standard gate name, or a function (qbits, paras) -> list
+        decomposing a non-standard gate into the records (standard gate name, qbits, paras)
+    """
+    names = Translate_Namespace[framework].IMPORT_GATE_NAME
+    ignored = Translate_Namespace[framework].IMPORT_IGNORED
+    gatelist = []
+    append = gatelist.append
+    for (name, qbits, paras) in records:
+        g = names.get(name)
+        if g is None:
+            if name in ignored:
+                continue
+            raise PyQuantumKitError('Instruction "' + str(name) + '" of ' + framework +
+                                    ' cannot be imported into CircuitIO!')
+        if g == 'M':
+            append([g, list(qbits), list(paras)])
+        elif callable(g):
+            for (h, hqbits, hparas) in g(list(qbits), [_import_para(x) for x in paras] if paras else []):
+                append([h, list(hqbits), list(hparas) if hparas else None])
+        else:
+            append([g, list(qbits), [_import_para(x) for x in paras] if paras else None])
+    return gatelist
+
+
 def get_apply_function(action : Action, framework : str) -> callable:
     if action == Action.GATE:
-        def ret(qc, gate : str, qbits : list[int], paras : list) -> None:
+        def ret(qc, gate : str, qbits : list[int], paras : list, symbols : dict = None) -> None:
+            start = time.perf_counter() if Active_Profiles else None
             execstr = Translate_Namespace[framework].GATE(gate, qbits, paras)
             #print(execstr)
-            exec(execstr)
+            if start is not None:
+                start = record_action('GATE.codegen', framework, start)
+            if symbols is None:
+                exec(execstr)
+            else:
+                # Symbols in <paras> are resolved into the native parameters of the framework
+                exec(execstr, globals(), dict(symbols, qc=qc))
+            if start is not None:
+                record_action('GATE.exec', framework, start)
+        return ret
+
+    if action == Action.GATES:
+        from pyquantumkit._qframes.code_template import gate_code_renderer
+        render = gate_code_renderer(framework, 'qc', Translate_Namespace[framework].GATE_LIB)
+        def ret(qc, ops : list, symbols : dict = None) -> None:
+            env = {'qc' : qc} if symbols is None else dict(symbols, qc=qc)
+            codes = []          # the code of gates which are not applied by compiled gate functions
+            for (g, qbits, paras) in ops:
+                func = None
+                if type(qbits) is list and (paras is None or
+                                            (type(paras) is list and all(type(x) in (int, float) for x in paras))):
+                    func = gate_function(framework, g, len(qbits), None if paras is None else len(paras))
+                if func is None:
+                    codes.append(render(g, qbits, paras))
+                    if len(codes) < Gates_Exec_Chunk:
+                        continue
+                if codes:
+                    exec('\n'.join(codes), globals(), env)
+                    codes = []
+                if func is not None:
+                    func(qc, qbits, paras)
+            if codes:
+                exec('\n'.join(codes), globals(), env)
         return ret
 
     if action == Action.CIRCUIT:
@@ -78,21 +205,79 @@ def get_apply_function(action : Action, framework : str) -> callable:
         return ret
 
     if action == Action.RUN:
-        def ret(qvm, qc, run_shots : int, **kwargs):
-            try:
-                # Use an explicit locals dict so exec-created variables are visible to eval
-                local_env = {
-                    "qvm": qvm,
-                    "qc": qc,
-                    "run_shots": run_shots,
-                    "kwargs": kwargs,
-                }
-                exec(Translate_Namespace[framework].RUN(1, **kwargs), globals(), local_env)
-                return eval(Translate_Namespace[framework].RUN(2, **kwargs), globals(), local_env)
-            except Exception:
-                #import sys
-                #sys.stderr.write('PyQuantumKit: some errors are occurred in RUN action.\n')
-                return {}
+        def run_once(qvm, qc, run_shots : int, **kwargs):
+            # Use an explicit locals dict so exec-created variables are visible to eval
+            local_env = {
+                "qvm": qvm,
+                "qc": qc,
+                "run_shots": run_shots,
+                "kwargs": kwargs,
+            }
+            start = time.perf_counter() if Active_Profiles else None
+            exec(compile_template(Translate_Namespace[framework].RUN(1, **kwargs), 'exec'),
+                 globals(), local_env)
+            if start is not None:
+                start = record_action('RUN.exec', framework, start)
+            ret = eval(compile_template(Translate_Namespace[framework].RUN(2, **kwargs), 'eval'),
+                       globals(), local_env)
+            if start is not None:
+                record_action('RUN.result', framework, start)
+            return ret
+
+        def ret(qvm, qc, run_shots : int, retry_policy : RetryPolicy = None, **kwargs):
+            return execute_run(run_once, qvm, qc, run_shots, retry_policy=retry_policy, **kwargs)
+        return ret
+
+    if action == Action.BATCH:
+        def run_batch_once(qvm, qcs : list, run_shots : int, **kwargs):
+            local_env = {
+                "qvm": qvm,
+                "qcs": qcs,
+                "run_shots": run_shots,
+                "kwargs": kwargs,
+            }
+            exec(compile_template(Translate_Namespace[framework].RUN_BATCH(1, **kwargs), 'exec'),
+                 globals(), local_env)
+            return eval(compile_template(Translate_Namespace[framework].RUN_BATCH(2, **kwargs), 'eval'),
+                        globals(), local_env)
+
+        def ret(qvm, qcs : list, run_shots : int, max_workers : int = None,
+                retry_policy : RetryPolicy = None, **kwargs):
+            if get_support_batch_run(framework):
+                return execute_run(run_batch_once, qvm, qcs, run_shots, retry_policy=retry_policy, **kwargs)
+
+            run = get_apply_function(Action.RUN, framework)
+            if get_support_parallel_run(framework) and len(qcs) > 1:
+                with ThreadPoolExecutor(max_workers) as pool:
+                    return list(pool.map(lambda qc : run(qvm, qc, run_shots, retry_policy, **kwargs), qcs))
+            return [run(qvm, qc, run_shots, retry_policy, **kwargs) for qc in qcs]
+        return ret
+
+    if action == Action.PARAM:
+        def ret(param_name : str):
+            return eval(Translate_Namespace[framework].PARAM())
+        return ret
+
+    if action == Action.BIND:
+        def ret(qc, bind_dict : dict):
+            return eval(Translate_Namespace[framework].BIND())
+        return ret
+
+    if action == Action.TEXT:
+        def ret(qc) -> str:
+            return eval(Translate_Namespace[framework].TEXT())
+        return ret
+
+    if action == Action.IMPORT:
+        from pyquantumkit.procedure.circuit_io import CircuitIO
+        def ret(qc, with_global_phase : bool = False):
+            env = dict(globals(), qc=qc, names=Translate_Namespace[framework].IMPORT_GATE_NAME,
+                       ignored=Translate_Namespace[framework].IMPORT_IGNORED)
+            exec(compile_template(Translate_Namespace[framework].IMPORT(), 'exec'), env)
+            cio = CircuitIO(env['nqbits'], env['ncbits'])
+            cio._gatelist.extend(import_records(framework, env['records']))
+            # The global phase <gphase> (if set by the IMPORT code) is not kept in CircuitIO
+            return (cio, _import_para(env.get('gphase', 0.0))) if with_global_phase else cio
         return ret
     return None
 
@@ -104,23 +289,19 @@ def get_apply_function_CircuitIO(action : Action) -> callable:
             qc.apply_gate(gate, qbits, paras)
         return ret
 
+    if action == Action.GATES:
+        def ret(qc : CircuitIO, ops : list) -> None:
+            qc.apply_gates(ops)
+        return ret
+
     if action == Action.CIRCUIT:
         def ret(qc_dest : CircuitIO, qc_src : CircuitIO, rmlist : list[int], inv : bool) -> None:
-            tempcio = CircuitIO()
-            tempcio.append_circuit_io(qc_src)
-            tempcio.remap_qbits(rmlist)
-            if inv:
-                tempcio.inverse()
-            qc_dest.append_circuit_io(tempcio)
+            qc_dest.append_circuit_io(qc_src, rmlist, None, inv)
         return ret
 
     if action == Action.PROGRAM:
         def ret(qp_dest : CircuitIO, qp_src : CircuitIO, qbits_remap, cbits_remap) -> None:
-            tempcio = CircuitIO()
-            tempcio.append_circuit_io(qp_src)
-            tempcio.remap_qbits(qbits_remap)
-            tempcio.remap_cbits(cbits_remap)
-            qp_dest.append_circuit_io(tempcio)
+            qp_dest.append_circuit_io(qp_src, qbits_remap, cbits_remap)
         return ret
 
     if action == Action.NEW:
@@ -135,23 +316,43 @@ def get_apply_function_CircuitIO(action : Action) -> callable:
         return ret
 
     if action == Action.RUN:
-        def ret(qvm, qc : CircuitIO, run_shots : int, **kwargs):
+        def ret(qvm, qc : CircuitIO, run_shots : int, retry_policy : RetryPolicy = None, **kwargs):
+            # Built-in simulators (e.g. StatevectorSimulator) can run CircuitIO objects directly
+            if get_framework_from_object(qvm) == 'pyquantumkit':
+                return execute_run(qvm.run, qc, run_shots, retry_policy=retry_policy, **kwargs)
             raise PyQuantumKitError('CircuitIO object does not support RUN action!')
-            #try:
-                # framework = get_framework_from_object(qvm)
-                # print(type(qvm).__module__)
-
-                # # Convert CircuitIO into the circuit of qvm's framework
-                # nqbits = qc.get_nqbits()
-                # ncbits = qc.get_ncbits()
-                # qc_dest = eval(Translate_Namespace[framework].NEW(True))
-                # qc.append_into_actual_circuit(qc_dest)
-
-                # # Execute the qvm
-                # exec(Translate_Namespace[framework].RUN(1, **kwargs))
-                # return eval(Translate_Namespace[framework].RUN(2, **kwargs))
-            #except Exception:
-            #    return {}
+        return ret
+
+    if action == Action.BATCH:
+        def ret(qvm, qcs : list[CircuitIO], run_shots : int, max_workers : int = None,
+                retry_policy : RetryPolicy = None, **kwargs):
+            run = get_apply_function_CircuitIO(Action.RUN)
+            return [run(qvm, qc, run_shots, retry_policy, **kwargs) for qc in qcs]
+        return ret
+
+    if action == Action.PARAM:
+        def ret(param_name : str):
+            import sympy
+            return sympy.Symbol(param_name)
+        return ret
+
+    if action == Action.BIND:
+        def ret(qc : CircuitIO, bind_dict : dict):
+            tempcio = CircuitIO(qc.get_nqbits(), qc.get_ncbits())
+            tempcio.append_circuit_io(qc)
+            tempcio.symbol_subs(bind_dict)
+            return tempcio
+        return ret
+
+    if action == Action.TEXT:
+        def ret(qc : CircuitIO) -> str:
+            return qc.get_canonical_text()
+        return ret
+
+    if action == Action.IMPORT:
+        def ret(qc : CircuitIO, with_global_phase : bool = False):
+            cio = CircuitIO(qc.get_nqbits(), qc.get_ncbits()).append_circuit_io(qc)
+            return (cio, 0.0) if with_global_phase else cio
         return ret
     return None
 
@@ -170,8 +371,15 @@ def quantum_action(action : Action, framework_indicator : str|int, *args, **kwar
     if framework.find('pyquantumkit') != -1:
         is_circuit_io = True
 
+    # Profiling (see procedure/profiling.py) is enabled only when a profile is entered
+    start = time.perf_counter() if Active_Profiles else None
     apply_func = get_apply_function_CircuitIO(action) if is_circuit_io \
                   else get_apply_function(action, framework)
-    if apply_func is not None:
+    if apply_func is None:
+        return None
+    if start is None:
         return apply_func(*args, **kwargs)
-    return None
+    try:
+        return apply_func(*args, **kwargs)
+    finally:
+        record_action(action.name, 'pyquantumkit' if is_circuit_io else framework, start, args)
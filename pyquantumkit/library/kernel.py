@@ -0,0 +1,84 @@
+# library/kernel.py
+#    2026/10/19
+#    Author: Peixun Long
+#    Computing Center, Institute of High Energy Physics, CAS
+
+import numpy
+from pyquantumkit import CircuitIO, new_program, apply_measure, run_and_get_counts_batch, get_framework_from_object
+from pyquantumkit.simulator.statevector import StatevectorSimulator
+
+
+def _feature_map_blocks(feature_map : callable, data, nqbits : int) -> list[CircuitIO]:
+    # Build the feature-map block of each sample only once
+    ret = []
+    for x in data:
+        cio = CircuitIO(nqbits)
+        feature_map(x, cio)
+        ret.append(cio)
+    return ret
+
+
+def _kernel_program(framework : str, block_x : CircuitIO, block_y_inv : CircuitIO, nqbits : int):
+    prog = new_program(framework, nqbits, nqbits)
+    block_x >> prog
+    block_y_inv >> prog
+    apply_measure(prog, range(nqbits), range(nqbits))
+    return prog
+
+
+def quantum_kernel_matrix(qvm, feature_map : callable, X, Y = None, shots : int = 1000,
+                          nqbits : int = None) -> numpy.ndarray:
+    """
+    Evaluate the quantum kernel matrix K[i, j] = |<phi(Y[j])|phi(X[i])>|^2,
+        where |phi(x)> is the state generated by the feature map of sample x
+
+        qvm         : run on which quantum machine
+        feature_map : the procedure feature_map(x, q_circuit) to append the feature-map circuit of sample x
+        X           : the first dataset (sequence of samples)
+        Y           : (optional, default None) the second dataset; None means Y = X
+        shots       : (default 1000) running shots of each circuit
+        nqbits      : (optional, default None) the number of qubits; None means the length of a sample
+
+    NOTE: if Y is None, the symmetry K[i, j] = K[j, i] and K[i, i] = 1 is used.
+          the circuits are submitted to <qvm> in one batch (see run_and_get_counts_batch).
+          if <qvm> is the built-in StatevectorSimulator, the overlaps are computed exactly from
+             the cached statevectors (N simulations instead of N^2 circuits), and <shots> is ignored.
+
+    -> Return : the numpy array K with shape (len(X), len(Y))
+    """
+    symmetric = Y is None
+    X = list(X)
+    Y = X if symmetric else list(Y)
+    if nqbits is None:
+        nqbits = len(X[0])
+
+    blocks_x = _feature_map_blocks(feature_map, X, nqbits)
+    blocks_y = blocks_x if symmetric else _feature_map_blocks(feature_map, Y, nqbits)
+
+    if isinstance(qvm, StatevectorSimulator):
+        states_x = numpy.array([qvm.get_statevector(b) for b in blocks_x])
+        states_y = states_x if symmetric else numpy.array([qvm.get_statevector(b) for b in blocks_y])
+        return numpy.abs(states_x @ states_y.conj().T) ** 2
+
+    framework = get_framework_from_object(qvm)
+    inv_y = []
+    for b in blocks_y:
+        tempcio = CircuitIO(nqbits)
+        tempcio.append_circuit_io(b)
+        inv_y.append(tempcio.inverse())
+
+    K = numpy.ones([len(X), len(Y)])
+    pairs = []
+    for i in range(len(X)):
+        for j in range(i + 1 if symmetric else 0, len(Y)):
+            pairs.append((i, j))
+    progs = [_kernel_program(framework, blocks_x[i], inv_y[j], nqbits) for (i, j) in pairs]
+
+    target = '0' * nqbits
+    results = run_and_get_counts_batch(qvm, progs, shots)
+    for k in range(len(pairs)):
+        (i, j) = pairs[k]
+        K[i, j] = results[k].get(target, 0) / float(shots)
+        if symmetric:
+            K[j, i] = K[i, j]
+    return K
@@ -3,11 +3,66 @@
 #    Author: Peixun Long
 #    Computing Center, Institute of High Energy Physics, CAS
 
-from pyquantumkit import apply_gate, new_program, append_program, get_n_cbits, get_n_qubits, apply_measure,\
-                         run_and_get_counts, get_framework_from_object
+from pyquantumkit import apply_gates, new_program, append_program, get_n_cbits, get_n_qubits, apply_measure,\
+                         run_and_get_counts, run_and_get_counts_batch, get_framework_from_object, \
+                         CircuitIO, PyQuantumKitError
 from pyquantumkit._qframes.framework_map import get_reverse_output_str
 from pyquantumkit.classical.run_result import count_last_bits_of_result_dict
 
+# Execution modes of SWAP test:
+#   'sample'  : run the SWAP test programs on the quantum machine
+#   'exact'   : compute the probability of result 1 directly from the simulated state (no ancilla),
+#               and return its expectation (the number of result 1 is rounded)
+#   'emulate' : draw the number of result 1 from the exact probability, which has the same
+#               distribution as running the SWAP test programs
+#   'auto'    : 'emulate' if supported by the quantum machine, otherwise 'sample'
+#   NOTE: 'exact' and 'emulate' require a CircuitIO program and a built-in simulator
+#         which provides get_swap_expectation(), e.g. StatevectorSimulator
+SwapTest_Modes = {'sample', 'exact', 'emulate', 'auto'}
+Default_SwapTest_Mode = 'auto'
+
+
+def set_default_swaptest_mode(mode : str) -> None:
+    global Default_SwapTest_Mode
+    if mode not in SwapTest_Modes:
+        raise PyQuantumKitError('Unknown SWAP test mode: ' + str(mode))
+    Default_SwapTest_Mode = mode
+
+
+def _resolve_mode(qvm, GenProc, mode : str) -> str:
+    mode = Default_SwapTest_Mode if mode is None else mode
+    if mode not in SwapTest_Modes:
+        raise PyQuantumKitError('Unknown SWAP test mode: ' + str(mode))
+    supported = isinstance(GenProc, CircuitIO) and hasattr(qvm, 'get_swap_expectation')
+    if mode == 'auto':
+        return 'emulate' if supported else 'sample'
+    if mode != 'sample' and not supported:
+        raise PyQuantumKitError('SWAP test mode "' + mode + '" is not supported by the quantum machine!')
+    return mode
+
+
+def swaptest_probability_of_1(qvm, GenProc, state1qlist : list[int], state2qlist : list[int]) -> float:
+    """
+    Compute the exact probability of result 1 in SWAP test by a built-in simulator, without the ancilla,
+        i.e., (1 - tr(rho1 rho2)) / 2 for product states
+
+        qvm         : the built-in simulator which provides get_swap_expectation()
+        GenProc     : the CircuitIO object to generate target quantum state
+        state1qlist : index list of target qubit array 1
+        state2qlist : index list of target qubit array 2
+
+    -> Return : the probability of result 1
+    """
+    e = qvm.get_swap_expectation(GenProc, state1qlist, state2qlist)
+    return min(max((1.0 - e) / 2.0, 0.0), 1.0)
+
+
+def _number_of_1(qvm, p1 : float, Ntimes : int, mode : str) -> int:
+    if mode == 'exact':
+        return round(p1 * Ntimes)
+    # mode == 'emulate'
+    return int(qvm.get_rng().binomial(Ntimes, p1))
+
 
 def append_swaptest_circuit(q_circuit, qctrlindex : int, s1indexlist : list[int], s2indexlist : list[int]):
     """
@@ -24,27 +79,25 @@ def append_swaptest_circuit(q_circuit, qctrlindex : int, s1indexlist : list[int]
     if N != len(s2indexlist):
         raise ValueError('s1indexlist and s2indexlist must have same length!')
     
-    apply_gate(q_circuit, 'H', [qctrlindex])
+    ops = [('H', [qctrlindex])]
     for i in range(0, N):
-        apply_gate(q_circuit, 'CSW', [qctrlindex, s1indexlist[i], s2indexlist[i]])
-    apply_gate(q_circuit, 'H', [qctrlindex])
-    return q_circuit
+        ops.append(('CSW', [qctrlindex, s1indexlist[i], s2indexlist[i]]))
+    ops.append(('H', [qctrlindex]))
+    return apply_gates(q_circuit, ops)
 
 
-def run_swaptest(qvm, GenProc, state1qlist : list[int], state2qlist : list[int], Ntimes : int) -> int:
+def new_swaptest_program(GenProc, state1qlist : list[int], state2qlist : list[int]):
     """
-    Run SWAP test for given quantum circuit or program, return the number of result 1
+    Generate a quantum program which runs SWAP test after given quantum circuit or program,
+        the result is measured into the last cbit
 
-        qvm         : run on which quantum machine
         GenProc     : the procedure to generate target quantum state
         state1qlist : index list of target qubit array 1
         state2qlist : index list of target qubit array 2
-        Ntimes      : the number of repeat times N
 
-    -> Return : the number of obtained result 1 in all N times
+    -> Return : the SWAP test program
     """
     framework = get_framework_from_object(GenProc)
-    fw_req_reverse = get_reverse_output_str(framework)
     Nqs = get_n_qubits(GenProc)
     Ncs = get_n_cbits(GenProc)
 
@@ -52,14 +105,67 @@ def run_swaptest(qvm, GenProc, state1qlist : list[int], state2qlist : list[int],
     append_program(ptest, GenProc)
     append_swaptest_circuit(ptest, Nqs, state1qlist, state2qlist)
     apply_measure(ptest, [Nqs], [Ncs])
+    return ptest
+
+
+def run_swaptest(qvm, GenProc, state1qlist : list[int], state2qlist : list[int], Ntimes : int,
+                 mode : str = None) -> int:
+    """
+    Run SWAP test for given quantum circuit or program, return the number of result 1
+
+        qvm         : run on which quantum machine
+        GenProc     : the procedure to generate target quantum state
+        state1qlist : index list of target qubit array 1
+        state2qlist : index list of target qubit array 2
+        Ntimes      : the number of repeat times N
+        mode        : (optional, default None) the execution mode, None means Default_SwapTest_Mode
+
+    -> Return : the number of obtained result 1 in all N times
+    """
+    mode = _resolve_mode(qvm, GenProc, mode)
+    if mode != 'sample':
+        return _number_of_1(qvm, swaptest_probability_of_1(qvm, GenProc, state1qlist, state2qlist), Ntimes, mode)
+
+    fw_req_reverse = get_reverse_output_str(get_framework_from_object(GenProc))
+    ptest = new_swaptest_program(GenProc, state1qlist, state2qlist)
 
     counts = run_and_get_counts(qvm, ptest, Ntimes)
     res = count_last_bits_of_result_dict(counts, 1, fw_req_reverse)
     return res.get('1', 0)
 
 
+def run_swaptest_batch(qvm, GenProcs : list, state1qlist : list[int], state2qlist : list[int],
+                       Ntimes : int, mode : str = None) -> list[int]:
+    """
+    Run SWAP tests for several quantum circuits or programs in one batch, return the numbers of result 1
+
+        qvm         : run on which quantum machine
+        GenProcs    : the list of procedures to generate target quantum states (must be of the same framework)
+        state1qlist : index list of target qubit array 1
+        state2qlist : index list of target qubit array 2
+        Ntimes      : the number of repeat times N
+        mode        : (optional, default None) the execution mode, None means Default_SwapTest_Mode
 
-def check_tr_rho1_rho2_equals_1(qvm, GenProc, state1qlist : list[int], state2qlist : list[int], Ntimes : int) -> bool:
+    -> Return : list of the numbers of obtained result 1 in all N times, in the same order as <GenProcs>
+    """
+    if not GenProcs:
+        return []
+    mode = _resolve_mode(qvm, GenProcs[0], mode)
+    if mode != 'sample':
+        return [run_swaptest(qvm, p, state1qlist, state2qlist, Ntimes, mode) for p in GenProcs]
+    fw_req_reverse = get_reverse_output_str(get_framework_from_object(GenProcs[0]))
+    ptests = [new_swaptest_program(p, state1qlist, state2qlist) for p in GenProcs]
+
+    ret = []
+    for counts in run_and_get_counts_batch(qvm, ptests, Ntimes):
+        res = count_last_bits_of_result_dict(counts, 1, fw_req_reverse)
+        ret.append(res.get('1', 0))
+    return ret
+
+
+
+def check_tr_rho1_rho2_equals_1(qvm, GenProc, state1qlist : list[int], state2qlist : list[int], Ntimes : int,
+                                mode : str = None, tol : float = 1e-9) -> bool:
     """
     Run SWAP test for given quantum circuit or program to check tr(rho_A rho_B)
 
@@ -68,18 +174,20 @@ def check_tr_rho1_rho2_equals_1(qvm, GenProc, state1qlist : list[int], state2qli
         state1qlist : index list of target qubit array 1
         state2qlist : index list of target qubit array 2
         Ntimes      : the number of repeat times N
+        mode        : (optional, default None) the execution mode, None means Default_SwapTest_Mode
+        tol         : (default 1e-9) the tolerance of the probability of result 1 in 'exact' mode
 
     -> Return : True if trace == 1; otherwise False
     """
-    framework = get_framework_from_object(GenProc)
-    fw_req_reverse = get_reverse_output_str(framework)
-    Nqs = get_n_qubits(GenProc)
-    Ncs = get_n_cbits(GenProc)
-
-    ptest = new_program(framework, Nqs + 1, Ncs + 1)
-    append_program(ptest, GenProc)
-    append_swaptest_circuit(ptest, Nqs, state1qlist, state2qlist)
-    apply_measure(ptest, [Nqs], [Ncs])
+    mode = _resolve_mode(qvm, GenProc, mode)
+    if mode != 'sample':
+        p1 = swaptest_probability_of_1(qvm, GenProc, state1qlist, state2qlist)
+        if mode == 'exact':
+            return p1 <= tol
+        return _number_of_1(qvm, p1, Ntimes, mode) == 0
+
+    fw_req_reverse = get_reverse_output_str(get_framework_from_object(GenProc))
+    ptest = new_swaptest_program(GenProc, state1qlist, state2qlist)
 
     for i in range(0, Ntimes):
         counts = run_and_get_counts(qvm, ptest, 1)
@@ -3,7 +3,7 @@
 #    Author: Peixun Long
 #    Computing Center, Institute of High Energy Physics, CAS
 
-from pyquantumkit import new_program, append_program, get_n_cbits, get_n_qubits, run_and_get_counts
+from pyquantumkit import new_program, append_program, get_n_cbits, get_n_qubits, run_and_get_counts_batch
 from pyquantumkit.procedure.paulis import apply_measure_x, apply_measure_y, apply_measure_z
 from pyquantumkit import get_framework_from_object
 from pyquantumkit._qframes.framework_map import get_reverse_output_str
@@ -37,17 +37,19 @@ def run_qubit_tomography(qvm, GenProc, qbitindex : int, Ntimes : int) -> tuple[c
     apply_measure_y(py, [qbitindex], [Ncs])
     apply_measure_z(pz, [qbitindex], [Ncs])
 
-    res_x = count_last_bits_of_result_dict(run_and_get_counts(qvm, px, Ntimes), 1, fw_req_reverse)
+    (counts_x, counts_y, counts_z) = run_and_get_counts_batch(qvm, [px, py, pz], Ntimes)
+
+    res_x = count_last_bits_of_result_dict(counts_x, 1, fw_req_reverse)
     Nof0 = res_x.get('0', 0)
     Nof1 = res_x.get('1', 0)
     mx = float(Nof0 - Nof1) / float(Ntimes)
 
-    res_y = count_last_bits_of_result_dict(run_and_get_counts(qvm, py, Ntimes), 1, fw_req_reverse)
+    res_y = count_last_bits_of_result_dict(counts_y, 1, fw_req_reverse)
     Nof0 = res_y.get('0', 0)
     Nof1 = res_y.get('1', 0)
     my = float(Nof0 - Nof1) / float(Ntimes)
 
-    res_z = count_last_bits_of_result_dict(run_and_get_counts(qvm, pz, Ntimes), 1, fw_req_reverse)
+    res_z = count_last_bits_of_result_dict(counts_z, 1, fw_req_reverse)
     Nof0 = res_z.get('0', 0)
     Nof1 = res_z.get('1', 0)
     mz = float(Nof0 - Nof1) / float(Ntimes)
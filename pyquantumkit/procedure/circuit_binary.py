@@ -0,0 +1,366 @@
+# procedure/circuit_binary.py
+#    2026/10/19
+#    Author: Peixun Long
+#    Computing Center, Institute of High Energy Physics, CAS
+
+import json, mmap, struct, sys, sympy, numpy
+from mpmath.libmp import from_float
+from sympy.core.operations import AssocOp
+from pyquantumkit import PyQuantumKitError
+from pyquantumkit.procedure.circuit_io import CircuitIO
+from pyquantumkit._qframes.code_translate import Standard_Gate_Name
+
+# Binary format of CircuitIO objects (little-endian):
+#   header      : magic b'PQKC', format version (u16), flags (u16), nqbits (u32), ncbits (u32), ngates (u64),
+#                 then the byte lengths of the opcode table and the symbol table, the number of float64
+#                 parameters and the byte length of the gate stream (u64 each)
+#   opcodes     : JSON list of the gate names, the opcode of a gate is its index
+#   symbols     : JSON list of the nodes of non-numeric parameters (sympy expressions), where the common
+#                 subexpressions are written once and a node follows its arguments:
+#                 ['f', value] for a float, ['s', srepr] for other atoms, [sympy function name, argument nodes...]
+#   parameters  : float64 array (aligned to 8 bytes), a symbolic parameter holds its node index in the symbol table
+#   gate stream : unsigned LEB128 varints, for each gate:
+#                 opcode, n, qbits[0..n-1], then for a measurement: cbits[0..n-1];
+#                 otherwise pcode = 0 (paras is None) or 1 + 2 * nparas + has_symbols,
+#                 followed by a bit mask of the symbolic parameters if has_symbols
+
+Binary_Magic = b'PQKC'
+Binary_Format_Version = 1
+_Header = struct.Struct('<4sHHIIQQQQQ')
+
+# Default number of bytes of the gate stream decoded at a time by CircuitBinaryReader
+Default_Read_Chunk = 2 ** 20
+
+
+def encode_varints(values : list[int]) -> bytes:
+    """
+    Encode a list of non-negative integers (< 2^64) into unsigned LEB128 varints
+    """
+    v = numpy.asarray(values, dtype=numpy.uint64)
+    if v.size == 0:
+        return b''
+    nbytes = numpy.ones(v.shape, dtype=numpy.int64)
+    t = v >> numpy.uint64(7)
+    while t.any():
+        nbytes += t > 0
+        t >>= numpy.uint64(7)
+    offsets = numpy.cumsum(nbytes) - nbytes
+    ret = numpy.empty(int(nbytes[-1] + offsets[-1]), dtype=numpy.uint8)
+    for k in range(int(nbytes.max())):
+        sel = nbytes > k
+        b = ((v[sel] >> numpy.uint64(7 * k)) & numpy.uint64(0x7f)).astype(numpy.uint8)
+        b |= (nbytes[sel] > k + 1).astype(numpy.uint8) << 7
+        ret[offsets[sel] + k] = b
+    return ret.tobytes()
+
+def decode_varints(data) -> list[int]:
+    """
+    Decode unsigned LEB128 varints (bytes-like object, which must end with a complete varint) into a list
+    """
+    b = numpy.frombuffer(data, dtype=numpy.uint8)
+    if b.size == 0:
+        return []
+    ends = numpy.flatnonzero(b < 0x80)
+    starts = numpy.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    if len(ends) == int(b.size):
+        return b.tolist()           # all varints are single bytes
+    shifts = (numpy.arange(b.size) - numpy.repeat(starts, ends - starts + 1)) * 7
+    values = (b & 0x7f).astype(numpy.uint64) << shifts.astype(numpy.uint64)
+    return numpy.add.reduceat(values, starts).tolist()
+
+
+class _ExpressionTable:
+    # The nodes of sympy expressions, each distinct subexpression is written once
+    def __init__(self) -> None:
+        self.nodes = []
+        self.__index = {}       # expression -> node index
+        self.__seen = {}        # id(parameter) -> node index
+
+    def __node(self, e) -> int:
+        index = self.__index.get(e)
+        if index is not None:
+            return index
+        if isinstance(e, sympy.Float) and e._prec == 53:
+            node = ['f', float(e)]
+        elif not e.args:
+            node = ['s', sympy.srepr(e)]
+        elif getattr(sympy, e.func.__name__, None) is e.func:
+            node = [e.func.__name__] + [self.__node(x) for x in e.args]
+        else:
+            node = ['s', sympy.srepr(e)]
+        index = self.__index[e] = len(self.nodes)
+        self.nodes.append(node)
+        return index
+
+    def add(self, x) -> int:
+        index = self.__seen.get(id(x))
+        if index is None:
+            index = self.__seen[id(x)] = self.__node(sympy.sympify(x))
+        return index
+
+
+def _build_expressions(nodes : list) -> list:
+    # The inverse of _ExpressionTable: return the sympy expressions of the nodes
+    #   The arguments of written nodes are already in canonical form, so Add and Mul are built by _from_args
+    #   and floats by Float._new (both skip the canonicalization of sympy, which dominates the time)
+    ret = []
+    for node in nodes:
+        if node[0] == 'f':
+            ret.append(sympy.Float._new(from_float(node[1]), 53))
+        elif node[0] == 's':
+            ret.append(sympy.sympify(node[1]))
+        else:
+            func = getattr(sympy, node[0])
+            args = [ret[i] for i in node[1:]]
+            if issubclass(func, AssocOp):
+                ret.append(func._from_args(args))
+                continue
+            try:
+                ret.append(func(*args, evaluate=False))
+            except TypeError:
+                ret.append(func(*args))
+    return ret
+
+
+def circuit_to_bytes(cir_io : CircuitIO) -> bytes:
+    """
+    Return the binary representation of a CircuitIO object
+    """
+    names = sorted(Standard_Gate_Name)
+    opcodes = {g : i for (i, g) in enumerate(names)}
+    symbols = _ExpressionTable()
+    ints = []
+    floats = []
+    ngates = 0
+    for (g, qbits, paras) in cir_io:
+        op = opcodes.get(g)
+        if op is None:
+            op = opcodes[g] = len(names)
+            names.append(g)
+        ints.append(op)
+        ints.append(len(qbits))
+        ints.extend(qbits)
+        ngates += 1
+        if g == 'M':
+            ints.extend(paras)
+        elif paras is None:
+            ints.append(0)
+        else:
+            mask = 0
+            for (i, x) in enumerate(paras):
+                if isinstance(x, (int, float, numpy.integer, numpy.floating)) and not isinstance(x, bool):
+                    floats.append(float(x))
+                else:
+                    floats.append(float(symbols.add(x)))
+                    mask |= 1 << i
+            if mask:
+                ints.append(2 * len(paras) + 2)
+                ints.append(mask)
+            else:
+                ints.append(2 * len(paras) + 1)
+    bnames = json.dumps(names).encode()
+    bsymbols = json.dumps(symbols.nodes).encode()
+    bfloats = numpy.asarray(floats, dtype='<f8').tobytes()
+    bstream = encode_varints(ints)
+    header = _Header.pack(Binary_Magic, Binary_Format_Version, 0, cir_io.get_nqbits(), cir_io.get_ncbits(),
+                          ngates, len(bnames), len(bsymbols), len(floats), len(bstream))
+    padding = b'\0' * (-(len(header) + len(bnames) + len(bsymbols)) % 8)
+    return b''.join([header, bnames, bsymbols, padding, bfloats, bstream])
+
+
+class CircuitBinaryReader:
+    """
+    Reader of the binary representation of a CircuitIO object (see circuit_to_bytes),
+        the parameters are read from the buffer without copy, and the gate stream is decoded chunk by chunk
+
+        e.g. with CircuitBinaryReader('circuit.pqkc') as reader:
+                 for (g, qbits, paras) in reader: ...
+    """
+    def __init__(self, source, chunk_bytes : int = Default_Read_Chunk) -> None:
+        """
+        Construct a CircuitBinaryReader object
+
+            source      : a file name (the file is memory-mapped), or a bytes-like object
+            chunk_bytes : (optional, default Default_Read_Chunk) the number of bytes of the gate stream
+                          decoded at a time when iterating
+        """
+        self._mmap = None
+        if isinstance(source, str):
+            with open(source, 'rb') as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            source = self._mmap
+        self._buffer = memoryview(source)
+        self._chunk_bytes = chunk_bytes
+        if len(self._buffer) < _Header.size:
+            raise PyQuantumKitError('Invalid binary data of CircuitIO: too short')
+        (magic, version, _, self._nqbits, self._ncbits, self._ngates, lnames, lsymbols, nfloats, lstream) = \
+            _Header.unpack_from(self._buffer, 0)
+        if magic != Binary_Magic:
+            raise PyQuantumKitError('Invalid binary data of CircuitIO: wrong magic number')
+        if version > Binary_Format_Version:
+            raise PyQuantumKitError('Unsupported version ' + str(version) + ' of the binary data of CircuitIO')
+        pos = _Header.size
+        self._names = json.loads(bytes(self._buffer[pos : pos + lnames]))
+        pos += lnames
+        self._symbol_nodes = json.loads(bytes(self._buffer[pos : pos + lsymbols]))
+        self._symbols = None
+        pos += lsymbols
+        pos += -pos % 8
+        if sys.byteorder == 'little':
+            self._floats = self._buffer[pos : pos + 8 * nfloats].cast('d')
+        else:
+            self._floats = numpy.frombuffer(self._buffer, dtype='<f8', count=nfloats, offset=pos).tolist()
+        pos += 8 * nfloats
+        self._stream = self._buffer[pos : pos + lstream]
+        if len(self._stream) != lstream:
+            raise PyQuantumKitError('Invalid binary data of CircuitIO: truncated')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Release the buffer (and close the memory-mapped file)
+        """
+        for view in (self._stream, self._floats, self._buffer):
+            if isinstance(view, memoryview):
+                view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def get_nqbits(self) -> int:
+        return self._nqbits
+
+    def get_ncbits(self) -> int:
+        return self._ncbits
+
+    def __len__(self) -> int:
+        """
+        Return the number of gates (including measurements)
+        """
+        return self._ngates
+
+    def __symbol(self, index : int):
+        if self._symbols is None:
+            self._symbols = _build_expressions(self._symbol_nodes)
+        return self._symbols[index]
+
+    def __decode(self, ints : list[int], k : int, gatelist : list) -> tuple:
+        # Decode the gates from <ints> into <gatelist>, where <k> is the index of the next parameter,
+        #   return (the number of used integers, the next <k>)
+        (names, floats) = (self._names, self._floats)
+        tolist = isinstance(floats, memoryview)
+        append = gatelist.append
+        n = len(ints)
+        i = 0
+        start = 0
+        try:
+            while i < n:
+                start = i
+                g = names[ints[i]]
+                nq = ints[i + 1]
+                i += 2 + nq
+                qbits = ints[i - nq : i]
+                if g == 'M':
+                    i += nq
+                    if i > n:
+                        raise IndexError
+                    append(['M', qbits, ints[i - nq : i]])
+                    continue
+                pcode = ints[i]
+                i += 1
+                if pcode == 0:
+                    append([g, qbits, None])
+                    continue
+                npara = (pcode - 1) >> 1
+                paras = floats[k : k + npara].tolist() if tolist else floats[k : k + npara]
+                if not pcode & 1:
+                    mask = ints[i]
+                    i += 1
+                    for j in range(npara):
+                        if (mask >> j) & 1:
+                            paras[j] = self.__symbol(int(paras[j]))
+                k += npara
+                append([g, qbits, paras])
+        except IndexError:
+            return (start, k)           # an incomplete gate at the end
+        return (n, k)
+
+    def __iter__(self):
+        """
+        Iterate the gates, each item is [standard_gate_name, qbits, paras] (see CircuitIO)
+        """
+        (pos, k) = (0, 0)
+        rest = []
+        stream = self._stream
+        while pos < len(stream):
+            end = min(pos + self._chunk_bytes, len(stream))
+            # cut the chunk after its last complete varint
+            while end < len(stream) and stream[end - 1] >= 0x80:
+                end += 1
+            ints = rest + decode_varints(stream[pos : end])
+            pos = end
+            gates = []
+            (used, k) = self.__decode(ints, k, gates)
+            rest = ints[used:]
+            yield from gates
+        if rest:
+            raise PyQuantumKitError('Invalid binary data of CircuitIO: incomplete gate stream')
+
+    def to_circuit_io(self) -> CircuitIO:
+        """
+        Return the CircuitIO object
+        """
+        ret = CircuitIO(self._nqbits, self._ncbits)
+        ints = decode_varints(self._stream)
+        floats = self._floats
+        if isinstance(floats, memoryview):
+            self._floats = floats.tolist()
+        try:
+            (used, _) = self.__decode(ints, 0, ret._gatelist)
+        finally:
+            self._floats = floats
+        if used != len(ints):
+            raise PyQuantumKitError('Invalid binary data of CircuitIO: incomplete gate stream')
+        return ret
+
+
+def circuit_from_bytes(data) -> CircuitIO:
+    """
+    Return the CircuitIO object of its binary representation (bytes-like object, see circuit_to_bytes)
+    """
+    reader = CircuitBinaryReader(data)
+    try:
+        return reader.to_circuit_io()
+    finally:
+        reader.close()
+
+def write_circuit_binary(cir_io : CircuitIO, fileobj) -> int:
+    """
+    Write the binary representation of a CircuitIO object into a binary file-like object
+
+    -> Return : the number of bytes written
+    """
+    data = circuit_to_bytes(cir_io)
+    fileobj.write(data)
+    return len(data)
+
+def save_circuit_binary(cir_io : CircuitIO, filename : str) -> None:
+    """
+    Save a CircuitIO object into a binary file
+    """
+    with open(filename, 'wb') as f:
+        write_circuit_binary(cir_io, f)
+
+def load_circuit_binary(filename : str) -> CircuitIO:
+    """
+    Load a CircuitIO object from a binary file, which is memory-mapped in reading
+    """
+    with CircuitBinaryReader(filename) as reader:
+        return reader.to_circuit_io()
@@ -3,13 +3,14 @@
 #    Author: Peixun Long
 #    Computing Center, Institute of High Energy Physics, CAS
 
-import copy, sympy, numpy
-from pyquantumkit import PyQuantumKitError, apply_gate
-from pyquantumkit._qframes.framework_map import gate_applying_code
+import copy, hashlib, sympy, numpy
+from pyquantumkit import PyQuantumKitError, apply_gates
+from pyquantumkit._qframes.code_template import gate_code_renderer
 from pyquantumkit.classical.common import indexlist_length
 from pyquantumkit._qframes.code_translate import Standard_Gate_Name, get_standard_gatename
 from pyquantumkit.symbol.gate import symbol_gate_matrix
 from pyquantumkit.symbol.circuit import symbol_apply_gate
+from pyquantumkit.procedure.parameterized import ParameterizedCircuit
 
 
 class CircuitIO:
@@ -29,6 +30,14 @@ class CircuitIO:
         elif item[0] == 'U3':
             item[2] = [-item[2][0], -item[2][2], -item[2][1]]
 
+    def __canonical_para(self, x) -> str:
+        if isinstance(x, (int, float, complex, numpy.number)):
+            c = complex(x)
+            return repr(c.real) if c.imag == 0 else repr(c)
+        if hasattr(x, 'free_symbols') and not x.free_symbols:
+            return self.__canonical_para(complex(x))
+        return sympy.srepr(x)
+
     def __expression_subs(self, expression, subsdict : dict):
         if not hasattr(expression, 'subs'):
             return expression
@@ -43,12 +52,63 @@ class CircuitIO:
         self._nqbits = nqbits
         self._ncbits = ncbits
 
+    def __getattr__(self, name : str):
+        # Only called when the attribute is missing: the gates of an unpickled object are decoded at first use
+        packed = self.__dict__.get('_packed')
+        if name != '_gatelist' or packed is None:
+            raise AttributeError("'" + type(self).__name__ + "' object has no attribute '" + name + "'")
+        from pyquantumkit.procedure.circuit_binary import circuit_from_bytes
+        self._gatelist = circuit_from_bytes(packed)._gatelist
+        del self._packed
+        return self._gatelist
+
+    def __reduce__(self):
+        """
+        Pickle the object in the compact binary format (see procedure/circuit_binary.py),
+            each distinct sympy expression is written once, and the gates are decoded lazily after unpickling.
+            The other attributes of the object (e.g. of a subclass) are pickled as its state.
+
+            NOTE: numerical parameters are restored as float, e.g. the parameter 1 of a gate becomes 1.0
+        """
+        packed = self.__dict__.get('_packed')
+        if packed is None:
+            from pyquantumkit.procedure.circuit_binary import circuit_to_bytes
+            packed = circuit_to_bytes(self)
+        state = {key : value for (key, value) in self.__dict__.items()
+                 if key not in ('_gatelist', '_packed', '_nqbits', '_ncbits')}
+        return (_unpickle_circuit_io, (type(self), self._nqbits, self._ncbits, packed), state or None)
+
+    def __copy__(self):
+        ret = type(self).__new__(type(self))
+        ret.__dict__.update(self.__dict__)
+        return ret
+
+    def __deepcopy__(self, memo : dict):
+        ret = type(self).__new__(type(self))
+        memo[id(self)] = ret
+        for (key, value) in self.__dict__.items():
+            setattr(ret, key, copy.deepcopy(value, memo))
+        return ret
+
     def clear(self):
         """
         Clear all gates in the object
         """
         self._gatelist.clear()
 
+    def __len__(self) -> int:
+        """
+        Return the number of gates (including measurements)
+        """
+        return len(self._gatelist)
+
+    def __iter__(self):
+        """
+        Iterate the gates, each item is [standard_gate_name, qbits, paras]
+            NOTE: for measurement, <paras> is the list of cbits
+        """
+        return iter(self._gatelist)
+
     def set_nqbits(self, nqbits) -> None:
         """
         Set the number of qubits PLAN to be used
@@ -140,6 +200,19 @@ class CircuitIO:
         g = get_standard_gatename(gatestr)
         self._gatelist.append([g, qbits, paras])
 
+    def apply_gates(self, ops) -> None:
+        """
+        Apply a sequence of quantum gates on a quantum circuit
+
+            NOTE: this function will not do check for the validity of nqbits and ncbits
+
+            ops : the sequence of (gate_str, qbits) or (gate_str, qbits, paras),
+                  where <paras> is the list of cbits for measurement 'M'
+        """
+        append = self._gatelist.append
+        for op in ops:
+            append([get_standard_gatename(op[0]), op[1], op[2] if len(op) > 2 else None])
+
     def apply_measure(self, qindex : list[int], cindex : list[int]) -> None:
         """
         Apply measurement operation on a quantum circuit
@@ -209,16 +282,35 @@ class CircuitIO:
             raise PyQuantumKitError('Invalid remap: ' + str(remap))
         return self
 
-    def append_circuit_io(self, cir_io_obj):
+    def append_circuit_io(self, cir_io_obj, qbits_remap = None, cbits_remap = None, inverse : bool = False):
         """
         Append the gates in other CircuitIO object into this CircuitIO object
 
         NOTE: You can use operator << to replace this function
 
-            cir_io_obj : the target object (only support CircuitIO object)
-        """
-        # Must use deepcopy
-        self._gatelist.extend(copy.deepcopy(cir_io_obj._gatelist))
+            cir_io_obj  : the target object (only support CircuitIO object)
+            qbits_remap : (optional, None or int or list[int], default None)
+                          if the type of <qbits_remap> is int, give the offset of each qubit index
+                          if the type of <qbits_remap> is list[int], give the remap list of the qubit indices
+            cbits_remap : (optional, None or int or list[int], default None) the same for the cbit indices
+            inverse     : (optional, default False) whether append the inverse circuit
+        """
+        for remap in (qbits_remap, cbits_remap):
+            if not (remap is None or isinstance(remap, (int, list, range))):
+                raise PyQuantumKitError('Invalid remap: ' + str(remap))
+        # Each gate record is copied once (with the remapped indexes), the parameters are shared
+        #   since numbers and sympy expressions are immutable.
+        #   The records are built before extending, so that this object is unchanged on error.
+        items = cir_io_obj._gatelist
+        records = []
+        append = records.append
+        for (g, qbits, paras) in (reversed(items) if inverse else items):
+            item = [g, _remap_indexes(qbits, qbits_remap),
+                    _remap_indexes(paras, cbits_remap) if g == 'M' else (None if paras is None else list(paras))]
+            if inverse:
+                self.__inverse_gate(item)
+            append(item)
+        self._gatelist.extend(records)
         return self
 
     def __lshift__(self, cir_io_obj):
@@ -235,17 +327,56 @@ class CircuitIO:
             subsdict  : (optional, default None) specify the substituted symbols.
                    e.g. {t : 3, x : 4} means substitute symbol t with number 3, and symbol x with 4
         """
-        for item in self._gatelist:
-            if subsdict is None or item[2] is None:
-                apply_gate(dest_qcir, item[0], item[1], item[2])
-            else:
-                subsitem2 = [self.__expression_subs(x, subsdict) for x in item[2]]
-                apply_gate(dest_qcir, item[0], item[1], subsitem2)
+        if subsdict is None:
+            apply_gates(dest_qcir, self._gatelist)
+        else:
+            apply_gates(dest_qcir, [item if item[2] is None else
+                                    (item[0], item[1], [self.__expression_subs(x, subsdict) for x in item[2]])
+                                    for item in self._gatelist])
         return self
     
     def __rshift__(self, dest_qcir):
         return self.append_into_actual_circuit(dest_qcir)
     
+    def iter_circuit_code(self, language : str, circuit_name : str,
+                          gate_lib_name : str = None, linebreak : str = '\n',
+                          subsdict : dict = None):
+        """
+        Generate the code of the CircuitIO object line by line (see get_circuit_code),
+            the code of each gate is rendered from cached per-(language, gate) templates
+
+        -> Return : a generator of the code strings (each ends with <linebreak>)
+        """
+        render = gate_code_renderer(language, circuit_name, gate_lib_name)
+        for item in self._gatelist:
+            paras = item[2]
+            if subsdict is not None and paras is not None:
+                paras = [self.__expression_subs(x, subsdict) for x in paras]
+            yield render(item[0], item[1], paras) + linebreak
+
+    def write_circuit_code(self, fileobj, language : str, circuit_name : str,
+                           gate_lib_name : str = None, linebreak : str = '\n',
+                           subsdict : dict = None, buffer_lines : int = 4096) -> int:
+        """
+        Write the code of the CircuitIO object into a file-like object (see get_circuit_code),
+            the lines are streamed in batches, so the memory in use does not grow with the circuit
+
+            fileobj      : the object with write(str), e.g. a text file or io.StringIO
+            buffer_lines : (optional, default 4096) the number of lines in a batch of writing
+
+        -> Return : the number of characters written
+        """
+        nchars = 0
+        batch = []
+        for line in self.iter_circuit_code(language, circuit_name, gate_lib_name, linebreak, subsdict):
+            batch.append(line)
+            if len(batch) >= buffer_lines:
+                nchars += fileobj.write(''.join(batch)) or 0
+                batch.clear()
+        if batch:
+            nchars += fileobj.write(''.join(batch)) or 0
+        return nchars
+
     def get_circuit_code(self, language : str, circuit_name : str,
                           gate_lib_name : str = None, linebreak : str = '\n',
                           subsdict : dict = None) -> str:
@@ -262,17 +393,7 @@ class CircuitIO:
 
         -> Return : the code string
         """
-        ret = ""
-        for item in self._gatelist:
-            if subsdict is None or item[2] is None:
-                ret += gate_applying_code(language, circuit_name, gate_lib_name,
-                                            item[0], item[1], item[2])
-            else:
-                subsitem2 = [self.__expression_subs(x, subsdict) for x in item[2]]
-                ret += gate_applying_code(language, circuit_name, gate_lib_name,
-                                            item[0], item[1], subsitem2)
-            ret += linebreak
-        return ret
+        return ''.join(self.iter_circuit_code(language, circuit_name, gate_lib_name, linebreak, subsdict))
     
     def get_sympy_matrix(self, subsdict : dict = None, simplify : bool = True) -> sympy.Matrix:
         """
@@ -333,6 +454,51 @@ class CircuitIO:
                 for i in range(len(item[2])):
                     item[2][i] = self.__expression_subs(item[2][i], subsdict)
 
+    def get_free_symbols(self) -> set:
+        """
+        Return the set of sympy symbols in the gates' parameters
+        """
+        ret = set()
+        for item in self._gatelist:
+            if item[0] != 'M' and item[2] is not None:
+                for x in item[2]:
+                    if hasattr(x, 'free_symbols'):
+                        ret |= x.free_symbols
+        return ret
+
+    def export_parameterized(self, framework : str, is_qprog : bool = True) -> ParameterizedCircuit:
+        """
+        Export this CircuitIO object into a parameterized circuit of target framework,
+            the sympy symbols are mapped into native parameters where the framework supports
+
+            framework : the string to identify the target framework
+            is_qprog  : (default True) whether to build a quantum program (otherwise a quantum circuit)
+
+        -> Return : the ParameterizedCircuit object, use its bind() to assign the values of symbols
+        """
+        return ParameterizedCircuit(self, framework, is_qprog)
+
+    def get_canonical_text(self) -> str:
+        """
+        Return the canonical text of the circuit structure, one line for each gate,
+            numerical parameters are written in the same form whatever their types are
+        """
+        lines = ['QC ' + str(self._nqbits) + ' ' + str(self._ncbits)]
+        for item in self._gatelist:
+            s = item[0] + ' ' + ','.join(str(int(q)) for q in item[1])
+            if item[0] == 'M':
+                s += ' ' + ','.join(str(int(c)) for c in item[2])
+            elif item[2] is not None:
+                s += ' ' + ','.join(self.__canonical_para(x) for x in item[2])
+            lines.append(s)
+        return '\n'.join(lines)
+
+    def get_hash(self) -> str:
+        """
+        Return the canonical structural hash (SHA-256 hex string) of the CircuitIO object
+        """
+        return hashlib.sha256(self.get_canonical_text().encode()).hexdigest()
+
     def contains_measure(self) -> bool:
         """
         Return whether a measurement operation is in the CircuitIO object
@@ -341,3 +507,20 @@ class CircuitIO:
             if item[0] == 'M':
                 return True
         return False
+
+
+def _remap_indexes(indexes, remap):
+    # The copy of the qubit/cbit indexes of a gate record after remapping
+    if remap is None:
+        return indexes if type(indexes) is range else list(indexes)
+    if isinstance(remap, int):
+        return [x + remap for x in indexes]
+    return [remap[x] for x in indexes]
+
+def _unpickle_circuit_io(cls : type, nqbits : int, ncbits : int, packed : bytes) -> CircuitIO:
+    # The gates are kept packed until the first use (see CircuitIO.__getattr__)
+    ret = cls.__new__(cls)
+    ret._nqbits = nqbits
+    ret._ncbits = ncbits
+    ret._packed = packed
+    return ret
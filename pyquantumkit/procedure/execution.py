@@ -0,0 +1,187 @@
+# procedure/execution.py
+#    2026/10/19
+#    Author: Peixun Long
+#    Computing Center, Institute of High Energy Physics, CAS
+
+import random, threading, time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from pyquantumkit import PyQuantumKitError, QuantumRunError, TransientRunError, RunTimeoutError
+
+# Exception types of the frameworks which are regarded as transient failures
+#   (concurrent.futures.TimeoutError is not the builtin TimeoutError before Python 3.11)
+Transient_Exception_Types = (ConnectionError, TimeoutError, FutureTimeoutError)
+
+
+class RetryPolicy:
+    """
+    The policy of retrying transient failures in running quantum programs
+
+        The delay before the k-th retry (k = 1, 2, ...) is
+            min(base_delay * backoff^(k-1), max_delay) * (1 + jitter * uniform(-1, 1))
+    """
+    def __init__(self, max_retries : int = 3, base_delay : float = 1.0, backoff : float = 2.0,
+                 max_delay : float = 60.0, jitter : float = 0.1, timeout : float = None,
+                 retry_on : tuple = (TransientRunError,)) -> None:
+        """
+        Construct a RetryPolicy object
+
+            max_retries : (int, default 3) the maximum number of retries, 0 means no retry
+            base_delay  : (float, default 1.0) the delay (seconds) before the first retry
+            backoff     : (float, default 2.0) the multiplier of delay after each retry
+            max_delay   : (float, default 60.0) the upper bound of delay
+            jitter      : (float, default 0.1) the relative random jitter of delay
+            timeout     : (optional, default None) the timeout (seconds) of each attempt, None means no limit
+            retry_on    : (tuple, default (TransientRunError,)) the error types to be retried
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.backoff = backoff
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.timeout = timeout
+        self.retry_on = retry_on
+
+    def get_delay(self, retry : int) -> float:
+        """
+        Return the delay (seconds) before the <retry>-th retry (start from 1)
+        """
+        d = min(self.base_delay * self.backoff ** (retry - 1), self.max_delay)
+        return max(0.0, d * (1.0 + self.jitter * random.uniform(-1.0, 1.0)))
+
+    def should_retry(self, error : Exception, retry : int) -> bool:
+        """
+        Return whether to do the <retry>-th retry (start from 1) after <error>
+        """
+        return retry <= self.max_retries and isinstance(error, self.retry_on)
+
+
+# Retry policy used when no policy is given
+Default_Retry_Policy = RetryPolicy()
+
+def set_default_retry_policy(policy : RetryPolicy) -> None:
+    global Default_Retry_Policy
+    Default_Retry_Policy = policy
+
+def get_default_retry_policy() -> RetryPolicy:
+    return Default_Retry_Policy
+
+
+class RunMetrics:
+    """
+    Thread-safe counters of running quantum programs
+
+        attempts  : number of submissions (including retries)
+        succeeded : number of runs finally succeeded
+        failed    : number of runs finally failed
+        retried   : number of retries
+        timeouts  : number of attempts exceeding the timeout
+    """
+    Counter_Names = ('attempts', 'succeeded', 'failed', 'retried', 'timeouts')
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._listeners = []
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters = dict.fromkeys(self.Counter_Names, 0)
+
+    def get(self) -> dict:
+        with self._lock:
+            return dict(self._counters)
+
+    def add_listener(self, listener : callable) -> None:
+        """
+        Add a listener listener(event : str, info : dict), which is called on each counted event
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener : callable) -> None:
+        self._listeners.remove(listener)
+
+    def emit(self, event : str, **info) -> None:
+        with self._lock:
+            self._counters[event] += 1
+        for listener in list(self._listeners):
+            listener(event, info)
+
+
+# Global metrics of all runs
+Run_Metrics = RunMetrics()
+
+def get_run_metrics() -> dict:
+    """
+    Return a copy of the global counters of running quantum programs (see RunMetrics)
+    """
+    return Run_Metrics.get()
+
+def reset_run_metrics() -> None:
+    Run_Metrics.reset()
+
+
+def classify_error(error : Exception) -> Exception:
+    """
+    Convert an exception raised by the framework into the typed error of PyQuantumKit
+
+        -> Return : the typed error (the original exception is set as its __cause__)
+    """
+    if isinstance(error, PyQuantumKitError):
+        return error
+    errtype = TransientRunError if isinstance(error, Transient_Exception_Types) else QuantumRunError
+    ret = errtype(type(error).__name__ + ': ' + str(error))
+    ret.__cause__ = error
+    return ret
+
+
+def _call_with_timeout(func : callable, args : tuple, kwargs : dict, timeout : float):
+    if timeout is None:
+        return func(*args, **kwargs)
+    # The attempt is run in a daemon thread, which cannot be interrupted after timeout
+    future = Future()
+    def target():
+        if future.set_running_or_notify_cancel():
+            try:
+                future.set_result(func(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+    threading.Thread(target=target, daemon=True).start()
+    try:
+        return future.result(timeout)
+    except FutureTimeoutError:
+        if future.done():
+            raise
+        raise RunTimeoutError('Running exceeds the timeout of ' + str(timeout) + ' seconds!') from None
+
+
+def execute_run(func : callable, *args, retry_policy : RetryPolicy = None, **kwargs):
+    """
+    Call a running function with typed errors, retries, timeouts and metrics
+
+        func         : the function to run quantum programs, which is called as func(*args, **kwargs)
+        retry_policy : (optional, default None) the RetryPolicy, None means Default_Retry_Policy
+
+    -> Return : the return value of <func>; raise QuantumRunError (or its subclasses) if failed
+    """
+    policy = Default_Retry_Policy if retry_policy is None else retry_policy
+    retry = 0
+    while True:
+        Run_Metrics.emit('attempts', retry=retry)
+        try:
+            ret = _call_with_timeout(func, args, kwargs, policy.timeout)
+        except Exception as e:
+            error = classify_error(e)
+            if isinstance(error, RunTimeoutError):
+                Run_Metrics.emit('timeouts', retry=retry, error=error)
+            retry += 1
+            if not policy.should_retry(error, retry):
+                Run_Metrics.emit('failed', retry=retry - 1, error=error)
+                if error is e:
+                    raise
+                raise error from e
+            Run_Metrics.emit('retried', retry=retry, error=error)
+            time.sleep(policy.get_delay(retry))
+            continue
+        Run_Metrics.emit('succeeded', retry=retry)
+        return ret
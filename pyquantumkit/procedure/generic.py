@@ -6,6 +6,8 @@
 from pyquantumkit import get_framework_from_object, PyQuantumKitError
 from pyquantumkit._qframes.framework_map import quantum_action, Action
 from pyquantumkit.classical.common import indexlist_length
+from pyquantumkit.procedure.result_cache import ResultCache, get_circuit_hash, get_default_result_cache
+from pyquantumkit.procedure.profiling import Profile, profile
 
 
 def apply_gate(q_circuit, gate_str : str, qbits : list[int], paras : list = None):
@@ -23,6 +25,38 @@ def apply_gate(q_circuit, gate_str : str, qbits : list[int], paras : list = None
     return q_circuit
 
 
+def _structured_gate_records(ops) -> list:
+    # Fields of the structured array: 'gate' (str or bytes), 'qbits' (int or int subarray, where negative
+    #   entries are padding) and optional 'paras' (float or float subarray, where NaN entries are padding)
+    gates = [g.decode() if isinstance(g, bytes) else g for g in ops['gate'].tolist()]
+    qbitss = [[q for q in (x if isinstance(x, list) else [x]) if q >= 0] for x in ops['qbits'].tolist()]
+    if 'paras' not in ops.dtype.names:
+        return [(g, qbits, None) for (g, qbits) in zip(gates, qbitss)]
+    parass = [[p for p in (x if isinstance(x, list) else [x]) if p == p] or None for x in ops['paras'].tolist()]
+    return list(zip(gates, qbitss, parass))
+
+def apply_gates(q_circuit, ops):
+    """
+    Apply a sequence of quantum gates on a quantum circuit, where the framework and the translation
+        of gates are resolved only once for the whole sequence
+
+        q_circuit : applied quantum circuit
+        ops       : the sequence of (gate_str, qbits) or (gate_str, qbits, paras), or a NumPy structured array
+                    with fields 'gate', 'qbits' and (optional) 'paras'
+            NOTE: in a structured array, negative qubit indexes and NaN parameters are ignored as padding,
+                  e.g. dtype [('gate', 'U4'), ('qbits', 'i4', 2), ('paras', 'f8')] with row ('H', [3, -1], nan)
+
+    -> Return : q_circuit
+    """
+    if getattr(getattr(ops, 'dtype', None), 'names', None):
+        records = _structured_gate_records(ops)
+    else:
+        records = [(op[0], op[1], op[2] if len(op) > 2 else None) for op in ops]
+    if records:
+        quantum_action(Action.GATES, 0, q_circuit, records)
+    return q_circuit
+
+
 def apply_measure(q_circuit, qindex : list[int], cindex : list[int]):
     """
     Apply measurement operation on a quantum circuit
@@ -48,9 +82,7 @@ def multi_apply_sqgate(q_circuit, gate_str : str, qbitlist : list[int], paras :
 
     -> Return : q_circuit
     """
-    for i in qbitlist:
-        apply_gate(q_circuit, gate_str, [i], paras)
-    return q_circuit
+    return apply_gates(q_circuit, [(gate_str, [i], paras) for i in qbitlist])
 
 
 def apply_reverse(q_circuit, qbitlist : list[int]):
@@ -63,9 +95,7 @@ def apply_reverse(q_circuit, qbitlist : list[int]):
     -> Return : q_circuit
     """
     N = len(qbitlist)
-    for i in range(0, N // 2):
-        apply_gate(q_circuit, 'SW', [qbitlist[i], qbitlist[N - i - 1]])
-    return q_circuit
+    return apply_gates(q_circuit, [('SW', [qbitlist[i], qbitlist[N - i - 1]]) for i in range(0, N // 2)])
 
 
 def append_circuit(dest_qcir, src_qcir, remap = None, inverse : bool = False):
@@ -250,18 +280,86 @@ def get_cbit_list(q_prog) -> list[int]:
     return quantum_action(Action.BITS, 0, q_prog, True, True)
 
 
-def run_and_get_counts(q_machine, q_prog, shots : int = 1, **kwargs):
+def import_circuit(q_prog, with_global_phase : bool = False):
     """
-    Run quantum programs on quantum machine and get the result dict
+    Import a quantum circuit/program of any supported framework into a CircuitIO object,
+        the indexes of qubits and classical bits are kept
 
-        q_machine : target quantum machine
-        q_prog    : target quantum program
-        shots     : running shots (repeat times)
-        kwargs    : (optional) Other parameters
+        q_prog            : the quantum circuit/program (a CircuitIO object is copied)
+        with_global_phase : (default False) whether to return the global phase of the circuit as well,
+                            which is not kept in CircuitIO, i.e., the CircuitIO object is the same circuit
+                            up to the global phase
 
-    -> Return : dict of results
+    -> Return : the CircuitIO object, or (CircuitIO object, global phase) if <with_global_phase>
     """
-    return quantum_action(Action.RUN, 1, q_machine, q_prog, shots, **kwargs)
+    return quantum_action(Action.IMPORT, 0, q_prog, with_global_phase)
+
+
+def run_and_get_counts(q_machine, q_prog, shots : int = 1, retry_policy = None,
+                       cache : ResultCache = None, **kwargs):
+    """
+    Run quantum programs on quantum machine and get the result dict
+
+        q_machine    : target quantum machine
+        q_prog       : target quantum program
+        shots        : running shots (repeat times)
+        retry_policy : (optional, default None) the RetryPolicy of transient failures and timeouts,
+                       None means the default policy (see procedure/execution.py)
+        cache        : (optional, default None) the ResultCache to look up and store the result,
+                       None means the default cache (see procedure/result_cache.py, disabled by default)
+        kwargs       : (optional) Other parameters
+
+    -> Return : dict of results; raise QuantumRunError (or its subclasses) if the running failed
+    """
+    cache = get_default_result_cache() if cache is None else cache
+    key = None if cache is None else cache.make_key(q_machine, q_prog, shots)
+    if key is not None:
+        ret = cache.get(key)
+        if ret is not None:
+            return ret
+    ret = quantum_action(Action.RUN, 1, q_machine, q_prog, shots, retry_policy, **kwargs)
+    if key is not None:
+        cache.put(key, ret)
+    return ret
+
+
+def run_and_get_counts_batch(q_machine, q_progs : list, shots : int = 1, max_workers : int = None,
+                             retry_policy = None, cache : ResultCache = None, **kwargs) -> list[dict]:
+    """
+    Run several quantum programs on quantum machine and get the result dicts
+
+        The programs are submitted in one batch if the framework supports,
+          otherwise they are run concurrently by a thread pool (or one by one,
+          if the framework does not support concurrent running).
+
+        q_machine    : target quantum machine
+        q_progs      : list of target quantum programs (must be of the same framework)
+        shots        : running shots (repeat times) of each program
+        max_workers  : (optional, default None) the maximum number of threads for concurrent running
+        retry_policy : (optional, default None) the RetryPolicy, see run_and_get_counts
+        cache        : (optional, default None) the ResultCache, see run_and_get_counts;
+                       only the programs not found in the cache are submitted
+        kwargs       : (optional) Other parameters
+
+    -> Return : list of result dicts, in the same order as <q_progs>;
+                raise QuantumRunError (or its subclasses) if the running failed
+    """
+    q_progs = list(q_progs)
+    if not q_progs:
+        return []
+    cache = get_default_result_cache() if cache is None else cache
+    keys = [None] * len(q_progs) if cache is None else [cache.make_key(q_machine, p, shots) for p in q_progs]
+    ret = [None if k is None else cache.get(k) for k in keys]
+    torun = [i for i in range(len(q_progs)) if ret[i] is None]
+    if torun:
+        framework = get_framework_from_object(q_progs[0])
+        results = quantum_action(Action.BATCH, framework, q_machine, [q_progs[i] for i in torun],
+                                 shots, max_workers, retry_policy, **kwargs)
+        for (i, counts) in zip(torun, results):
+            ret[i] = counts
+            if keys[i] is not None:
+                cache.put(keys[i], counts)
+    return ret
 
 
 def parallel_programs(*args):
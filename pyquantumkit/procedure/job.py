@@ -0,0 +1,197 @@
+# procedure/job.py
+#    2026/10/19
+#    Author: Peixun Long
+#    Computing Center, Institute of High Energy Physics, CAS
+
+import asyncio, threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pyquantumkit import PyQuantumKitError, get_framework_from_object
+from pyquantumkit._qframes.framework_map import get_support_parallel_run
+from pyquantumkit.procedure.generic import run_and_get_counts
+
+# Default maximum number of jobs running at the same time
+Default_Max_Concurrency = 8
+
+_Default_Executor = None
+
+def _get_default_executor() -> Executor:
+    global _Default_Executor
+    if _Default_Executor is None:
+        _Default_Executor = ThreadPoolExecutor(Default_Max_Concurrency, thread_name_prefix='pyquantumkit-job')
+    return _Default_Executor
+
+
+# The locks to serialize the jobs on the quantum machines which do not support parallel runs, by id(machine)
+#   (a lock reused after its machine is collected only serializes more)
+_Machine_Locks = {}
+_Machine_Locks_Lock = threading.Lock()
+
+def support_parallel_jobs(q_machine) -> bool:
+    """
+    Return whether several jobs can run on the quantum machine at the same time
+
+        A machine can decide by the method support_parallel_run() (e.g. FakeBackend),
+          otherwise the framework decides (e.g. pyqpanda3 keeps the result of the last run in the machine).
+        The built-in machines keep no state between a run and its result.
+    """
+    if hasattr(q_machine, 'support_parallel_run'):
+        return q_machine.support_parallel_run()
+    framework = get_framework_from_object(q_machine)
+    return framework == 'pyquantumkit' or get_support_parallel_run(framework)
+
+def _run_job(q_machine, q_prog, shots : int, **kwargs) -> dict:
+    if support_parallel_jobs(q_machine):
+        return run_and_get_counts(q_machine, q_prog, shots, **kwargs)
+    with _Machine_Locks_Lock:
+        lock = _Machine_Locks.setdefault(id(q_machine), threading.Lock())
+    with lock:
+        return run_and_get_counts(q_machine, q_prog, shots, **kwargs)
+
+
+class JobHandle:
+    """
+    The handle of a job which runs a quantum program on a quantum machine in background
+
+        NOTE: a job which exceeds its timeout is not interrupted, only the waiting is stopped.
+        NOTE: the jobs on a machine which does not support parallel runs (see support_parallel_jobs)
+              are run one by one.
+    """
+    def __init__(self, q_machine, q_prog, shots : int = 1, **kwargs) -> None:
+        """
+        Construct a JobHandle object (the job is not submitted until submit() is called)
+
+            q_machine : target quantum machine
+            q_prog    : target quantum program
+            shots     : running shots (repeat times)
+            kwargs    : (optional) Other parameters of run_and_get_counts
+        """
+        self._qvm = q_machine
+        self._prog = q_prog
+        self._shots = shots
+        self._kwargs = kwargs
+        self._future = None
+
+    def submit(self, executor : Executor = None):
+        """
+        Submit the job
+
+            executor : (optional, default None) the executor to run the job,
+                       None means a shared thread pool with Default_Max_Concurrency threads
+
+        -> Return : self
+        """
+        if self._future is not None:
+            raise PyQuantumKitError('The job has been submitted!')
+        pool = _get_default_executor() if executor is None else executor
+        self._future = pool.submit(_run_job, self._qvm, self._prog, self._shots, **self._kwargs)
+        return self
+
+    def submitted(self) -> bool:
+        """
+        Return whether the job has been submitted
+        """
+        return self._future is not None
+
+    def done(self) -> bool:
+        """
+        Return whether the job is finished (or cancelled)
+        """
+        return self._future is not None and self._future.done()
+
+    def cancel(self) -> bool:
+        """
+        Cancel the job if it is not running
+
+        -> Return : True if the job is cancelled
+        """
+        return self._future is not None and self._future.cancel()
+
+    def result(self, timeout : float = None) -> dict:
+        """
+        Wait for the job and return the result dict, the job will be submitted if not yet
+
+            timeout : (optional, default None) the maximum waiting time (seconds), None means no limit
+
+        -> Return : dict of results; raise concurrent.futures.TimeoutError if the timeout is exceeded
+        """
+        if self._future is None:
+            self.submit()
+        return self._future.result(timeout)
+
+    async def result_async(self, timeout : float = None) -> dict:
+        """
+        Await the job and return the result dict, the job will be submitted if not yet
+
+            timeout : (optional, default None) the maximum waiting time (seconds), None means no limit
+
+        -> Return : dict of results; raise asyncio.TimeoutError if the timeout is exceeded
+        """
+        if self._future is None:
+            self.submit()
+        return await asyncio.wait_for(asyncio.wrap_future(self._future), timeout)
+
+
+def submit_jobs(q_machine, q_progs : list, shots : int = 1, executor : Executor = None,
+                **kwargs) -> list[JobHandle]:
+    """
+    Submit several quantum programs as background jobs
+
+        q_machine : target quantum machine
+        q_progs   : list of target quantum programs
+        shots     : running shots (repeat times) of each program
+        executor  : (optional, default None) the executor to run the jobs
+        kwargs    : (optional) Other parameters of run_and_get_counts
+
+    -> Return : list of JobHandle objects, in the same order as <q_progs>
+    """
+    return [JobHandle(q_machine, p, shots, **kwargs).submit(executor) for p in q_progs]
+
+
+async def run_and_get_counts_async(q_machine, q_prog, shots : int = 1, timeout : float = None,
+                                   **kwargs) -> dict:
+    """
+    Run quantum programs on quantum machine asynchronously and get the result dict
+
+        q_machine : target quantum machine
+        q_prog    : target quantum program
+        shots     : running shots (repeat times)
+        timeout   : (optional, default None) the maximum waiting time (seconds), None means no limit
+        kwargs    : (optional) Other parameters
+
+    -> Return : dict of results; raise asyncio.TimeoutError if the timeout is exceeded
+    """
+    return await JobHandle(q_machine, q_prog, shots, **kwargs).result_async(timeout)
+
+
+async def run_and_get_counts_batch_async(q_machine, q_progs : list, shots : int = 1,
+                                         max_concurrency : int = Default_Max_Concurrency,
+                                         timeout : float = None, **kwargs) -> list[dict]:
+    """
+    Run several quantum programs on quantum machine asynchronously, overlapping the waiting of jobs
+
+        q_machine       : target quantum machine
+        q_progs         : list of target quantum programs
+        shots           : running shots (repeat times) of each program
+        max_concurrency : (default Default_Max_Concurrency) the maximum number of jobs running at the same time,
+                          which is 1 if the machine does not support parallel runs (see support_parallel_jobs)
+        timeout         : (optional, default None) the maximum running time (seconds) of each job
+        kwargs          : (optional) Other parameters
+
+    -> Return : list of result dicts, in the same order as <q_progs>
+    """
+    q_progs = list(q_progs)
+    if not q_progs:
+        return []
+    if not support_parallel_jobs(q_machine):
+        max_concurrency = 1
+    semaphore = asyncio.Semaphore(max_concurrency)
+    pool = ThreadPoolExecutor(min(max_concurrency, len(q_progs)), thread_name_prefix='pyquantumkit-job')
+
+    async def run_one(q_prog):
+        async with semaphore:
+            return await JobHandle(q_machine, q_prog, shots, **kwargs).submit(pool).result_async(timeout)
+
+    try:
+        return await asyncio.gather(*[run_one(p) for p in q_progs])
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,158 @@
+# procedure/parameterized.py
+#    2026/10/19
+#    Author: Peixun Long
+#    Computing Center, Institute of High Energy Physics, CAS
+
+import copy, math, sympy
+from pyquantumkit import PyQuantumKitError
+from pyquantumkit._qframes.framework_map import quantum_action, Action, get_support_parameter
+from pyquantumkit.procedure.generic import new_circuit, new_program
+
+
+def _native_function(method : str, fallback : callable) -> callable:
+    def ret(x):
+        if hasattr(x, method):
+            return getattr(x, method)()
+        return fallback(x)
+    return ret
+
+# Names which may appear in the printed sympy expressions of gate parameters
+Expression_Namespace = {
+    'sin'  : _native_function('sin', math.sin),
+    'cos'  : _native_function('cos', math.cos),
+    'tan'  : _native_function('tan', math.tan),
+    'asin' : _native_function('arcsin', math.asin),
+    'acos' : _native_function('arccos', math.acos),
+    'atan' : _native_function('arctan', math.atan),
+    'exp'  : _native_function('exp', math.exp),
+    'log'  : _native_function('log', math.log),
+    'Abs'  : abs,
+    'sqrt' : lambda x: x ** 0.5,
+    'pi'   : math.pi,
+    'E'    : math.e,
+}
+
+
+class ParameterizedCircuit:
+    """
+    The handle of a parameterized circuit exported from a CircuitIO object
+
+        For the frameworks supporting native parameters (e.g. qiskit), the circuit is built only once,
+          and each binding only assigns the values of parameters.
+        For other frameworks, each binding rebuilds the circuit with the substituted values.
+    """
+    def __init__(self, cir_io, framework : str, is_qprog : bool = True) -> None:
+        """
+        Construct a ParameterizedCircuit object
+
+            cir_io    : the CircuitIO object containing sympy symbols
+            framework : the string to identify the target framework
+            is_qprog  : (default True) whether to build a quantum program (otherwise a quantum circuit)
+        """
+        self._framework = framework
+        self._is_qprog = is_qprog
+        self._nqbits = cir_io.get_nqbits()
+        self._ncbits = cir_io.get_ncbits() if is_qprog else 0
+        self._symbols = sorted(cir_io.get_free_symbols(), key=str)
+        self._native = get_support_parameter(framework)
+        self._params = {}
+        self._circuit = None
+        self._cio = None
+
+        if not self._native:
+            self._cio = copy.deepcopy(cir_io)
+            return
+
+        # Symbols are renamed to valid identifiers, which are resolved into native parameters
+        renames = {}
+        namespace = None if framework == 'pyquantumkit' else dict(Expression_Namespace)
+        for i in range(len(self._symbols)):
+            s = self._symbols[i]
+            self._params[s] = quantum_action(Action.PARAM, framework, str(s))
+            if namespace is None:
+                renames[s] = self._params[s]
+            else:
+                key = '_pqk_param_' + str(i)
+                renames[s] = sympy.Symbol(key)
+                namespace[key] = self._params[s]
+
+        self._circuit = self.__new_circuit()
+        ops = []
+        for item in cir_io:
+            paras = item[2]
+            if item[0] != 'M' and paras is not None:
+                paras = [x.subs(renames) if hasattr(x, 'subs') else x for x in paras]
+            ops.append((item[0], item[1], paras))
+        if namespace is None:
+            quantum_action(Action.GATES, 0, self._circuit, ops)
+        else:
+            quantum_action(Action.GATES, 0, self._circuit, ops, namespace)
+
+    def __new_circuit(self):
+        if self._is_qprog:
+            return new_program(self._framework, self._nqbits, self._ncbits)
+        return new_circuit(self._framework, self._nqbits)
+
+    def __get_subsdict(self, values) -> dict:
+        if isinstance(values, dict):
+            for s in self._symbols:
+                if s not in values:
+                    raise PyQuantumKitError('The value of symbol "' + str(s) + '" is not given!')
+            return values
+        if len(values) != len(self._symbols):
+            raise PyQuantumKitError('Expect ' + str(len(self._symbols)) + ' values, but '
+                                    + str(len(values)) + ' are given!')
+        return {self._symbols[i] : values[i] for i in range(len(self._symbols))}
+
+    def is_native(self) -> bool:
+        """
+        Return whether the circuit is parameterized natively by the target framework
+        """
+        return self._native
+
+    def get_symbols(self) -> list:
+        """
+        Return the list of sympy symbols (sorted by name), which gives the order of values in bind()
+        """
+        return list(self._symbols)
+
+    def get_parameters(self) -> dict:
+        """
+        Return the dict: sympy symbol -> native parameter of the target framework
+            NOTE: the dict is empty if native parameters are not supported
+        """
+        return dict(self._params)
+
+    def get_circuit(self):
+        """
+        Return the native parameterized circuit,
+            which can be compiled (e.g. transpiled) once by the backend and then passed to bind()
+
+            NOTE: return None if native parameters are not supported
+        """
+        return self._circuit
+
+    def bind(self, values, circuit = None):
+        """
+        Assign the values of parameters and return the bound circuit
+
+            values  : (dict or list) e.g. {t : 3, x : 4} means assign symbol t with number 3, and symbol x with 4;
+                      or the list of values ordered as get_symbols()
+            circuit : (optional, default None) the circuit to be bound, which should be derived from
+                      get_circuit() by the backend (e.g. a transpiled circuit).
+                      If None, bind the circuit returned by get_circuit()
+
+        -> Return : the bound circuit of target framework
+        """
+        subsdict = self.__get_subsdict(values)
+        if not self._native:
+            if circuit is not None:
+                raise PyQuantumKitError('Framework "' + self._framework
+                                        + '" does not support binding native parameterized circuits.')
+            ret = self.__new_circuit()
+            self._cio.append_into_actual_circuit(ret, subsdict)
+            return ret
+
+        target = self._circuit if circuit is None else circuit
+        bind_dict = {self._params[s] : subsdict[s] for s in self._symbols}
+        return quantum_action(Action.BIND, self._framework, target, bind_dict)
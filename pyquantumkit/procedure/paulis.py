@@ -3,7 +3,7 @@
 #    Author: Peixun Long
 #    Computing Center, Institute of High Energy Physics, CAS
 
-from pyquantumkit.procedure.generic import apply_gate, apply_measure
+from pyquantumkit.procedure.generic import apply_gate, apply_gates, apply_measure
 from pyquantumkit import PyQuantumKitError
 
 Pauli_Strings = ['I', 'X', 'Y', 'Z']
@@ -121,26 +121,27 @@ def apply_exp_pauli(q_circuit, paulistr : str, t : float, qindex : list[int], fo
         return q_circuit
 
     # Algorithm for general cases
+    ops = []
     for i in range(0, len(ps)):
         if ps[i] == 'X':
-            apply_gate(q_circuit, 'H', [qi[i]])
+            ops.append(('H', [qi[i]]))
         elif ps[i] == 'Y':
-            apply_gate(q_circuit, 'SD', [qi[i]])
-            apply_gate(q_circuit, 'H', [qi[i]])
+            ops.append(('SD', [qi[i]]))
+            ops.append(('H', [qi[i]]))
     for i in range(0, len(ps)):
         if i != f:
-            apply_gate(q_circuit, 'CX', [qi[i], qi[f]])
+            ops.append(('CX', [qi[i], qi[f]]))
 
-    apply_gate(q_circuit, 'RZ', [qi[f]], [t * 2])
+    ops.append(('RZ', [qi[f]], [t * 2]))
 
     for i in range(len(ps) - 1, -1, -1):
         if i != f:
-            apply_gate(q_circuit, 'CX', [qi[i], qi[f]])
+            ops.append(('CX', [qi[i], qi[f]]))
     for i in range(0, len(ps)):
         if ps[i] == 'X':
-            apply_gate(q_circuit, 'H', [qi[i]])
+            ops.append(('H', [qi[i]]))
         elif ps[i] == 'Y':
-            apply_gate(q_circuit, 'H', [qi[i]])
-            apply_gate(q_circuit, 'S', [qi[i]])
+            ops.append(('H', [qi[i]]))
+            ops.append(('S', [qi[i]]))
 
-    return q_circuit
+    return apply_gates(q_circuit, ops)
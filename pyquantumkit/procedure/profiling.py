@@ -0,0 +1,146 @@
+# procedure/profiling.py
+#    2026/10/19
+#    Author: Peixun Long
+#    Computing Center, Institute of High Energy Physics, CAS
+
+import json, os, threading, time
+from pyquantumkit._qframes.code_translate import get_standard_gatename
+
+# The active profiles, which record every quantum action (see quantum_action in _qframes/framework_map.py)
+#   The list is empty unless a profile is entered, so that profiling costs one check per action when disabled.
+Active_Profiles = []
+_Profiles_Lock = threading.Lock()
+
+
+class Profile:
+    """
+    Records of the quantum actions (framework_map.quantum_action) in a profiling session:
+        the call count and cumulative time of each action and phase per framework,
+        the histogram of applied gates per framework, and (optionally) the timeline of calls
+
+        The time of an action includes the nested actions (e.g. GATES called in CIRCUIT of CircuitIO).
+        The phases of an action are named '<action>.<phase>', e.g. 'GATE.codegen', 'GATE.exec', 'RUN.exec'.
+
+        Usage:
+            with profile() as p:
+                ...
+            print(p.summary())
+            p.to_chrome_trace('trace.json')
+    """
+    def __init__(self, trace : bool = True) -> None:
+        """
+        Construct a Profile object
+
+            trace : (default True) whether the timeline of calls is kept for the Chrome trace
+        """
+        self._trace = trace
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self.stats = {}         # {action : {framework : [count, seconds]}}
+        self.gates = {}         # {framework : {gate : count}}
+        self.events = []        # [(name, framework, start, duration, thread id)], in seconds from the origin
+
+    def __enter__(self) -> 'Profile':
+        with _Profiles_Lock:
+            Active_Profiles.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        with _Profiles_Lock:
+            Active_Profiles.remove(self)
+
+    def record(self, name : str, framework : str, start : float, end : float, gates : list = None) -> None:
+        """
+        Record a call of an action (or phase) which ran in [<start>, <end>] (by time.perf_counter),
+            with the names of the gates it applied
+        """
+        with self._lock:
+            item = self.stats.setdefault(name, {}).setdefault(framework, [0, 0.0])
+            item[0] += 1
+            item[1] += end - start
+            if gates:
+                hist = self.gates.setdefault(framework, {})
+                for g in gates:
+                    hist[g] = hist.get(g, 0) + 1
+            if self._trace:
+                self.events.append((name, framework, start - self._origin, end - start, threading.get_ident()))
+
+    def to_dict(self) -> dict:
+        """
+        Return the records as a dict of {'stats' : {action : {framework : {'count', 'time'}}},
+                                         'gates' : {framework : {gate : count}}}
+        """
+        with self._lock:
+            stats = {name : {fm : {'count' : item[0], 'time' : item[1]} for (fm, item) in fms.items()}
+                     for (name, fms) in self.stats.items()}
+            gates = {fm : dict(hist) for (fm, hist) in self.gates.items()}
+        return {'stats' : stats, 'gates' : gates}
+
+    def to_json(self, fname : str = None) -> str:
+        """
+        Return the records (see to_dict) in JSON, and write them into the file <fname> if given
+        """
+        ret = json.dumps(self.to_dict(), indent=1)
+        if fname is not None:
+            with open(fname, 'w') as f:
+                f.write(ret)
+        return ret
+
+    def to_chrome_trace(self, fname : str = None) -> str:
+        """
+        Return the timeline of calls in the Chrome trace event format (chrome://tracing, Perfetto),
+            and write it into the file <fname> if given
+        """
+        pid = os.getpid()
+        with self._lock:
+            events = [{'name' : name, 'cat' : fm, 'ph' : 'X', 'ts' : start * 1e6, 'dur' : duration * 1e6,
+                       'pid' : pid, 'tid' : tid} for (name, fm, start, duration, tid) in self.events]
+        ret = json.dumps({'traceEvents' : events, 'displayTimeUnit' : 'ms'})
+        if fname is not None:
+            with open(fname, 'w') as f:
+                f.write(ret)
+        return ret
+
+    def summary(self) -> str:
+        """
+        Return the table of the call count and cumulative time of actions, sorted by the time
+        """
+        rows = [(item['time'], name, fm, item['count'])
+                for (name, fms) in self.to_dict()['stats'].items() for (fm, item) in fms.items()]
+        lines = ['%-16s %-14s %10s %12s' % ('action', 'framework', 'calls', 'time (s)')]
+        for (t, name, fm, count) in sorted(rows, reverse=True):
+            lines.append('%-16s %-14s %10d %12.6f' % (name, fm, count, t))
+        return '\n'.join(lines)
+
+
+def profile(trace : bool = True) -> Profile:
+    """
+    Return a Profile object to be entered by 'with', which records the quantum actions in the block
+
+        trace : (default True) whether the timeline of calls is kept for the Chrome trace
+    -> Return : Profile
+    """
+    return Profile(trace)
+
+
+def action_gates(action_name : str, args : tuple) -> list:
+    """
+    Return the standard names of the gates applied by the arguments of an action (GATE or GATES)
+    """
+    if action_name == 'GATE':
+        return [get_standard_gatename(args[1])]
+    if action_name == 'GATES':
+        return [get_standard_gatename(op[0]) for op in args[1]]
+    return None
+
+
+def record_action(action_name : str, framework : str, start : float, args : tuple = None) -> float:
+    """
+    Record a call of an action (or phase) since <start> into all active profiles
+    -> Return : the end time of the call
+    """
+    end = time.perf_counter()
+    gates = None if args is None else action_gates(action_name, args)
+    for p in list(Active_Profiles):
+        p.record(action_name, framework, start, end, gates)
+    return end
@@ -0,0 +1,486 @@
+# procedure/qasm.py
+#    2026/10/19
+#    Author: Peixun Long
+#    Computing Center, Institute of High Energy Physics, CAS
+
+import io, math, re, sympy
+from functools import lru_cache
+from pyquantumkit import PyQuantumKitError
+from pyquantumkit.procedure.circuit_io import CircuitIO
+from pyquantumkit._qframes.extra._qasm import QASM2_Gate_Definition, QASM3_Gate_Definition
+
+# OpenQASM 2.0 / 3.0 import and export of CircuitIO objects
+#   The reader is a single pass over the lines of the text: each statement (ended by ';' or a '}' block)
+#   is matched by regular expressions and mapped onto the standard gate names, so the memory in use
+#   does not grow with the length of the file except for the CircuitIO object itself.
+
+# Gates of OpenQASM: name -> (standard gate name, number of qubits, number of parameters)
+Qasm_Gates = {
+    'id' : ('I', 1, 0), 'x' : ('X', 1, 0), 'y' : ('Y', 1, 0), 'z' : ('Z', 1, 0),
+    's' : ('S', 1, 0), 't' : ('T', 1, 0), 'h' : ('H', 1, 0), 'sdg' : ('SD', 1, 0), 'tdg' : ('TD', 1, 0),
+    'sx' : ('SX', 1, 0), 'sxdg' : ('SXD', 1, 0),
+    'cx' : ('CX', 2, 0), 'CX' : ('CX', 2, 0), 'cy' : ('CY', 2, 0), 'cz' : ('CZ', 2, 0), 'ch' : ('CH', 2, 0),
+    'swap' : ('SW', 2, 0), 'iswap' : ('ISW', 2, 0), 'cs' : ('CS', 2, 0), 'csdg' : ('CSD', 2, 0),
+    'ccx' : ('CCX', 3, 0), 'ccz' : ('CCZ', 3, 0), 'cswap' : ('CSW', 3, 0),
+    'rx' : ('RX', 1, 1), 'ry' : ('RY', 1, 1), 'rz' : ('RZ', 1, 1),
+    'rxx' : ('RXX', 2, 1), 'ryy' : ('RYY', 2, 1), 'rzz' : ('RZZ', 2, 1),
+    'crx' : ('CRX', 2, 1), 'cry' : ('CRY', 2, 1), 'crz' : ('CRZ', 2, 1),
+    'u1' : ('U1', 1, 1), 'p' : ('U1', 1, 1), 'phase' : ('U1', 1, 1),
+    'cu1' : ('CU1', 2, 1), 'cp' : ('CU1', 2, 1), 'cphase' : ('CU1', 2, 1),
+    'u3' : ('U3', 1, 3), 'u' : ('U3', 1, 3), 'U' : ('U3', 1, 3),
+    'u2' : ('U3', 1, 2),        # u2(phi, lambda) = u3(pi/2, phi, lambda)
+}
+
+# Definitions of the gates in qelib1.inc (OpenQASM 2.0) and stdgates.inc (OpenQASM 3.0) which are not in Qasm_Gates,
+#   preloaded as user-defined gates of the reader and expanded into the standard gates
+Qasm_Library_Gate_Definition = [
+    'gate u0(gamma) q { U(0,0,0) q; }',
+    'gate cu3(theta,phi,lam) c, t { u1((lam+phi)/2) c; u1((lam-phi)/2) t; cx c,t; '
+    'u3(-theta/2,0,-(phi+lam)/2) t; cx c,t; u3(theta/2,phi,0) t; }',
+    'gate cu(theta,phi,lam,gamma) c, t { p(gamma) c; p((lam+phi)/2) c; p((lam-phi)/2) t; cx c,t; '
+    'u(-theta/2,0,-(phi+lam)/2) t; cx c,t; u(theta/2,phi,0) t; }',
+    'gate csx a, b { h b; cu1(pi/2) a,b; h b; }',
+    'gate rccx a, b, c { u2(0,pi) c; u1(pi/4) c; cx b,c; u1(-pi/4) c; cx a,c; u1(pi/4) c; cx b,c; '
+    'u1(-pi/4) c; u2(0,pi) c; }',
+    'gate rc3x a, b, c, d { u2(0,pi) d; u1(pi/4) d; cx c,d; u1(-pi/4) d; u2(0,pi) d; cx a,d; u1(pi/4) d; '
+    'cx b,d; u1(-pi/4) d; cx a,d; u1(pi/4) d; cx b,d; u1(-pi/4) d; u2(0,pi) d; u1(pi/4) d; cx c,d; '
+    'u1(-pi/4) d; u2(0,pi) d; }',
+    'gate c3x a, b, c, d { h d; p(pi/8) a; p(pi/8) b; p(pi/8) c; p(pi/8) d; cx a,b; p(-pi/8) b; cx a,b; '
+    'cx b,c; p(-pi/8) c; cx a,c; p(pi/8) c; cx b,c; p(-pi/8) c; cx a,c; cx c,d; p(-pi/8) d; cx b,d; '
+    'p(pi/8) d; cx c,d; p(-pi/8) d; cx a,d; p(pi/8) d; cx c,d; p(-pi/8) d; cx b,d; p(pi/8) d; cx c,d; '
+    'p(-pi/8) d; cx a,d; h d; }',
+    'gate c3sqrtx a, b, c, d { h d; cu1(pi/8) a,d; h d; cx a,b; h d; cu1(-pi/8) b,d; h d; cx a,b; h d; '
+    'cu1(pi/8) b,d; h d; cx b,c; h d; cu1(-pi/8) c,d; h d; cx a,c; h d; cu1(pi/8) c,d; h d; cx b,c; h d; '
+    'cu1(-pi/8) c,d; h d; cx a,c; h d; cu1(pi/8) c,d; h d; }',
+    'gate c4x a, b, c, d, e { h e; cu1(pi/2) d,e; h e; c3x a,b,c,d; h e; cu1(-pi/2) d,e; h e; c3x a,b,c,d; '
+    'c3sqrtx a,b,c,e; }',
+]
+
+# Maximum number of cached argument strings in reading
+Max_Cached_Arguments = 65536
+
+_Statement_Re = re.compile(r'([A-Za-z_]\w*)\s*(?:\(((?:[^()]|\((?:[^()]|\([^()]*\))*\))*)\))?\s*(.*)$', re.S)
+_Arg_Re = re.compile(r'\s*([A-Za-z_]\w*)\s*(?:\[\s*([0-9]+)\s*\])?\s*$')
+_Register_Re = re.compile(r'(qreg|creg|qubit|bit)\s*(?:\[\s*([0-9]+)\s*\])?\s*([A-Za-z_]\w*)\s*(?:\[\s*([0-9]+)\s*\])?\s*$')
+_Token_Re = re.compile(r'\s*(?:([0-9]+\.?[0-9]*(?:[eE][-+]?[0-9]+)?|\.[0-9]+(?:[eE][-+]?[0-9]+)?)|'
+                       r'([A-Za-z_]\w*|π|τ)|(\*\*|[-+*/^(),]))')
+
+_Math_Namespace = {
+    'pi' : math.pi, 'π' : math.pi, 'tau' : math.tau, 'τ' : math.tau, 'euler' : math.e,
+    'sin' : math.sin, 'cos' : math.cos, 'tan' : math.tan, 'exp' : math.exp, 'ln' : math.log,
+    'sqrt' : math.sqrt, 'asin' : math.asin, 'acos' : math.acos, 'atan' : math.atan,
+    'arcsin' : math.asin, 'arccos' : math.acos, 'arctan' : math.atan,
+}
+_Sympy_Namespace = {
+    'pi' : sympy.pi, 'π' : sympy.pi, 'tau' : 2 * sympy.pi, 'τ' : 2 * sympy.pi, 'euler' : sympy.E,
+    'sin' : sympy.sin, 'cos' : sympy.cos, 'tan' : sympy.tan, 'exp' : sympy.exp, 'ln' : sympy.log,
+    'sqrt' : sympy.sqrt, 'asin' : sympy.asin, 'acos' : sympy.acos, 'atan' : sympy.atan,
+    'arcsin' : sympy.asin, 'arccos' : sympy.acos, 'arctan' : sympy.atan,
+}
+
+
+@lru_cache(maxsize=4096)
+def _compile_expression(text : str) -> tuple:
+    # Return (code object, names) of a parameter expression after checking its tokens
+    pos = 0
+    tokens = []
+    names = set()
+    text = text.rstrip()
+    while pos < len(text):
+        m = _Token_Re.match(text, pos)
+        if m is None:
+            raise PyQuantumKitError('Invalid expression in OpenQASM: "' + text + '"')
+        (number, name, op) = m.groups()
+        if name is not None:
+            if name not in _Math_Namespace:
+                names.add(name)
+            tokens.append(name)
+        else:
+            tokens.append(number if number is not None else ('**' if op == '^' else op))
+        pos = m.end()
+    return (compile(' '.join(tokens), '<qasm>', 'eval'), frozenset(names))
+
+@lru_cache(maxsize=4096)
+def _constant_value(text : str) -> float:
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    (code, names) = _compile_expression(text)
+    if names:
+        raise PyQuantumKitError('Undefined identifier in OpenQASM: ' + ', '.join(sorted(names)))
+    return float(eval(code, {'__builtins__' : {}}, _Math_Namespace))
+
+def _expression_value(text : str, env : dict):
+    # The value of a parameter expression, where <env> gives the values of identifiers
+    if not env:
+        return _constant_value(text)
+    (code, names) = _compile_expression(text)
+    if not names:
+        return _constant_value(text)
+    for name in names:
+        if name not in env:
+            raise PyQuantumKitError('Undefined identifier in OpenQASM: ' + name)
+    is_symbolic = any(hasattr(env[name], 'free_symbols') for name in names)
+    namespace = dict(_Sympy_Namespace if is_symbolic else _Math_Namespace)
+    namespace.update((name, env[name]) for name in names)
+    ret = eval(code, {'__builtins__' : {}}, namespace)
+    return ret if is_symbolic else float(ret)
+
+def _split_top(text : str) -> list[str]:
+    # Split a string by the commas not in parentheses
+    if '(' not in text:
+        return text.split(',')
+    ret = []
+    (depth, start) = (0, 0)
+    for (i, ch) in enumerate(text):
+        if ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif ch == ',' and depth == 0:
+            ret.append(text[start : i])
+            start = i + 1
+    ret.append(text[start:])
+    return ret
+
+
+@lru_cache(maxsize=None)
+def _library_gates() -> dict:
+    # The user-defined gates of Qasm_Library_Gate_Definition
+    reader = _QasmReader(False)
+    for text in Qasm_Library_Gate_Definition:
+        (head, _, body) = text.partition('{')
+        reader.block(head, body.rstrip()[:-1])
+    return reader.gates
+
+
+class _QasmReader:
+    # The state of reading an OpenQASM text
+    def __init__(self, library : bool = True) -> None:
+        self.cir_io = CircuitIO()
+        self.qregs = {}         # name -> (offset, size)
+        self.cregs = {}
+        self.nqbits = 0
+        self.ncbits = 0
+        self.inputs = {}        # name -> sympy.Symbol
+        # name -> (parameter names, qubit names, body) of user-defined gates, including the library gates
+        self.gates = dict(_library_gates()) if library else {}
+        self.gatelist = self.cir_io._gatelist
+        self.argcache = {}      # argument text -> qubits of each application
+
+    def finish(self) -> CircuitIO:
+        self.cir_io.set_nqbits(self.nqbits)
+        self.cir_io.set_ncbits(self.ncbits)
+        return self.cir_io
+
+    def __bits(self, regs : dict, text : str) -> list[int]:
+        m = _Arg_Re.match(text)
+        if m is None or m.group(1) not in regs:
+            raise PyQuantumKitError('Invalid or undeclared register in OpenQASM: "' + text.strip() + '"')
+        (offset, size) = regs[m.group(1)]
+        if m.group(2) is None:
+            return list(range(offset, offset + size))
+        index = int(m.group(2))
+        if index >= size:
+            raise PyQuantumKitError('Index out of range in OpenQASM: "' + text.strip() + '"')
+        return [offset + index]
+
+    def __qbits_groups(self, qtext : str) -> list[tuple]:
+        # The qubits of each application of a gate, a register argument means the gate is applied on its qubits
+        args = qtext.split(',')
+        if len(args) == 1:
+            qbits = self.__bits(self.qregs, args[0])
+            return [tuple(qbits)] if len(qbits) == 1 else [(q,) for q in qbits]
+        bits = [self.__bits(self.qregs, a) for a in args]
+        size = max(len(b) for b in bits)
+        if any(len(b) != 1 and len(b) != size for b in bits):
+            raise PyQuantumKitError('The sizes of registers are different in OpenQASM: "' + qtext.strip() + '"')
+        return [tuple(b[0] if len(b) == 1 else b[i] for b in bits) for i in range(size)]
+
+    def __append_gate(self, name : str, qbits : list[int], paras : list) -> None:
+        gate = Qasm_Gates.get(name)
+        if gate is not None:
+            (g, nq, np) = gate
+            if len(qbits) != nq or len(paras) != np:
+                raise PyQuantumKitError('Wrong number of qubits or parameters of gate "' + name + '" in OpenQASM')
+            if name == 'u2':
+                paras = [math.pi / 2, paras[0], paras[1]]
+            self.gatelist.append([g, qbits, paras if paras else None])
+            return
+        gatedef = self.gates.get(name)
+        if gatedef is None:
+            raise PyQuantumKitError('Gate "' + name + '" is not defined in OpenQASM')
+        (pnames, qnames, body) = gatedef
+        if len(qbits) != len(qnames) or len(paras) != len(pnames):
+            raise PyQuantumKitError('Wrong number of qubits or parameters of gate "' + name + '" in OpenQASM')
+        # Expand the user-defined gate
+        env = dict(zip(pnames, paras))
+        qmap = dict(zip(qnames, qbits))
+        for (bname, bparas, bargs) in body:
+            self.__append_gate(bname, [qmap[a] for a in bargs],
+                               [_expression_value(x, env) for x in bparas])
+
+    def __define_gate(self, head : str, body : str) -> None:
+        m = _Statement_Re.match(head[4:].strip())
+        if m is None:
+            raise PyQuantumKitError('Invalid gate definition in OpenQASM: "' + head.strip() + '"')
+        (name, ptext, qtext) = m.groups()
+        if name in Qasm_Gates:
+            return              # the definition of a standard gate
+        pnames = [x.strip() for x in ptext.split(',')] if ptext and ptext.strip() else []
+        qnames = [x.strip() for x in qtext.split(',')]
+        stmts = []
+        for s in body.split(';'):
+            s = s.strip()
+            if not s:
+                continue
+            bm = _Statement_Re.match(s)
+            if bm is None or '@' in s:
+                raise PyQuantumKitError('Unsupported statement in gate "' + name + '" of OpenQASM: "' + s + '"')
+            (bname, bptext, bqtext) = bm.groups()
+            if bname == 'barrier':
+                continue
+            bargs = [x.strip() for x in bqtext.split(',')]
+            for a in bargs:
+                if a not in qnames:
+                    raise PyQuantumKitError('Undefined qubit "' + a + '" in gate "' + name + '" of OpenQASM')
+            bparas = _split_top(bptext) if bptext and bptext.strip() else []
+            stmts.append((bname, bparas, bargs))
+        self.gates[name] = (pnames, qnames, stmts)
+
+    def __register(self, s : str) -> None:
+        m = _Register_Re.match(s)
+        if m is None:
+            raise PyQuantumKitError('Invalid register declaration in OpenQASM: "' + s + '"')
+        (kind, size3, name, size2) = m.groups()
+        size = int(size2 if size2 is not None else (size3 if size3 is not None else 1))
+        if kind in {'qreg', 'qubit'}:
+            self.argcache.clear()
+            self.qregs[name] = (self.nqbits, size)
+            self.nqbits += size
+        else:
+            self.cregs[name] = (self.ncbits, size)
+            self.ncbits += size
+
+    def __measure(self, qtext : str, ctext : str) -> None:
+        qbits = self.__bits(self.qregs, qtext)
+        cbits = self.__bits(self.cregs, ctext)
+        if len(qbits) != len(cbits):
+            raise PyQuantumKitError('The sizes of measured qubits and cbits are different in OpenQASM')
+        # Consecutive measurements are merged into one measurement
+        last = self.gatelist[-1] if self.gatelist else None
+        if last is not None and last[0] == 'M':
+            last[1] += qbits
+            last[2] += cbits
+        else:
+            self.gatelist.append(['M', qbits, cbits])
+
+    def statement(self, s : str) -> None:
+        s = s.strip()
+        if not s:
+            return
+        m = _Statement_Re.match(s)
+        if m is None:
+            raise PyQuantumKitError('Invalid statement in OpenQASM: "' + s + '"')
+        (name, ptext, qtext) = m.groups()
+        if '=' in s:
+            (ctext, _, qtext) = s.partition('=')
+            qtext = qtext.strip()
+            if not qtext.startswith('measure'):
+                raise PyQuantumKitError('Unsupported statement in OpenQASM: "' + s + '"')
+            self.__measure(qtext[7:], ctext)
+        elif name in Qasm_Gates or name in self.gates:
+            groups = self.argcache.get(qtext)
+            if groups is None:
+                groups = self.__qbits_groups(qtext)
+                if len(self.argcache) < Max_Cached_Arguments:
+                    self.argcache[qtext] = groups
+            paras = []
+            if ptext and ptext.strip():
+                try:
+                    paras = [float(x) for x in ptext.split(',')]
+                except ValueError:
+                    paras = [_expression_value(x, self.inputs) for x in _split_top(ptext)]
+            gate = Qasm_Gates.get(name)
+            if gate is not None and name != 'u2':
+                (g, nq, np) = gate
+                if len(groups[0]) != nq or len(paras) != np:
+                    raise PyQuantumKitError('Wrong number of qubits or parameters of gate "' + name + '" in OpenQASM')
+                for qbits in groups:
+                    self.gatelist.append([g, list(qbits), paras if paras else None])
+            else:
+                for qbits in groups:
+                    self.__append_gate(name, list(qbits), paras)
+        elif name in {'qreg', 'creg', 'qubit', 'bit'}:
+            self.__register(s)
+        elif name == 'measure':
+            (qtext, arrow, ctext) = s[7:].partition('->')
+            if not arrow:
+                raise PyQuantumKitError('Unsupported measurement in OpenQASM: "' + s + '"')
+            self.__measure(qtext, ctext)
+        elif name in {'OPENQASM', 'include', 'barrier'}:
+            return
+        elif name == 'input':
+            # OpenQASM 3.0: an input parameter is read as a sympy symbol
+            pname = s.split()[-1]
+            self.inputs[pname] = sympy.Symbol(pname, real=True)
+        elif name == 'opaque':
+            raise PyQuantumKitError('Opaque gates are not supported in OpenQASM: "' + s + '"')
+        else:
+            raise PyQuantumKitError('Unsupported statement in OpenQASM: "' + s + '"')
+
+    def block(self, head : str, body : str) -> None:
+        head = head.strip()
+        if not head.startswith('gate'):
+            raise PyQuantumKitError('Unsupported statement in OpenQASM: "' + head + ' {...}"')
+        self.__define_gate(head, body)
+
+
+def _strip_comments(line : str, in_comment : bool) -> tuple:
+    # Remove the comments '//' and '/* */' of a line, return (line, whether in a block comment at the end)
+    ret = ''
+    pos = 0
+    while pos < len(line):
+        if in_comment:
+            end = line.find('*/', pos)
+            if end == -1:
+                return (ret, True)
+            (pos, in_comment) = (end + 2, False)
+            continue
+        i = line.find('//', pos)
+        j = line.find('/*', pos)
+        if i == -1 and j == -1:
+            return (ret + line[pos:], False)
+        if j == -1 or (i != -1 and i < j):
+            return (ret + line[pos : i] + '\n', False)
+        ret += line[pos : j] + ' '
+        (pos, in_comment) = (j + 2, True)
+    return (ret, in_comment)
+
+
+def read_qasm(fileobj) -> CircuitIO:
+    """
+    Read an OpenQASM 2.0 / 3.0 program into a CircuitIO object, line by line
+
+        fileobj : an iterable of lines, e.g. a text file or io.StringIO
+
+        NOTE: all quantum (classical) registers are joined into the qubits (cbits) in the order of declaration;
+              user-defined gates are expanded; consecutive measurements are merged into one measurement;
+              input parameters of OpenQASM 3.0 become sympy symbols. Classical control flow, reset and
+              gate modifiers are not supported.
+
+    -> Return : the CircuitIO object
+    """
+    reader = _QasmReader()
+    pending = ''
+    in_comment = False
+    for line in fileobj:
+        if in_comment or '/' in line:
+            (line, in_comment) = _strip_comments(line, in_comment)
+        if not pending and line.count(';') == 1 and '{' not in line and line.rstrip().endswith(';'):
+            reader.statement(line.rstrip()[:-1])     # the usual case: one statement in a line
+            continue
+        pending += line
+        if ';' not in line and '}' not in line:
+            continue
+        pos = 0
+        while True:
+            i = pending.find(';', pos)
+            j = pending.find('{', pos)
+            if j != -1 and (i == -1 or j < i):
+                k = pending.find('}', j)
+                if k == -1:
+                    break
+                reader.block(pending[pos : j], pending[j + 1 : k])
+                pos = k + 1
+            elif i != -1:
+                reader.statement(pending[pos : i])
+                pos = i + 1
+            else:
+                break
+        pending = pending[pos:]
+    if pending.strip():
+        raise PyQuantumKitError('Incomplete statement at the end of OpenQASM: "' + pending.strip() + '"')
+    return reader.finish()
+
+def circuit_from_qasm(text : str) -> CircuitIO:
+    """
+    Return the CircuitIO object of an OpenQASM 2.0 / 3.0 program string (see read_qasm)
+    """
+    return read_qasm(io.StringIO(text))
+
+def load_qasm(filename : str) -> CircuitIO:
+    """
+    Load an OpenQASM 2.0 / 3.0 file into a CircuitIO object (see read_qasm)
+    """
+    with open(filename, 'r') as f:
+        return read_qasm(f)
+
+
+def write_qasm(cir_io : CircuitIO, fileobj, version : int = 2, subsdict : dict = None,
+               qreg : str = 'q', creg : str = 'c') -> int:
+    """
+    Write a CircuitIO object into a file-like object as an OpenQASM program
+
+        cir_io   : the CircuitIO object
+        fileobj  : the object with write(str), e.g. a text file or io.StringIO
+        version  : (optional, default 2) the version of OpenQASM, 2 or 3
+        subsdict : (optional, default None) specify the substituted symbols.
+                   The remaining symbols are written as input parameters in OpenQASM 3.0.
+        qreg     : (optional, default 'q') the name of quantum register
+        creg     : (optional, default 'c') the name of classical register
+
+    -> Return : the number of characters written
+    """
+    if version not in {2, 3}:
+        raise PyQuantumKitError('The version of OpenQASM should be 2 or 3!')
+    definitions = QASM2_Gate_Definition if version == 2 else QASM3_Gate_Definition
+    used = []
+    symbols = set()
+    (nqbits, ncbits) = (cir_io.get_nqbits(), cir_io.get_ncbits())
+    for (g, qbits, paras) in cir_io:
+        if g in definitions and g not in used:
+            used.append(g)
+        for q in qbits:
+            nqbits = max(nqbits, q + 1)
+        if g == 'M':
+            for c in paras:
+                ncbits = max(ncbits, c + 1)
+        elif paras is not None:
+            for x in paras:
+                if hasattr(x, 'free_symbols'):
+                    symbols.update((x.subs(subsdict) if subsdict is not None else x).free_symbols)
+    if symbols and version == 2:
+        raise PyQuantumKitError('OpenQASM 2.0 does not support symbolic parameters!')
+
+    lines = ['OPENQASM 2.0;', 'include "qelib1.inc";'] if version == 2 else \
+            ['OPENQASM 3.0;', 'include "stdgates.inc";']
+    lines += [definitions[g] for g in used]
+    lines += ['input float[64] ' + str(x) + ';' for x in sorted(symbols, key=str)]
+    if version == 2:
+        lines.append('qreg ' + qreg + '[' + str(nqbits) + '];')
+        if ncbits > 0:
+            lines.append('creg ' + creg + '[' + str(ncbits) + '];')
+    else:
+        lines.append('qubit[' + str(nqbits) + '] ' + qreg + ';')
+        if ncbits > 0:
+            lines.append('bit[' + str(ncbits) + '] ' + creg + ';')
+    header = '\n'.join(lines) + '\n'
+    nchars = fileobj.write(header) or 0
+    return nchars + cir_io.write_circuit_code(fileobj, 'OpenQASM' + str(version), qreg, creg, '\n', subsdict)
+
+def circuit_to_qasm(cir_io : CircuitIO, version : int = 2, subsdict : dict = None) -> str:
+    """
+    Return the OpenQASM program string of a CircuitIO object (see write_qasm)
+    """
+    f = io.StringIO()
+    write_qasm(cir_io, f, version, subsdict)
+    return f.getvalue()
+
+def save_qasm(cir_io : CircuitIO, filename : str, version : int = 2, subsdict : dict = None) -> None:
+    """
+    Save a CircuitIO object into an OpenQASM file (see write_qasm)
+    """
+    with open(filename, 'w') as f:
+        write_qasm(cir_io, f, version, subsdict)
@@ -0,0 +1,147 @@
+# procedure/result_cache.py
+#    2026/10/19
+#    Author: Peixun Long
+#    Computing Center, Institute of High Energy Physics, CAS
+
+import hashlib, json, os, threading
+from collections import OrderedDict
+from pyquantumkit._qframes.framework_map import Action, quantum_action
+
+
+def get_circuit_hash(q_circuit) -> str:
+    """
+    Return the canonical structural hash (SHA-256 hex string) of a quantum circuit/program,
+        which can be a CircuitIO object or a circuit of the supported frameworks
+    """
+    text = quantum_action(Action.TEXT, 0, q_circuit)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def get_backend_identity(q_machine) -> str:
+    """
+    Return the string to identify a quantum machine, i.e., its type (or function) and name
+    """
+    t = type(q_machine)
+    ret = getattr(q_machine, '__module__', t.__module__) + '.' + \
+          getattr(q_machine, '__qualname__', t.__qualname__)
+    name = getattr(q_machine, 'name', None)
+    if isinstance(name, str):
+        ret += ':' + name
+    return ret
+
+
+def get_backend_seed(q_machine):
+    """
+    Return the seed with which every run of a quantum machine is made, so that the same program
+        always gives the same result (None if the seed is unknown or the runs are not reproducible)
+
+        NOTE: the built-in simulators (get_seed) draw all runs from one random stream, so their
+              repeated runs give fresh samples and they are not reproducible run by run
+    """
+    if hasattr(q_machine, 'get_run_seed'):
+        return q_machine.get_run_seed()
+    options = getattr(q_machine, 'options', None)
+    return getattr(options, 'seed_simulator', None)
+
+
+class ResultCache:
+    """
+    Cache of running results keyed by (circuit hash, backend identity, shots, seed),
+        kept in an in-memory LRU and (optionally) an on-disk store of JSON files
+
+        NOTE: the stored counts are returned without running, so the cache is only suitable
+              for the machines whose every run is made with the same seed (see get_backend_seed),
+              e.g. qiskit-aer with seed_simulator. Other runs are not cached unless <require_seed>
+              is False, and then repeated runs return the first sample.
+    """
+    def __init__(self, maxsize : int = 1024, directory : str = None, require_seed : bool = True) -> None:
+        """
+        Construct a ResultCache object
+
+            maxsize      : (int, default 1024) the maximum number of results in memory
+            directory    : (optional, default None) the directory of on-disk store, None means memory only
+            require_seed : (default True) whether only the runs with a known seed are cached
+        """
+        self._maxsize = maxsize
+        self._directory = directory
+        self._require_seed = require_seed
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def make_key(self, q_machine, q_prog, shots : int) -> str:
+        """
+        Return the cache key of running <q_prog> on <q_machine>, or None if it cannot be cached
+        """
+        seed = get_backend_seed(q_machine)
+        if seed is None and self._require_seed:
+            return None
+        raw = '|'.join([get_circuit_hash(q_prog), get_backend_identity(q_machine), str(shots), str(seed)])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def __file(self, key : str) -> str:
+        return os.path.join(self._directory, key + '.json')
+
+    def get(self, key : str) -> dict:
+        """
+        Return a copy of the stored counts dict, or None if not found
+        """
+        with self._lock:
+            ret = self._memory.get(key)
+            if ret is not None:
+                self._memory.move_to_end(key)
+        if ret is None and self._directory is not None and os.path.exists(self.__file(key)):
+            with open(self.__file(key), 'r') as f:
+                ret = json.load(f)
+            self.__put_memory(key, ret)
+        with self._lock:
+            if ret is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return dict(ret)
+
+    def put(self, key : str, counts : dict) -> None:
+        """
+        Store the counts dict
+        """
+        counts = {str(k) : int(v) for k, v in counts.items()}
+        self.__put_memory(key, counts)
+        if self._directory is not None:
+            # Write into a temporary file first, so concurrent readers never see a partial file
+            tmpfile = self.__file(key) + '.' + str(os.getpid()) + '.' + str(threading.get_ident())
+            with open(tmpfile, 'w') as f:
+                json.dump(counts, f)
+            os.replace(tmpfile, self.__file(key))
+
+    def __put_memory(self, key : str, counts : dict) -> None:
+        with self._lock:
+            self._memory[key] = counts
+            self._memory.move_to_end(key)
+            while len(self._memory) > self._maxsize:
+                self._memory.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Clear the in-memory and on-disk store
+        """
+        with self._lock:
+            self._memory.clear()
+        if self._directory is not None:
+            for fname in os.listdir(self._directory):
+                if fname.endswith('.json'):
+                    os.remove(os.path.join(self._directory, fname))
+
+
+# Cache used by run_and_get_counts when no cache is given (None means disabled)
+Default_Result_Cache = None
+
+def set_default_result_cache(cache : ResultCache) -> None:
+    global Default_Result_Cache
+    Default_Result_Cache = cache
+
+def get_default_result_cache() -> ResultCache:
+    return Default_Result_Cache
@@ -3,8 +3,10 @@
 #    Author: Peixun Long
 #    Computing Center, Institute of High Energy Physics, CAS
 
+import cmath
 import numpy
 import numpy.linalg
+from pyquantumkit import PyQuantumKitError, import_circuit
 
 # Default epsilon
 DEFAULT_TOLERANCE = 0.001
@@ -20,8 +22,130 @@ def numpy_inf_norm(mat : numpy.array) -> float:
     return numpy.linalg.norm(mat, numpy.inf)
 
 
+# Maximum iterations and relative precision of the power iteration to estimate 2-norm by blocks
+POWER_ITERATION_MAX = 100
+POWER_ITERATION_RTOL = 1e-9
+
+
+def _row_blocks(nrows : int, block_rows : int):
+    for start in range(0, nrows, block_rows):
+        yield slice(start, min(nrows, start + block_rows))
+
+
+# In the functions below, cirmat1 = None stands for the identity matrix, whose rows are generated block by block
+
+def _phase_factor(cirmat1 : numpy.array, cirmat2 : numpy.array, phase : str, block_rows : int) -> complex:
+    if phase == 'trace':
+        # e^(i phi) of the inner product tr(cirmat2^dagger cirmat1)
+        inner = 0j
+        for blk in _row_blocks(cirmat2.shape[0], block_rows):
+            if cirmat1 is None:
+                inner += numpy.conj(cirmat2[blk, blk].trace())
+            else:
+                inner += numpy.vdot(cirmat2[blk], cirmat1[blk])
+        return inner / abs(inner) if abs(inner) > 0 else 1.0
+    # phase == 'entry': the ratio of the entries where cirmat2 has the largest magnitude
+    best = -1.0
+    max_index = (0, 0)
+    for blk in _row_blocks(cirmat2.shape[0], block_rows):
+        magnitudes = numpy.abs(cirmat2[blk])
+        k = numpy.unravel_index(numpy.argmax(magnitudes), magnitudes.shape)
+        if magnitudes[k] > best:
+            best = magnitudes[k]
+            max_index = (blk.start + k[0], k[1])
+    if cirmat1 is None:
+        return (1.0 if max_index[0] == max_index[1] else 0.0) / cirmat2[max_index]
+    return cirmat1[max_index] / cirmat2[max_index]
+
+
+def _diff_blocks(cirmat1 : numpy.array, cirmat2 : numpy.array, factor, block_rows : int):
+    # Yield (slice, cirmat1[slice] - factor * cirmat2[slice]) in a reused buffer
+    buf = numpy.empty((min(block_rows, cirmat2.shape[0]), cirmat2.shape[1]),
+                      dtype=numpy.result_type(cirmat2, complex) if cirmat1 is None
+                            else numpy.result_type(cirmat1, cirmat2, complex))
+    for blk in _row_blocks(cirmat2.shape[0], block_rows):
+        d = buf[:blk.stop - blk.start]
+        numpy.multiply(cirmat2[blk], factor, out=d)
+        if cirmat1 is None:
+            numpy.negative(d, out=d)
+            d[numpy.arange(blk.stop - blk.start), numpy.arange(blk.start, blk.stop)] += 1
+        else:
+            numpy.subtract(cirmat1[blk], d, out=d)
+        yield blk, d
+
+
+def _blocked_norm(cirmat1 : numpy.array, cirmat2 : numpy.array, factor, norm, block_rows : int) -> float:
+    if norm is numpy_frobenius_norm:
+        acc = 0.0
+        for (_, d) in _diff_blocks(cirmat1, cirmat2, factor, block_rows):
+            acc += numpy.vdot(d, d).real
+        return float(numpy.sqrt(acc))
+    if norm is numpy_1_norm:
+        colsum = numpy.zeros(cirmat2.shape[1])
+        for (_, d) in _diff_blocks(cirmat1, cirmat2, factor, block_rows):
+            colsum += numpy.abs(d).sum(axis=0)
+        return float(colsum.max())
+    if norm is numpy_inf_norm:
+        ret = 0.0
+        for (_, d) in _diff_blocks(cirmat1, cirmat2, factor, block_rows):
+            ret = max(ret, float(numpy.abs(d).sum(axis=1).max()))
+        return ret
+    if norm is numpy_2_norm:
+        # Power iteration on D^dagger D, each iteration is one pass over the blocks
+        x = numpy.random.default_rng(0).normal(size=cirmat2.shape[1]).astype(complex)
+        x /= numpy.linalg.norm(x)
+        sigma = 0.0
+        for _ in range(POWER_ITERATION_MAX):
+            z = numpy.zeros(cirmat2.shape[1], dtype=complex)
+            for (_, d) in _diff_blocks(cirmat1, cirmat2, factor, block_rows):
+                z += d.conj().T @ (d @ x)
+            znorm = numpy.linalg.norm(z)
+            if znorm == 0:
+                return 0.0
+            newsigma = float(numpy.sqrt(znorm))
+            x = z / znorm
+            if abs(newsigma - sigma) <= POWER_ITERATION_RTOL * newsigma:
+                return newsigma
+            sigma = newsigma
+        return sigma
+    raise PyQuantumKitError('Only the built-in norms are supported when <block_size> is given!')
+
+
+def get_circuit_matrix(q_circuit, subsdict : dict = None, little_endian : bool = False) -> numpy.array:
+    """
+    Return the unitary matrix of a quantum circuit of any supported framework (without measurements),
+        the circuit is imported into CircuitIO and computed by the built-in statevector simulator,
+        so that no simulator of the framework is required (the global phase of the circuit is included)
+
+        q_circuit     : the quantum circuit (or CircuitIO object)
+        subsdict      : (optional, default None) specify the substituted symbols.
+        little_endian : (optional, default False) the order of qubits in the row/column index,
+                        False -- qubit 0 is the highest bit (the same as CircuitIO.get_numpy_matrix())
+                        True  -- qubit 0 is the lowest bit
+
+    -> Return : the numpy.array object with dimension 2^n x 2^n, where n is the number of qubits
+    """
+    from pyquantumkit.simulator.statevector import StatevectorSimulator
+    (cio, gphase) = import_circuit(q_circuit, True)
+    mat = StatevectorSimulator().get_unitary(cio, subsdict)
+    if hasattr(gphase, 'subs') and subsdict is not None:
+        gphase = gphase.subs(subsdict)
+    try:
+        gphase = float(gphase)
+    except TypeError:
+        raise PyQuantumKitError('The global phase "' + str(gphase) + '" is not a number!') from None
+    if gphase != 0.0:
+        mat = mat * cmath.exp(1j * gphase)
+    nqbits = cio.get_nqbits()
+    if not little_endian or nqbits <= 1:
+        return mat
+    axes = list(range(nqbits - 1, -1, -1)) + list(range(2 * nqbits - 1, nqbits - 1, -1))
+    return numpy.ascontiguousarray(mat.reshape([2] * (2 * nqbits)).transpose(axes)).reshape(mat.shape)
+
+
 def numeric_equivalence_check(cirmat1 : numpy.array, cirmat2 : numpy.array, ignore_global_phase : bool = True,
-                              tolerance : float = DEFAULT_TOLERANCE, norm = numpy_2_norm) -> bool:
+                              tolerance : float = DEFAULT_TOLERANCE, norm = numpy_2_norm,
+                              block_size : int = None, phase : str = 'entry') -> bool:
     """
     Equivalence checking based on the norm of matrices difference of two circuits.
 
@@ -33,20 +157,36 @@ def numeric_equivalence_check(cirmat1 : numpy.array, cirmat2 : numpy.array, igno
 
             Other built-in norms: numpy_1_norm, numpy_frobenius_norm, numpy_inf_norm
 
+        block_size : (optional, default None) the maximum number of matrix entries processed at once.
+                     None means the whole matrices; otherwise the difference is evaluated block by block
+                     (rows), and only the built-in norms are supported (2-norm is then computed by
+                     power iteration, see POWER_ITERATION_MAX and POWER_ITERATION_RTOL).
+        phase      : (str) how to align the global phase, default 'entry'.
+                     'entry' -- the ratio of the entries where cirmat2 has the largest magnitude
+                     'trace' -- the phase of the inner product tr(cirmat2^dagger cirmat1)
+
+        NOTE: the input matrices are not modified.
+
     -> Return : True if cirmat1 is equivalence to cirmat2; otherwise False.
     """
-    fact_cirmat2 = cirmat2
-    if ignore_global_phase:
-        magnitudes = numpy.abs(cirmat2)
-        max_index = numpy.unravel_index(numpy.argmax(magnitudes), magnitudes.shape)
-        factor = cirmat1[max_index] / cirmat2[max_index]
-        fact_cirmat2 *= factor
-    if norm(cirmat1 - fact_cirmat2) > tolerance:
-        return False
-    return True
+    return _equivalence_check(cirmat1, cirmat2, ignore_global_phase, tolerance, norm, block_size, phase)
+
+def _equivalence_check(cirmat1 : numpy.array, cirmat2 : numpy.array, ignore_global_phase : bool,
+                       tolerance : float, norm, block_size : int, phase : str) -> bool:
+    if phase not in ('entry', 'trace'):
+        raise PyQuantumKitError('Unknown phase alignment: ' + str(phase))
+    nrows = cirmat2.shape[0]
+    block_rows = nrows if block_size is None else max(1, block_size // max(1, cirmat2.shape[1]))
+    factor = _phase_factor(cirmat1, cirmat2, phase, block_rows) if ignore_global_phase else 1.0
+
+    if block_size is None:
+        (_, d) = next(_diff_blocks(cirmat1, cirmat2, factor, nrows))
+        return bool(norm(d) <= tolerance)
+    return bool(_blocked_norm(cirmat1, cirmat2, factor, norm, block_rows) <= tolerance)
 
 def numeric_identity_check(cirmat : numpy.array, ignore_global_phase : bool = True,
-                           tolerance : float = DEFAULT_TOLERANCE, norm = numpy_2_norm) -> bool:
+                           tolerance : float = DEFAULT_TOLERANCE, norm = numpy_2_norm,
+                           block_size : int = None, phase : str = 'entry') -> bool:
     """
     Identity checking based on the norm of matrices difference of target circuit and identity.
 
@@ -57,7 +197,9 @@ def numeric_identity_check(cirmat : numpy.array, ignore_global_phase : bool = Tr
 
             Other built-in norms: numpy_1_norm, numpy_frobenius_norm, numpy_inf_norm
 
+        block_size, phase : see numeric_equivalence_check
+
     -> Return : True if cirmat is equivalence to identity; otherwise False.
     """
-    matid = numpy.eye(cirmat.shape[0], dtype=cirmat.dtype)
-    return numeric_equivalence_check(matid, cirmat, ignore_global_phase, tolerance, norm)
+    # The identity matrix is not allocated, its rows are generated block by block
+    return _equivalence_check(None, cirmat, ignore_global_phase, tolerance, norm, block_size, phase)
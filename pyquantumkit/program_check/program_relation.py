@@ -3,15 +3,15 @@
 #    Author: Peixun Long
 #    Computing Center, Institute of High Energy Physics, CAS
 
-import math
+import math, numpy
 from random import randint
 from pyquantumkit.classical.common import rand_diff_int_pair
 from pyquantumkit.classical.run_result import count_last_bits_of_result_dict, get_result_str_set
 from pyquantumkit import CircuitIO, new_program, get_n_qubits, get_n_cbits, get_qubit_list, copy_program,\
-      get_framework_from_object, append_program, apply_measure, run_and_get_counts, parallel_programs
-from pyquantumkit.state_prepare.int_state import create_ket_int_le, create_ket_int_plus_eiphi_neg_le
-from pyquantumkit.state_prepare.pauli_eigenstate import create_pauli_eigenstate, uncompute_pauli_eigenstate
-from pyquantumkit.library.swaptest import run_swaptest, check_tr_rho1_rho2_equals_1
+      get_framework_from_object, append_program, apply_measure, run_and_get_counts, parallel_programs, apply_gates
+from pyquantumkit.state_prepare.int_state import ket_int_le_ops, ket_int_plus_eiphi_neg_le_ops
+from pyquantumkit.state_prepare.pauli_eigenstate import pauli_eigenstate_ops
+from pyquantumkit.library.swaptest import run_swaptest, run_swaptest_batch, check_tr_rho1_rho2_equals_1
 from pyquantumkit._qframes.framework_map import get_reverse_output_str
 
 # Implement the relation checking for quantum programs,
@@ -42,6 +42,23 @@ Default_KeepBasis_NPoints = 10
 Default_KeepBasis_NRepeat = 20
 
 
+# ---------- Prefix templates ----------
+# The programs of all samples share the same suffix (e.g. parallel_programs(tp, tp)), which is built once;
+#   only the cheap state-preparation prefix is generated for each sample (vectorized over the samples).
+
+def _prefixed_program(framework : str, nqbits : int, ncbits : int, prefix : list, suffix):
+    ret = new_program(framework, nqbits, ncbits)
+    apply_gates(ret, prefix)
+    if suffix is not None:
+        append_program(ret, suffix)
+    return ret
+
+def _random_paulis(npoints : int, nqbits : int) -> numpy.ndarray:
+    # Drawn by the module random (as the other samples), so that random.seed() reproduces the checks
+    ret = numpy.array([[randint(0, 5) for _ in range(nqbits)] for _ in range(npoints)], dtype=int)
+    return ret.reshape(npoints, nqbits)
+
+
 # ---------- Checking functions ----------
 
 
@@ -71,23 +88,17 @@ def run_equivalence_check(qvm, TargetProc1, TargetProc2,
     qlist2 = [x + Nqs for x in qlist1]
     tp1 = copy_program(TargetProc1)
     tp2 = copy_program(TargetProc2)
+    suffixA = parallel_programs(tp1, tp1)
+    suffixB = parallel_programs(tp2, tp2)
+    suffixAB = parallel_programs(tp1, tp2)
+    randompaulis = _random_paulis(NPoints, Nqs)
+    prefixes = pauli_eigenstate_ops(numpy.hstack([randompaulis, randompaulis]), list(qlist1) + qlist2)
 
     for i in range(0, NPoints):
-        STprocA = new_program(framework, 2 * Nqs, 2 * Ncs1)
-        STprocB = new_program(framework, 2 * Nqs, 2 * Ncs2)
-        STprocAB = new_program(framework, 2 * Nqs, Ncs1 + Ncs2)
-        randompaulis = [randint(0, 5) for _ in qlist1]
-
-        create_pauli_eigenstate(STprocA, randompaulis, qlist1)
-        create_pauli_eigenstate(STprocA, randompaulis, qlist2)
-        append_program(STprocA, parallel_programs(tp1, tp1))
-        create_pauli_eigenstate(STprocB, randompaulis, qlist1)
-        create_pauli_eigenstate(STprocB, randompaulis, qlist2)
-        append_program(STprocB, parallel_programs(tp2, tp2))
-        create_pauli_eigenstate(STprocAB, randompaulis, qlist1)
-        create_pauli_eigenstate(STprocAB, randompaulis, qlist2)
-        append_program(STprocAB, parallel_programs(tp1, tp2))
-        
+        STprocA = _prefixed_program(framework, 2 * Nqs, 2 * Ncs1, prefixes[i], suffixA)
+        STprocB = _prefixed_program(framework, 2 * Nqs, 2 * Ncs2, prefixes[i], suffixB)
+        STprocAB = _prefixed_program(framework, 2 * Nqs, Ncs1 + Ncs2, prefixes[i], suffixAB)
+
         Pa = check_tr_rho1_rho2_equals_1(qvm, STprocA, qlist1, qlist2, NTrace)
         Pb = check_tr_rho1_rho2_equals_1(qvm, STprocB, qlist1, qlist2, NTrace)
         if (Pa != Pb):
@@ -97,9 +108,7 @@ def run_equivalence_check(qvm, TargetProc1, TargetProc2,
             if (not Pab):
                 return False
         else:
-            Na = run_swaptest(qvm, STprocA, qlist1, qlist2, NSTrepeat)
-            Nb = run_swaptest(qvm, STprocB, qlist1, qlist2, NSTrepeat)
-            Nab = run_swaptest(qvm, STprocAB, qlist1, qlist2, NSTrepeat)
+            (Na, Nb, Nab) = run_swaptest_batch(qvm, [STprocA, STprocB, STprocAB], qlist1, qlist2, NSTrepeat)
             r = float(2 * Nab - Na - Nb) / float(NSTrepeat)
             if (abs(r) > epsilon):
                 return False
@@ -125,14 +134,13 @@ def run_identity_check(qvm, TargetProc, NPoints : int = Default_Identity_NPoints
     Ncs = get_n_cbits(TargetProc)
     qlist = get_qubit_list(TargetProc)
     mlist = [x + Ncs for x in qlist]
+    randompaulis = _random_paulis(NPoints, Nqs)
+    prefixes = pauli_eigenstate_ops(randompaulis, qlist)
+    uncomputes = pauli_eigenstate_ops(randompaulis, qlist, uncompute=True)
 
     for i in range(0, NPoints):
-        ptest = new_program(framework, Nqs, Ncs + Nqs)
-        randompaulis = [randint(0, 5) for _ in qlist]
-
-        create_pauli_eigenstate(ptest, randompaulis, qlist)
-        append_program(ptest, TargetProc)
-        uncompute_pauli_eigenstate(ptest, randompaulis, qlist)
+        ptest = _prefixed_program(framework, Nqs, Ncs + Nqs, prefixes[i], TargetProc)
+        apply_gates(ptest, uncomputes[i])
         apply_measure(ptest, qlist, mlist)
 
         raw = run_and_get_counts(qvm, ptest, 1)
@@ -164,14 +172,12 @@ def run_keep_purity_check(qvm, TargetProc,
     qlist1 = get_qubit_list(TargetProc)
     qlist2 = [x + Nqs for x in qlist1]
     tp = copy_program(TargetProc)
+    suffix = parallel_programs(tp, tp)
+    randompaulis = _random_paulis(NPoints, Nqs)
+    prefixes = pauli_eigenstate_ops(numpy.hstack([randompaulis, randompaulis]), list(qlist1) + qlist2)
 
     for i in range(0, NPoints):
-        STproc = new_program(framework, 2 * Nqs, 2 * Ncs)
-        randompaulis = [randint(0, 5) for _ in qlist1]
-
-        create_pauli_eigenstate(STproc, randompaulis, qlist1)
-        create_pauli_eigenstate(STproc, randompaulis, qlist2)
-        append_program(STproc, parallel_programs(tp, tp))
+        STproc = _prefixed_program(framework, 2 * Nqs, 2 * Ncs, prefixes[i], suffix)
 
         isTr1 = check_tr_rho1_rho2_equals_1(qvm, STproc, qlist1, qlist2, NTrace)
         if (not isTr1):
@@ -204,26 +210,26 @@ def run_unitarity_check(qvm, TargetProc,
     qlist1 = get_qubit_list(TargetProc)
     qlist2 = [x + Nqs for x in qlist1]
     tp = copy_program(TargetProc)
-    
-    for i in range(0, NPoints):
-        STproc = new_program(framework, 2 * Nqs, 2 * Ncs)
+    suffix = parallel_programs(tp, tp)
+
+    # The first half of samples: |x> + |~x> and |x> - |~x>; the others: |x> and |y> (x != y)
+    nhalf = (NPoints + 1) // 2
+    nums = [randint(0, (1 << Nqs) - 1) for _ in range(nhalf)]
+    pairs = [rand_diff_int_pair(0, (1 << Nqs) - 1) for _ in range(NPoints - nhalf)]
+    prefixes = [ops1 + ops2 for (ops1, ops2) in zip(ket_int_plus_eiphi_neg_le_ops(nums, 0.0, qlist1),
+                                                    ket_int_plus_eiphi_neg_le_ops(nums, math.pi, qlist2))]
+    prefixes += [ops1 + ops2 for (ops1, ops2) in zip(ket_int_le_ops([x[0] for x in pairs], qlist1),
+                                                     ket_int_le_ops([x[1] for x in pairs], qlist2))]
 
-        if (i <= (NPoints - 1) / 2):
-            num = randint(0, (1 << Nqs) - 1)
-            create_ket_int_plus_eiphi_neg_le(STproc, num, 0.0, qlist1)
-            create_ket_int_plus_eiphi_neg_le(STproc, num, math.pi, qlist2)
-            append_program(STproc, parallel_programs(tp, tp))
+    for i in range(0, NPoints):
+        STproc = _prefixed_program(framework, 2 * Nqs, 2 * Ncs, prefixes[i], suffix)
 
+        if (i < nhalf):
             Npm = run_swaptest(qvm, STproc, qlist1, qlist2, NSTrepeat)
             r = 1.0 - 2.0 * float(Npm) / float(NSTrepeat)
             if (abs(r) > epsilon):
                 return False
         else:
-            (num1, num2) = rand_diff_int_pair(0, (1 << Nqs) - 1)
-            create_ket_int_le(STproc, num1, qlist1)
-            create_ket_int_le(STproc, num2, qlist2)
-            append_program(STproc, parallel_programs(tp, tp))
-
             Nab = run_swaptest(qvm, STproc, qlist1, qlist2, NSTrepeat)
             r = 1.0 - 2.0 * float(Nab) / float(NSTrepeat)
             if (abs(r) > epsilon):
@@ -251,17 +257,14 @@ def run_keep_basis_check(qvm, TargetProc,
     Ncs = get_n_cbits(TargetProc)
     qlist = get_qubit_list(TargetProc)
     mlist = [x + Ncs for x in qlist]
+    prefixes = ket_int_le_ops([randint(0, (1 << Nqs) - 1) for _ in range(0, NPoints)], qlist)
 
     for i in range(0, NPoints):
         mr = -1
-        num = randint(0, (1 << Nqs) - 1)
+        # The same program is run for NRepeat times
+        ptest = _prefixed_program(framework, Nqs, Ncs + Nqs, prefixes[i], TargetProc)
+        apply_measure(ptest, qlist, mlist)
         for j in range(0, NRepeat):
-            ptest = new_program(framework, Nqs, Ncs + Nqs)
-
-            create_ket_int_le(ptest, num, qlist)
-            append_program(ptest, TargetProc)
-            apply_measure(ptest, qlist, mlist)
-
             counts = count_last_bits_of_result_dict(run_and_get_counts(qvm, ptest, 1), Nqs, fw_req_reverse)
             m = int(list(get_result_str_set(counts))[0])
             if mr < 0:
@@ -0,0 +1,121 @@
+# program_check/state_based.py
+#    2026/10/19
+#    Author: Peixun Long
+#    Computing Center, Institute of High Energy Physics, CAS
+
+import numpy
+from pyquantumkit import CircuitIO, PyQuantumKitError
+from pyquantumkit.program_check.matrix_based import DEFAULT_TOLERANCE
+from pyquantumkit.simulator.statevector import StatevectorSimulator
+from pyquantumkit.state_prepare.pauli_eigenstate import create_pauli_eigenstate
+
+# Equivalence checking of CircuitIO objects without building full unitaries:
+#   V = U1 U2^dagger is applied on several input states |psi>, and V|psi> = c|psi> is checked,
+#   where c = 1 (or a common global phase) for all input states.
+
+# Default number of input states
+Default_NStates = 8
+
+
+def _random_state(nqbits : int, rng : numpy.random.Generator) -> numpy.ndarray:
+    v = rng.normal(size=2 ** nqbits) + 1j * rng.normal(size=2 ** nqbits)
+    return v / numpy.linalg.norm(v)
+
+
+def _stabilizer_state(nqbits : int, rng : numpy.random.Generator, qvm : StatevectorSimulator) -> numpy.ndarray:
+    cio = CircuitIO(nqbits)
+    create_pauli_eigenstate(cio, [int(x) for x in rng.integers(0, 6, nqbits)], list(range(nqbits)))
+    return qvm.get_statevector(cio)
+
+
+def _check_no_measure(cir_io : CircuitIO) -> None:
+    if cir_io.contains_measure():
+        raise PyQuantumKitError('Equivalence checking of CircuitIO objects does not support measurements!')
+
+
+def unitary_equivalence_check(cir1 : CircuitIO, cir2 : CircuitIO, ignore_global_phase : bool = True,
+                              tolerance : float = DEFAULT_TOLERANCE, return_fidelity : bool = False):
+    """
+    Equivalence checking based on the Frobenius norm of unitaries difference of two CircuitIO objects,
+        the global phase is aligned by the inner product tr(U1^dagger U2), without any temporary matrix:
+            min_phi ||U1 - e^(i phi) U2||_F^2 = ||U1||_F^2 + ||U2||_F^2 - 2 |tr(U1^dagger U2)|
+
+        cir1, cir2          : the CircuitIO objects (without measurements)
+        ignore_global_phase : (bool) whether to ignore the global phase in judgment, default True.
+        tolerance           : (float) the judgment threshold of the Frobenius norm.
+        return_fidelity     : (bool) whether to also return the fidelity |tr(U1^dagger U2)|^2 / d^2, default False.
+
+    -> Return : True if equivalent; otherwise False. (bool, fidelity) if <return_fidelity> is True
+    """
+    if cir1.get_nqbits() != cir2.get_nqbits():
+        return (False, 0.0) if return_fidelity else False
+    _check_no_measure(cir1)
+    _check_no_measure(cir2)
+    qvm = StatevectorSimulator()
+    u1 = qvm.get_unitary(cir1)
+    u2 = qvm.get_unitary(cir2)
+    inner = numpy.vdot(u1, u2)
+    overlap = abs(inner) if ignore_global_phase else inner.real
+    dist2 = numpy.vdot(u1, u1).real + numpy.vdot(u2, u2).real - 2.0 * overlap
+    ret = bool(numpy.sqrt(max(dist2, 0.0)) <= tolerance)
+    if return_fidelity:
+        return ret, float(abs(inner) ** 2 / u1.shape[0] ** 2)
+    return ret
+
+
+def circuit_equivalence_check(cir1 : CircuitIO, cir2 : CircuitIO, ignore_global_phase : bool = True,
+                              tolerance : float = DEFAULT_TOLERANCE, nstates : int = Default_NStates,
+                              states : str = 'random', seed : int = None, return_fidelity : bool = False):
+    """
+    Equivalence checking of two CircuitIO objects by applying U1 U2^dagger on input states,
+        stops at the first input state which fails (early exit)
+
+        cir1, cir2          : the CircuitIO objects (without measurements)
+        ignore_global_phase : (bool) whether to ignore the global phase in judgment, default True.
+        tolerance           : (float) the judgment threshold of the distance between V|psi> and c|psi>.
+        nstates             : (int) the number of input states, default Default_NStates.
+        states              : (str) the kind of input states, default 'random'.
+                              'random'     -- Haar random states
+                              'stabilizer' -- random products of Pauli eigenstates
+        seed                : (optional, default None) the seed of generating input states.
+        return_fidelity     : (bool) whether to also return the estimate of Hilbert-Schmidt fidelity
+                              |tr(U1^dagger U2)|^2 / d^2, default False. (only unbiased for 'random' states)
+
+    -> Return : True if equivalent; otherwise False. (bool, fidelity) if <return_fidelity> is True
+    """
+    if states not in ('random', 'stabilizer'):
+        raise PyQuantumKitError('Unknown kind of input states: ' + str(states))
+    nqbits = cir1.get_nqbits()
+    if nqbits != cir2.get_nqbits():
+        return (False, 0.0) if return_fidelity else False
+    _check_no_measure(cir1)
+    _check_no_measure(cir2)
+
+    # V = U1 U2^dagger
+    vcir = CircuitIO(nqbits)
+    vcir.append_circuit_io(cir2)
+    vcir.inverse()
+    vcir.append_circuit_io(cir1)
+
+    qvm = StatevectorSimulator()
+    rng = numpy.random.default_rng(seed)
+    ret = True
+    sqr_overlaps = []
+    phase = None if ignore_global_phase else 1.0
+    for _ in range(nstates):
+        psi = _random_state(nqbits, rng) if states == 'random' else _stabilizer_state(nqbits, rng, qvm)
+        c = numpy.vdot(psi, qvm.evolve(vcir, psi))
+        sqr_overlaps.append(abs(c) ** 2)
+        # ||V|psi> - c|psi>||^2 = 1 - |c|^2
+        if phase is None:
+            phase = c / abs(c) if abs(c) > 0 else 1.0
+        if numpy.sqrt(max(1.0 - abs(c) ** 2, 0.0)) > tolerance or abs(c - phase) > tolerance:
+            ret = False
+            break
+
+    if return_fidelity:
+        # For Haar random states, E|<psi|V|psi>|^2 = (|tr V|^2 + d) / (d (d + 1))
+        d = 2 ** nqbits
+        fidelity = ((d + 1) * float(numpy.mean(sqr_overlaps)) - 1.0) / d
+        return ret, min(max(fidelity, 0.0), 1.0)
+    return ret
@@ -0,0 +1,198 @@
+# simulator/density_matrix.py
+#    2026/10/19
+#    Author: Peixun Long
+#    Computing Center, Institute of High Energy Physics, CAS
+
+import numpy
+from pyquantumkit.simulator.gate import numeric_gate_matrix
+from pyquantumkit.simulator.noise import NoiseModel
+from pyquantumkit.simulator.statevector import apply_matrix_to_state, measurement_is_terminal, \
+                                               counts_by_terminal_measure
+
+# NOTE: the density matrix of n qubits is stored as a statevector of 2n qubits (the vectorized matrix),
+#   where qubit i (< n) is the row index of qubit i and qubit n + i is the column index of qubit i.
+#   Gates and channels are applied locally on these axes, e.g. U rho U^dagger applies U on qubits
+#   <qbits> and U* on qubits <qbits + n>, and a channel applies its superoperator on both at once.
+
+
+def zero_density_matrix(nqbits : int) -> numpy.ndarray:
+    """
+    Return the vectorized density matrix of |00...0><00...0| with <nqbits> qubits
+    """
+    ret = numpy.zeros(4 ** nqbits, dtype=complex)
+    ret[0] = 1.0
+    return ret
+
+
+def diagonal_of_density_matrix(rho : numpy.ndarray, nqbits : int) -> numpy.ndarray:
+    """
+    Return the real diagonal (probabilities of computational basis) of a vectorized density matrix
+    """
+    return rho.reshape(2 ** nqbits, 2 ** nqbits).diagonal().real.copy()
+
+
+class DensityMatrixSimulator:
+    """
+    Built-in density-matrix simulator for CircuitIO objects, with an optional noise model
+
+        It can be used as a quantum machine: run_and_get_counts(DensityMatrixSimulator(noise), cir_io, shots)
+    """
+    def __init__(self, noise_model : NoiseModel = None, seed : int = None) -> None:
+        """
+        Construct a DensityMatrixSimulator object
+
+            noise_model : (optional, default None) the NoiseModel, None means noiseless
+            seed        : (optional, default None) the seed of random sampling
+        """
+        self._noise = NoiseModel() if noise_model is None else noise_model
+        self._seed = seed
+        self._rng = numpy.random.default_rng(seed)
+
+    def get_seed(self) -> int:
+        """
+        Return the seed of random sampling (None means unseeded)
+        """
+        return self._seed
+
+    def get_rng(self) -> numpy.random.Generator:
+        """
+        Return the random generator of sampling
+        """
+        return self._rng
+
+    def __apply_gate(self, rho : numpy.ndarray, item : list, nqbits : int, subsdict : dict) -> numpy.ndarray:
+        (g, qbits, paras) = item
+        k = len(qbits)
+        noise = self._noise.get_gate_noise(g, k)
+        if g == 'I' and not noise:
+            return rho
+        if subsdict is not None and paras is not None:
+            paras = [x.subs(subsdict) if hasattr(x, 'subs') else x for x in paras]
+        # The gate and its noise are fused into one superoperator on the 2k local axes,
+        #   so the full density matrix is only touched once per gate
+        mat = numeric_gate_matrix(g, paras) if g != 'I' else numpy.eye(2 ** k, dtype=complex)
+        superop = numpy.kron(mat, mat.conj())
+        for (op, each) in noise:
+            for qs in ([[j] for j in range(k)] if each else [list(range(k))]):
+                superop = apply_matrix_to_state(superop.reshape(-1), op, qs + [j + k for j in qs],
+                                                4 * k).reshape(4 ** k, 4 ** k)
+        return apply_matrix_to_state(rho, superop, list(qbits) + [q + nqbits for q in qbits], 2 * nqbits)
+
+    def __dephase(self, rho : numpy.ndarray, qbit : int, nqbits : int) -> numpy.ndarray:
+        # Non-selective measurement: remove the off-diagonal terms of <qbit>
+        view = rho.reshape([2] * (2 * nqbits)).copy()
+        for (a, b) in ((0, 1), (1, 0)):
+            index = [slice(None)] * (2 * nqbits)
+            index[qbit] = a
+            index[qbit + nqbits] = b
+            view[tuple(index)] = 0
+        return view.reshape(-1)
+
+    def evolve(self, cir_io, rho : numpy.ndarray = None, subsdict : dict = None) -> numpy.ndarray:
+        """
+        Apply a CircuitIO object on a density matrix, measurements are taken as non-selective (dephasing)
+
+            cir_io   : the CircuitIO object
+            rho      : (optional, default None) the initial density matrix (2^n x 2^n), None means |00...0>
+            subsdict : (optional, default None) specify the substituted symbols.
+
+        -> Return : the final density matrix (2^n x 2^n)
+        """
+        nqbits = cir_io.get_nqbits()
+        v = zero_density_matrix(nqbits) if rho is None else numpy.array(rho, dtype=complex).reshape(-1)
+        for item in cir_io:
+            if item[0] == 'M':
+                for q in item[1]:
+                    v = self.__dephase(v, q, nqbits)
+            else:
+                v = self.__apply_gate(v, item, nqbits, subsdict)
+        return v.reshape(2 ** nqbits, 2 ** nqbits)
+
+    def get_density_matrix(self, cir_io, subsdict : dict = None) -> numpy.ndarray:
+        """
+        Return the density matrix generated by a CircuitIO object from |00...0>
+        """
+        return self.evolve(cir_io, None, subsdict)
+
+    def get_swap_expectation(self, cir_io, qlist1 : list[int], qlist2 : list[int]) -> float:
+        """
+        Return the exact expectation tr(SWAP rho) of SWAP between qubit arrays <qlist1> and <qlist2>
+            on the state generated by a CircuitIO object, i.e., tr(rho1 rho2) for product states
+        """
+        nqbits = cir_io.get_nqbits()
+        rho = self.get_density_matrix(cir_io).reshape([2] * (2 * nqbits))
+        perm = list(range(2 * nqbits))
+        for (a, b) in zip(qlist1, qlist2):
+            perm[a] = b
+            perm[b] = a
+        swapped = numpy.transpose(rho, perm).reshape(2 ** nqbits, 2 ** nqbits)
+        return float(numpy.trace(swapped).real)
+
+    def __probabilities(self, rho : numpy.ndarray, qbits : list[int], nqbits : int) -> numpy.ndarray:
+        # Distribution of reading <qbits> (qbits[0] is the highest bit), including readout errors
+        probs = diagonal_of_density_matrix(rho, nqbits).reshape([2] * nqbits)
+        others = tuple(i for i in range(nqbits) if i not in qbits)
+        if others:
+            probs = probs.sum(axis=others)
+        order = sorted(qbits)
+        probs = numpy.transpose(probs, [order.index(q) for q in qbits])
+        for (axis, q) in enumerate(qbits):
+            mat = self._noise.get_readout_matrix(q)
+            if mat is not None:
+                probs = numpy.moveaxis(numpy.tensordot(mat, probs, axes=([1], [axis])), 0, axis)
+        probs = numpy.clip(probs.reshape(-1), 0.0, None)
+        return probs / probs.sum()
+
+    def run(self, cir_io, shots : int = 1, **kwargs) -> dict:
+        """
+        Run a CircuitIO object and get the counts dict
+
+            cir_io : the CircuitIO object
+            shots  : running shots
+
+        -> Return : the counts dict, where the i-th character of a key is the value of cbit i
+        """
+        nqbits = cir_io.get_nqbits()
+        if measurement_is_terminal(cir_io):
+            v = zero_density_matrix(nqbits)
+            for item in cir_io:
+                if item[0] != 'M':
+                    v = self.__apply_gate(v, item, nqbits, None)
+            return counts_by_terminal_measure(lambda q : self.__probabilities(v, q, nqbits),
+                                              cir_io, shots, self._rng)
+
+        # Mid-circuit measurements: simulate each shot as a trajectory
+        ret = {}
+        ncbits = cir_io.get_ncbits()
+        for item in cir_io:
+            if item[0] == 'M':
+                ncbits = max(ncbits, max(item[2]) + 1)
+        for _ in range(shots):
+            v = zero_density_matrix(nqbits)
+            bits = ['0'] * ncbits
+            for item in cir_io:
+                if item[0] != 'M':
+                    v = self.__apply_gate(v, item, nqbits, None)
+                    continue
+                for (q, c) in zip(item[1], item[2]):
+                    (v, outcome) = self.__measure_qubit(v, q, nqbits)
+                    bits[c] = str(outcome)
+            key = ''.join(bits)
+            ret[key] = ret.get(key, 0) + 1
+        return ret
+
+    def __measure_qubit(self, v : numpy.ndarray, qbit : int, nqbits : int) -> tuple:
+        probs = diagonal_of_density_matrix(v, nqbits).reshape([2] * nqbits)
+        p1 = float(numpy.moveaxis(probs, qbit, 0)[1].sum())
+        outcome = 1 if self._rng.random() < p1 else 0
+        view = self.__dephase(v, qbit, nqbits).reshape([2] * (2 * nqbits))
+        index = [slice(None)] * (2 * nqbits)
+        index[qbit] = 1 - outcome
+        view[tuple(index)] = 0
+        view /= (p1 if outcome == 1 else 1.0 - p1)
+        # The readout error only affects the recorded bit
+        mat = self._noise.get_readout_matrix(qbit)
+        read = outcome
+        if mat is not None and self._rng.random() < mat[1 - outcome, outcome]:
+            read = 1 - outcome
+        return view.reshape(-1), read
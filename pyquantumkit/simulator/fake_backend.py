@@ -0,0 +1,94 @@
+# simulator/fake_backend.py
+#    2026/10/19
+#    Author: Peixun Long
+#    Computing Center, Institute of High Energy Physics, CAS
+
+import threading, time
+from pyquantumkit.simulator.statevector import StatevectorSimulator
+
+
+class FakeBackend:
+    """
+    Local fake backend to emulate a remote quantum machine (e.g. cloud platforms) without network,
+        each run waits for a configurable latency and then is executed by a built-in simulator
+
+        It can be used as a quantum machine: run_and_get_counts(FakeBackend(0.5), cir_io, shots)
+    """
+    def __init__(self, latency : float = 0.0, seed : int = None, simulator = None,
+                 failures : int = 0, error_type : type = ConnectionError, reseed : bool = False,
+                 parallel : bool = True) -> None:
+        """
+        Construct a FakeBackend object
+
+            latency    : (float, default 0.0) the latency (seconds) of each run, e.g. the queueing time
+            seed       : (optional, default None) the seed of the default simulator
+            simulator  : (optional, default None) the built-in simulator to execute the programs,
+                         None means StatevectorSimulator(seed)
+            failures   : (int, default 0) the number of first runs which fail after the latency
+            error_type : (type, default ConnectionError) the exception type raised by failed runs
+            reseed     : (default False) whether each run is made by a new default simulator of <seed>,
+                         so that every run of the same program gives the same result
+                         (like seed_simulator of qiskit-aer), otherwise the runs share one random stream
+            parallel   : (default True) whether several runs can be made at the same time,
+                         False emulates a machine keeping the result of the last run (e.g. pyqpanda3)
+        """
+        self._latency = latency
+        self._failures = failures
+        self._error_type = error_type
+        self._seed = seed
+        self._reseed = reseed
+        self._parallel = parallel
+        self._simulator = StatevectorSimulator(seed) if simulator is None else simulator
+        self._lock = threading.Lock()
+        self._nsubmits = 0
+        self._nrunning = 0
+        self._max_nrunning = 0
+
+    def run(self, cir_io, shots : int = 1, **kwargs) -> dict:
+        """
+        Run a CircuitIO object after the latency and get the counts dict
+        """
+        with self._lock:
+            self._nsubmits += 1
+            index = self._nsubmits
+            self._nrunning += 1
+            self._max_nrunning = max(self._max_nrunning, self._nrunning)
+        try:
+            time.sleep(self._latency)
+            if index <= self._failures:
+                raise self._error_type('Fake failure of run ' + str(index))
+            simulator = StatevectorSimulator(self._seed) if self._reseed else self._simulator
+            return simulator.run(cir_io, shots, **kwargs)
+        finally:
+            with self._lock:
+                self._nrunning -= 1
+
+    def get_seed(self) -> int:
+        """
+        Return the seed of the simulator (None means unseeded)
+        """
+        return self._simulator.get_seed() if hasattr(self._simulator, 'get_seed') else None
+
+    def get_run_seed(self) -> int:
+        """
+        Return the seed with which every run is made (None means the runs are not reproducible one by one)
+        """
+        return self._seed if self._reseed else None
+
+    def support_parallel_run(self) -> bool:
+        """
+        Return whether several runs can be made at the same time (see procedure/job.py)
+        """
+        return self._parallel
+
+    def get_n_submissions(self) -> int:
+        """
+        Return the number of received runs
+        """
+        return self._nsubmits
+
+    def get_max_concurrency(self) -> int:
+        """
+        Return the maximum number of runs which have been executed at the same time
+        """
+        return self._max_nrunning
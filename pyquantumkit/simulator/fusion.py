@@ -0,0 +1,112 @@
+# simulator/fusion.py
+#    2026/10/19
+#    Author: Peixun Long
+#    Computing Center, Institute of High Energy Physics, CAS
+
+import numpy
+from pyquantumkit.simulator.gate import numeric_gate_matrix
+
+# Gate fusion: runs of gates acting on at most k qubits in total are merged into one dense block,
+#   so a numeric simulator passes over the 2^n statevector once per block instead of once per gate.
+#   Each qubit belongs to at most one open block, and a block is emitted (closed) when a later gate
+#   on its qubits cannot be merged into it.
+
+# Default maximum number of qubits of a fused block (0 means no fusion)
+Default_Fusion_Qubits = 3
+
+def set_default_fusion_qubits(k : int) -> None:
+    global Default_Fusion_Qubits
+    Default_Fusion_Qubits = k
+
+def get_default_fusion_qubits() -> int:
+    return Default_Fusion_Qubits
+
+
+def _embed(mat : numpy.ndarray, qbits : list[int], gatemat : numpy.ndarray, gqbits : list[int]) -> numpy.ndarray:
+    # Return gatemat @ mat, where gatemat acts on <gqbits> (a subset of <qbits>)
+    k = len(qbits)
+    # <mat> is regarded as a tensor of 2k qubits, where the first k qubits are the row index
+    t = numpy.tensordot(gatemat.reshape([2] * (2 * len(gqbits))), mat.reshape([2] * (2 * k)),
+                        axes=(list(range(len(gqbits), 2 * len(gqbits))), [qbits.index(q) for q in gqbits]))
+    t = numpy.moveaxis(t, list(range(len(gqbits))), [qbits.index(q) for q in gqbits])
+    return t.reshape(2 ** k, 2 ** k)
+
+
+class _Block:
+    def __init__(self, qbits : list[int], mat : numpy.ndarray) -> None:
+        self.qbits = list(qbits)
+        self.mat = mat
+
+    def merge(self, other) -> None:
+        # Blocks on disjoint qubits commute, so the merged matrix is their tensor product
+        self.qbits += other.qbits
+        self.mat = numpy.kron(self.mat, other.mat)
+
+    def apply(self, gatemat : numpy.ndarray, gqbits : list[int]) -> None:
+        for q in gqbits:
+            if q not in self.qbits:
+                self.qbits.append(q)
+                self.mat = numpy.kron(self.mat, numpy.eye(2, dtype=complex))
+        self.mat = _embed(self.mat, self.qbits, gatemat, gqbits)
+
+
+def fuse_gates(cir_io, max_qubits : int = None, subsdict : dict = None) -> list[list]:
+    """
+    Fuse the gates of a CircuitIO object into dense blocks
+
+        cir_io     : the CircuitIO object
+        max_qubits : (optional, default None) the maximum number of qubits of a block,
+                     None means Default_Fusion_Qubits, 0 means no fusion (one block per gate).
+        subsdict   : (optional, default None) specify the substituted symbols.
+
+    -> Return : the list of [matrix, qbits] blocks in order (qbits[0] is the highest bit of the matrix),
+                where a measurement is kept as ['M', qbits, cbits]
+    """
+    k = Default_Fusion_Qubits if max_qubits is None else max_qubits
+    ret = []
+    owner = {}          # qubit -> its open block
+
+    def close(qbits):
+        for q in qbits:
+            block = owner.get(q)
+            if block is not None:
+                ret.append([block.mat, block.qbits])
+                for p in block.qbits:
+                    del owner[p]
+
+    for item in cir_io:
+        (g, qbits, paras) = item
+        if g == 'M':
+            close(qbits)
+            ret.append(item)
+            continue
+        if g == 'I':
+            continue
+        if subsdict is not None and paras is not None:
+            paras = [x.subs(subsdict) if hasattr(x, 'subs') else x for x in paras]
+        gatemat = numeric_gate_matrix(g, paras)
+        blocks = []
+        for q in qbits:
+            if q in owner and owner[q] not in blocks:
+                blocks.append(owner[q])
+        union = set(qbits)
+        for block in blocks:
+            union.update(block.qbits)
+        if len(qbits) > k or len(union) > k:
+            close(qbits)
+            if len(qbits) > k:
+                ret.append([gatemat, list(qbits)])
+                continue
+            blocks = []
+        if blocks:
+            block = blocks[0]
+            for other in blocks[1:]:
+                block.merge(other)
+        else:
+            block = _Block([], numpy.ones((1, 1), dtype=complex))
+        block.apply(gatemat, qbits)
+        for q in block.qbits:
+            owner[q] = block
+    for q in list(owner):
+        close([q])
+    return ret
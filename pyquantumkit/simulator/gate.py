@@ -0,0 +1,118 @@
+# simulator/gate.py
+#    2026/10/19
+#    Author: Peixun Long
+#    Computing Center, Institute of High Energy Physics, CAS
+
+import cmath, math, numpy
+from pyquantumkit import PyQuantumKitError
+from pyquantumkit._qframes.code_translate import get_standard_gatename
+from pyquantumkit.symbol.gate import symbol_gate_matrix
+
+# Gates with parameters
+Parameterized_Gate_Name = {
+    'RX', 'RY', 'RZ', 'U1', 'U3', 'RXX', 'RYY', 'RZZ', 'CRX', 'CRY', 'CRZ', 'CU1',
+}
+
+# Cache of numpy matrices of the gates without parameters
+_Fixed_Gate_Cache = {}
+
+
+def numeric_value(x) -> complex:
+    """
+    Convert a gate parameter (number or sympy expression without free symbols) into a complex number
+    """
+    if isinstance(x, (int, float, complex)):
+        return x
+    if hasattr(x, 'free_symbols') and x.free_symbols:
+        raise PyQuantumKitError('Parameter "' + str(x) + '" contains unsubstituted symbols!')
+    c = complex(x)
+    return c.real if c.imag == 0 else c
+
+
+def _controlled(mat : numpy.ndarray) -> numpy.ndarray:
+    d = mat.shape[0]
+    ret = numpy.eye(2 * d, dtype=complex)
+    ret[d:, d:] = mat
+    return ret
+
+def _rx(theta) -> numpy.ndarray:
+    c = math.cos(theta / 2)
+    s = math.sin(theta / 2)
+    return numpy.array([[c, -1j * s], [-1j * s, c]], dtype=complex)
+
+def _ry(theta) -> numpy.ndarray:
+    c = math.cos(theta / 2)
+    s = math.sin(theta / 2)
+    return numpy.array([[c, -s], [s, c]], dtype=complex)
+
+def _rz(theta) -> numpy.ndarray:
+    return numpy.array([[cmath.exp(-0.5j * theta), 0], [0, cmath.exp(0.5j * theta)]], dtype=complex)
+
+def _u1(theta) -> numpy.ndarray:
+    return numpy.array([[1, 0], [0, cmath.exp(1j * theta)]], dtype=complex)
+
+def _u3(theta, phi, lam) -> numpy.ndarray:
+    c = math.cos(theta / 2)
+    s = math.sin(theta / 2)
+    return numpy.array([[c, -cmath.exp(1j * lam) * s],
+                        [cmath.exp(1j * phi) * s, cmath.exp(1j * (lam + phi)) * c]], dtype=complex)
+
+def _rxx(theta) -> numpy.ndarray:
+    c = math.cos(theta / 2)
+    s = -1j * math.sin(theta / 2)
+    return numpy.array([[c, 0, 0, s], [0, c, s, 0], [0, s, c, 0], [s, 0, 0, c]], dtype=complex)
+
+def _ryy(theta) -> numpy.ndarray:
+    c = math.cos(theta / 2)
+    s = 1j * math.sin(theta / 2)
+    return numpy.array([[c, 0, 0, s], [0, c, -s, 0], [0, -s, c, 0], [s, 0, 0, c]], dtype=complex)
+
+def _rzz(theta) -> numpy.ndarray:
+    a = cmath.exp(-0.5j * theta)
+    b = cmath.exp(0.5j * theta)
+    return numpy.diag(numpy.array([a, b, b, a], dtype=complex))
+
+
+def numeric_gate_matrix(gatestr : str, paras : list = None) -> numpy.ndarray:
+    """
+    Given the supported gate string, return the gate matrix as numpy.ndarray (complex)
+
+        The qubit order is the same as symbol_gate_matrix(),
+            i.e., the first qubit of the gate is the highest bit of the matrix index
+
+        NOTE: the returned matrix of a gate without parameters is cached, do not modify it.
+    """
+    g = get_standard_gatename(gatestr)
+    if g not in Parameterized_Gate_Name:
+        ret = _Fixed_Gate_Cache.get(g)
+        if ret is None:
+            ret = numpy.array(symbol_gate_matrix(g).evalf(), dtype=complex)
+            ret.setflags(write=False)
+            _Fixed_Gate_Cache[g] = ret
+        return ret
+
+    p = [numeric_value(x) for x in paras]
+    if g == 'RX':
+        return _rx(p[0])
+    if g == 'RY':
+        return _ry(p[0])
+    if g == 'RZ':
+        return _rz(p[0])
+    if g == 'U1':
+        return _u1(p[0])
+    if g == 'U3':
+        return _u3(p[0], p[1], p[2])
+    if g == 'RXX':
+        return _rxx(p[0])
+    if g == 'RYY':
+        return _ryy(p[0])
+    if g == 'RZZ':
+        return _rzz(p[0])
+    if g == 'CRX':
+        return _controlled(_rx(p[0]))
+    if g == 'CRY':
+        return _controlled(_ry(p[0]))
+    if g == 'CRZ':
+        return _controlled(_rz(p[0]))
+    # g == 'CU1'
+    return _controlled(_u1(p[0]))
@@ -0,0 +1,378 @@
+# simulator/mps.py
+#    2026/10/19
+#    Author: Peixun Long
+#    Computing Center, Institute of High Energy Physics, CAS
+
+import numpy
+from pyquantumkit import PyQuantumKitError
+from pyquantumkit.simulator.gate import numeric_gate_matrix
+from pyquantumkit.simulator.statevector import measurement_is_terminal
+
+# NOTE: the matrix product state of n qubits is a list of tensors A[i] with shape (chi_l, 2, chi_r),
+#   where site i is qubit i (qubit 0 is the highest bit of the statevector, as other simulators).
+#   The state is kept in mixed canonical form: the sites left to the orthogonality center are
+#   left-canonical, and the sites right to it are right-canonical.
+
+# Default maximum bond dimension
+Default_Max_Bond = 64
+# Default cutoff of singular values, relative to the largest one
+Default_Cutoff = 1e-12
+
+_SWAP_Matrix = numpy.array([[1, 0, 0, 0], [0, 0, 1, 0], [0, 1, 0, 0], [0, 0, 0, 1]], dtype=complex)
+
+
+class MatrixProductState:
+    """
+    Matrix product state with bond-dimension truncation
+    """
+    def __init__(self, nqbits : int, max_bond : int = Default_Max_Bond, cutoff : float = Default_Cutoff) -> None:
+        """
+        Construct a MatrixProductState object of |00...0>
+
+            nqbits   : the number of qubits
+            max_bond : (optional, default Default_Max_Bond) the maximum bond dimension, None means no limit
+            cutoff   : (optional, default Default_Cutoff) the relative cutoff of singular values
+        """
+        self.nqbits = nqbits
+        self.max_bond = max_bond
+        self.cutoff = cutoff
+        # the total discarded weight (sum of squared discarded Schmidt coefficients) of all truncations
+        self.truncation_error = 0.0
+        self._tensors = []
+        for _ in range(nqbits):
+            a = numpy.zeros((1, 2, 1), dtype=complex)
+            a[0, 0, 0] = 1.0
+            self._tensors.append(a)
+        self._center = 0
+
+    def copy(self):
+        """
+        Return a copy of the MatrixProductState object
+        """
+        ret = MatrixProductState.__new__(MatrixProductState)
+        ret.__dict__.update(self.__dict__)
+        ret._tensors = [a.copy() for a in self._tensors]
+        return ret
+
+    def get_bond_dimensions(self) -> list[int]:
+        """
+        Return the list of n - 1 bond dimensions
+        """
+        return [a.shape[2] for a in self._tensors[:-1]]
+
+    def move_center(self, site : int) -> None:
+        """
+        Move the orthogonality center to <site> by QR decompositions
+        """
+        while self._center < site:
+            i = self._center
+            (l, _, r) = self._tensors[i].shape
+            (q, rmat) = numpy.linalg.qr(self._tensors[i].reshape(l * 2, r))
+            self._tensors[i] = q.reshape(l, 2, -1)
+            self._tensors[i + 1] = numpy.tensordot(rmat, self._tensors[i + 1], axes=(1, 0))
+            self._center += 1
+        while self._center > site:
+            i = self._center
+            (l, _, r) = self._tensors[i].shape
+            (q, rmat) = numpy.linalg.qr(self._tensors[i].reshape(l, 2 * r).T)
+            self._tensors[i] = q.T.reshape(-1, 2, r)
+            self._tensors[i - 1] = numpy.tensordot(self._tensors[i - 1], rmat.T, axes=(2, 0))
+            self._center -= 1
+
+    def __split(self, theta : numpy.ndarray, site : int, k : int) -> None:
+        # Split theta (chi_l, 2^k, chi_r) into sites [site, site + k) by SVDs, the center ends at site + k - 1
+        (l, _, r) = theta.shape
+        rest = theta.reshape(l, -1)
+        for j in range(k - 1):
+            (u, s, vh) = numpy.linalg.svd(rest.reshape(l * 2, -1), full_matrices=False)
+            keep = int(numpy.count_nonzero(s > self.cutoff * s[0])) if s[0] > 0 else 1
+            if self.max_bond is not None:
+                keep = min(keep, self.max_bond)
+            keep = max(keep, 1)
+            total = float(numpy.sum(s ** 2))
+            kept = float(numpy.sum(s[:keep] ** 2))
+            if total > 0:
+                self.truncation_error += (total - kept) / total
+            s = s[:keep] * numpy.sqrt(total / kept) if kept > 0 else s[:keep]
+            self._tensors[site + j] = u[:, :keep].reshape(l, 2, keep)
+            rest = s[:, None] * vh[:keep]
+            l = keep
+        self._tensors[site + k - 1] = rest.reshape(l, 2, r)
+        self._center = site + k - 1
+
+    def __apply_block(self, mat : numpy.ndarray, site : int, k : int) -> None:
+        # Apply a k-qubit matrix on the contiguous sites [site, site + k)
+        self.move_center(site)
+        theta = self._tensors[site]
+        for j in range(1, k):
+            theta = numpy.tensordot(theta, self._tensors[site + j], axes=(theta.ndim - 1, 0))
+        (l, r) = (theta.shape[0], theta.shape[-1])
+        theta = numpy.tensordot(mat, theta.reshape(l, 2 ** k, r), axes=(1, 1)).transpose(1, 0, 2)
+        if k == 1:
+            self._tensors[site] = theta.reshape(l, 2, r)
+        else:
+            self.__split(theta, site, k)
+
+    def __swap_sites(self, site : int) -> None:
+        self.__apply_block(_SWAP_Matrix, site, 2)
+
+    def apply_matrix(self, mat : numpy.ndarray, qbits : list[int]) -> None:
+        """
+        Apply a k-qubit matrix on qubits <qbits> (qbits[0] is the highest bit of the matrix index),
+            non-adjacent qubits are moved together by a network of SWAP gates and moved back afterwards
+        """
+        k = len(qbits)
+        if len(set(qbits)) != k:
+            raise PyQuantumKitError('The qubits of a gate must be different!')
+        mat = numpy.asarray(mat, dtype=complex)
+        start = min(min(qbits), self.nqbits - k)
+        # order[s] is the original qubit at site s
+        order = list(range(self.nqbits))
+        swaps = []
+        for j in range(k):
+            s = order.index(qbits[j])
+            while s > start + j:
+                self.__swap_sites(s - 1)
+                (order[s - 1], order[s]) = (order[s], order[s - 1])
+                swaps.append(s - 1)
+                s -= 1
+            while s < start + j:
+                self.__swap_sites(s)
+                (order[s], order[s + 1]) = (order[s + 1], order[s])
+                swaps.append(s)
+                s += 1
+        self.__apply_block(mat, start, k)
+        for s in reversed(swaps):
+            self.__swap_sites(s)
+
+    def probability_of_1(self, qbit : int) -> float:
+        """
+        Return the probability of measuring 1 on qubit <qbit>
+        """
+        self.move_center(qbit)
+        a = self._tensors[qbit]
+        total = float(numpy.vdot(a, a).real)
+        return float(numpy.vdot(a[:, 1, :], a[:, 1, :]).real) / total
+
+    def project(self, qbit : int, outcome : int) -> None:
+        """
+        Project qubit <qbit> onto |outcome> and normalize the state
+        """
+        self.move_center(qbit)
+        a = self._tensors[qbit].copy()
+        a[:, 1 - outcome, :] = 0
+        norm = numpy.sqrt(numpy.vdot(a, a).real)
+        if norm == 0:
+            raise PyQuantumKitError('The projection has probability 0!')
+        self._tensors[qbit] = a / norm
+
+    def sample(self, shots : int, rng : numpy.random.Generator) -> numpy.ndarray:
+        """
+        Sample the measuring outcomes of all qubits in the computational basis
+
+        -> Return : (numpy array of uint8 with shape (shots, n)) the sampled bits
+        """
+        self.move_center(0)
+        ret = numpy.zeros((shots, self.nqbits), dtype=numpy.uint8)
+        env = numpy.ones((shots, 1), dtype=complex)
+        for i in range(self.nqbits):
+            w = numpy.tensordot(env, self._tensors[i], axes=(1, 0))
+            probs = numpy.sum(numpy.abs(w) ** 2, axis=2)
+            p1 = probs[:, 1] / numpy.sum(probs, axis=1)
+            bits = (rng.random(shots) < p1).astype(numpy.uint8)
+            ret[:, i] = bits
+            env = w[numpy.arange(shots), bits]
+            env /= numpy.sqrt(probs[numpy.arange(shots), bits])[:, None]
+        return ret
+
+    def inner(self, other) -> complex:
+        """
+        Return the inner product <self|other> of two MatrixProductState objects
+        """
+        env = numpy.ones((1, 1), dtype=complex)
+        for (a, b) in zip(self._tensors, other._tensors):
+            env = numpy.tensordot(env, a.conj(), axes=(0, 0))
+            env = numpy.tensordot(env, b, axes=([0, 1], [0, 1]))
+        return complex(env[0, 0])
+
+    def to_statevector(self) -> numpy.ndarray:
+        """
+        Return the statevector (only suitable for small number of qubits)
+        """
+        psi = numpy.ones((1, 1), dtype=complex)
+        for a in self._tensors:
+            psi = numpy.tensordot(psi, a, axes=(1, 0)).reshape(-1, a.shape[2])
+        return psi.reshape(-1)
+
+
+def counts_by_samples(samples : numpy.ndarray, cir_io) -> dict:
+    """
+    Return the counts dict of a CircuitIO object whose measurements are terminal,
+        given the sampled bits of all qubits (numpy array with shape (shots, n))
+    """
+    qlist = []
+    clist = []
+    for item in cir_io:
+        if item[0] == 'M':
+            qlist.extend(item[1])
+            clist.extend(item[2])
+    if not clist:
+        return {}
+    ncbits = max(cir_io.get_ncbits(), max(clist) + 1)
+    cbits = numpy.zeros((samples.shape[0], ncbits), dtype=numpy.uint8)
+    cbits[:, clist] = samples[:, qlist]
+    (rows, counts) = numpy.unique(cbits, axis=0, return_counts=True)
+    ret = {}
+    for (row, c) in zip(rows, counts):
+        ret[''.join('1' if b else '0' for b in row)] = int(c)
+    return ret
+
+
+class MPSSimulator:
+    """
+    Built-in matrix-product-state simulator for CircuitIO objects, suitable for wide and shallow circuits
+
+        It can be used as a quantum machine: run_and_get_counts(MPSSimulator(), cir_io, shots)
+    """
+    def __init__(self, max_bond : int = Default_Max_Bond, cutoff : float = Default_Cutoff, seed : int = None) -> None:
+        """
+        Construct a MPSSimulator object
+
+            max_bond : (optional, default Default_Max_Bond) the maximum bond dimension, None means no limit
+            cutoff   : (optional, default Default_Cutoff) the relative cutoff of singular values
+            seed     : (optional, default None) the seed of random sampling
+        """
+        self._max_bond = max_bond
+        self._cutoff = cutoff
+        self._seed = seed
+        self._rng = numpy.random.default_rng(seed)
+        self._truncation_error = 0.0
+
+    def get_seed(self) -> int:
+        """
+        Return the seed of random sampling (None means unseeded)
+        """
+        return self._seed
+
+    def get_rng(self) -> numpy.random.Generator:
+        """
+        Return the random generator of sampling
+        """
+        return self._rng
+
+    def get_truncation_error(self) -> float:
+        """
+        Return the total discarded weight of truncations in the last simulation
+            (the maximum over all shots if simulated as trajectories)
+        """
+        return self._truncation_error
+
+    def __apply_item(self, mps : MatrixProductState, item : list, subsdict : dict) -> None:
+        if item[0] == 'I':
+            return
+        paras = item[2]
+        if subsdict is not None and paras is not None:
+            paras = [x.subs(subsdict) if hasattr(x, 'subs') else x for x in paras]
+        mps.apply_matrix(numeric_gate_matrix(item[0], paras), item[1])
+
+    def get_mps(self, cir_io, subsdict : dict = None) -> MatrixProductState:
+        """
+        Return the MatrixProductState generated by a CircuitIO object (without measurements) from |00...0>
+        """
+        mps = MatrixProductState(cir_io.get_nqbits(), self._max_bond, self._cutoff)
+        for item in cir_io:
+            if item[0] == 'M':
+                raise PyQuantumKitError('Measurement cannot be applied on a matrix product state, please use run()!')
+            self.__apply_item(mps, item, subsdict)
+        self._truncation_error = mps.truncation_error
+        return mps
+
+    def get_statevector(self, cir_io, subsdict : dict = None) -> numpy.ndarray:
+        """
+        Return the statevector generated by a CircuitIO object (only suitable for small number of qubits)
+        """
+        return self.get_mps(cir_io, subsdict).to_statevector()
+
+    def get_branches(self, cir_io, subsdict : dict = None, tol : float = 1e-12) -> list[tuple]:
+        """
+        Simulate a CircuitIO object from |00...0>, taking measurements as projections without sampling
+
+            cir_io   : the CircuitIO object
+            subsdict : (optional, default None) specify the substituted symbols.
+            tol      : (default 1e-12) the branches with probability not larger than <tol> are dropped
+
+        -> Return : the list of (probability, MatrixProductState) for all measuring outcomes,
+                    i.e., the final mixed state is sum(p |psi><psi|)
+        """
+        branches = [(1.0, MatrixProductState(cir_io.get_nqbits(), self._max_bond, self._cutoff))]
+        for item in cir_io:
+            if item[0] != 'M':
+                for (p, mps) in branches:
+                    self.__apply_item(mps, item, subsdict)
+                continue
+            for q in item[1]:
+                newbranches = []
+                for (p, mps) in branches:
+                    p1 = mps.probability_of_1(q)
+                    for (outcome, prob) in ((0, 1.0 - p1), (1, p1)):
+                        if p * prob > tol:
+                            phi = mps.copy()
+                            phi.project(q, outcome)
+                            newbranches.append((p * prob, phi))
+                branches = newbranches
+        self._truncation_error = max(mps.truncation_error for (p, mps) in branches)
+        return branches
+
+    def get_swap_expectation(self, cir_io, qlist1 : list[int], qlist2 : list[int]) -> float:
+        """
+        Return the exact expectation of SWAP between qubit arrays <qlist1> and <qlist2> on the state
+            generated by a CircuitIO object, i.e., tr(rho1 rho2) for product states (see SWAP test)
+        """
+        ret = 0.0
+        for (p, mps) in self.get_branches(cir_io):
+            swapped = mps.copy()
+            for (a, b) in zip(qlist1, qlist2):
+                swapped.apply_matrix(_SWAP_Matrix, [a, b])
+            ret += p * float(mps.inner(swapped).real)
+        return ret
+
+    def run(self, cir_io, shots : int = 1, **kwargs) -> dict:
+        """
+        Run a CircuitIO object and get the counts dict
+
+            cir_io : the CircuitIO object
+            shots  : running shots
+
+        -> Return : the counts dict, where the i-th character of a key is the value of cbit i
+        """
+        nqbits = cir_io.get_nqbits()
+        if measurement_is_terminal(cir_io):
+            mps = MatrixProductState(nqbits, self._max_bond, self._cutoff)
+            for item in cir_io:
+                if item[0] != 'M':
+                    self.__apply_item(mps, item, None)
+            self._truncation_error = mps.truncation_error
+            return counts_by_samples(mps.sample(shots, self._rng), cir_io)
+
+        # Mid-circuit measurements: simulate each shot as a trajectory
+        ret = {}
+        ncbits = cir_io.get_ncbits()
+        for item in cir_io:
+            if item[0] == 'M':
+                ncbits = max(ncbits, max(item[2]) + 1)
+        self._truncation_error = 0.0
+        for _ in range(shots):
+            mps = MatrixProductState(nqbits, self._max_bond, self._cutoff)
+            bits = ['0'] * ncbits
+            for item in cir_io:
+                if item[0] != 'M':
+                    self.__apply_item(mps, item, None)
+                    continue
+                for (q, c) in zip(item[1], item[2]):
+                    outcome = 1 if self._rng.random() < mps.probability_of_1(q) else 0
+                    mps.project(q, outcome)
+                    bits[c] = str(outcome)
+            self._truncation_error = max(self._truncation_error, mps.truncation_error)
+            key = ''.join(bits)
+            ret[key] = ret.get(key, 0) + 1
+        return ret
@@ -0,0 +1,150 @@
+# simulator/noise.py
+#    2026/10/19
+#    Author: Peixun Long
+#    Computing Center, Institute of High Energy Physics, CAS
+
+import numpy
+from pyquantumkit import PyQuantumKitError
+from pyquantumkit._qframes.code_translate import get_standard_gatename
+
+# NOTE: a quantum channel is given by the list of its Kraus operators (numpy arrays),
+#   rho -> sum(K rho K^dagger), where the first qubit is the highest bit of the matrix index.
+
+_Pauli_Matrices = [
+    numpy.eye(2, dtype=complex),
+    numpy.array([[0, 1], [1, 0]], dtype=complex),
+    numpy.array([[0, -1j], [1j, 0]], dtype=complex),
+    numpy.array([[1, 0], [0, -1]], dtype=complex),
+]
+
+
+def depolarizing_kraus(p : float, nqbits : int = 1) -> list[numpy.ndarray]:
+    """
+    Return the Kraus operators of depolarizing channel on <nqbits> qubits,
+        rho -> (1 - p) rho + p I / d, where d = 2^nqbits
+    """
+    if not 0.0 <= p <= 1.0:
+        raise PyQuantumKitError('The probability of depolarizing channel must be in [0, 1]!')
+    npaulis = 4 ** nqbits
+    ret = []
+    for index in range(npaulis):
+        mat = numpy.ones((1, 1), dtype=complex)
+        for i in reversed(range(nqbits)):
+            mat = numpy.kron(mat, _Pauli_Matrices[(index >> (2 * i)) & 3])
+        weight = 1.0 - p + p / npaulis if index == 0 else p / npaulis
+        ret.append(numpy.sqrt(weight) * mat)
+    return ret
+
+
+def amplitude_damping_kraus(gamma : float) -> list[numpy.ndarray]:
+    """
+    Return the Kraus operators of amplitude damping channel with the damping probability <gamma>
+    """
+    if not 0.0 <= gamma <= 1.0:
+        raise PyQuantumKitError('The probability of amplitude damping must be in [0, 1]!')
+    return [numpy.array([[1, 0], [0, numpy.sqrt(1.0 - gamma)]], dtype=complex),
+            numpy.array([[0, numpy.sqrt(gamma)], [0, 0]], dtype=complex)]
+
+
+def phase_damping_kraus(lam : float) -> list[numpy.ndarray]:
+    """
+    Return the Kraus operators of phase damping channel with the parameter <lam>
+    """
+    if not 0.0 <= lam <= 1.0:
+        raise PyQuantumKitError('The parameter of phase damping must be in [0, 1]!')
+    return [numpy.array([[1, 0], [0, numpy.sqrt(1.0 - lam)]], dtype=complex),
+            numpy.array([[0, 0], [0, numpy.sqrt(lam)]], dtype=complex)]
+
+
+def kraus_to_superoperator(kraus : list[numpy.ndarray]) -> numpy.ndarray:
+    """
+    Return the superoperator sum(K x K*) of a channel, which acts on the vectorized
+        density matrix (row qubits are higher than column qubits)
+    """
+    return sum(numpy.kron(k, k.conj()) for k in kraus)
+
+
+def check_kraus(kraus : list[numpy.ndarray], tol : float = 1e-9) -> None:
+    """
+    Check whether the Kraus operators are trace-preserving, raise PyQuantumKitError if not
+    """
+    d = kraus[0].shape[0]
+    total = sum(k.conj().T @ k for k in kraus)
+    if not numpy.allclose(total, numpy.eye(d), atol=tol):
+        raise PyQuantumKitError('The Kraus operators are not trace-preserving!')
+
+
+class NoiseModel:
+    """
+    Noise model of built-in simulators: quantum channels attached after gates, and readout errors
+    """
+    def __init__(self) -> None:
+        """
+        Construct an empty NoiseModel object
+        """
+        self._gate_noise = {}
+        self._all_gate_noise = []
+        self._readout = {}
+        self._all_readout = None
+
+    def add_gate_noise(self, kraus : list[numpy.ndarray], gates : str|list[str] = None):
+        """
+        Attach a quantum channel after gates
+
+            kraus : the Kraus operators of the channel on 1 qubit (applied on each qubit of the gate),
+                    or on k qubits (applied on the k qubits of the gate)
+            gates : (optional, default None) the gate name or list of gate names, None means all gates
+
+        -> Return : self
+        """
+        kraus = [numpy.array(k, dtype=complex) for k in kraus]
+        check_kraus(kraus)
+        superop = kraus_to_superoperator(kraus)
+        if gates is None:
+            self._all_gate_noise.append(superop)
+            return self
+        for g in ([gates] if isinstance(gates, str) else gates):
+            self._gate_noise.setdefault(get_standard_gatename(g), []).append(superop)
+        return self
+
+    def add_readout_error(self, p01 : float, p10 : float, qbits : list[int] = None):
+        """
+        Add readout error of measurements
+
+            p01   : the probability of reading 1 when the qubit is 0
+            p10   : the probability of reading 0 when the qubit is 1
+            qbits : (optional, default None) the list of qubits, None means all qubits
+
+        -> Return : self
+        """
+        if not (0.0 <= p01 <= 1.0 and 0.0 <= p10 <= 1.0):
+            raise PyQuantumKitError('The probabilities of readout error must be in [0, 1]!')
+        mat = numpy.array([[1.0 - p01, p10], [p01, 1.0 - p10]])
+        if qbits is None:
+            self._all_readout = mat
+        else:
+            for q in qbits:
+                self._readout[q] = mat
+        return self
+
+    def get_gate_noise(self, gatestr : str, nqbits : int) -> list[tuple[numpy.ndarray, bool]]:
+        """
+        Return the list of (superoperator, whether applied on each qubit) attached after a gate
+        """
+        ret = []
+        for superop in self._all_gate_noise + self._gate_noise.get(gatestr, []):
+            k = int(round(numpy.log2(superop.shape[0]) / 2))
+            if k == 1:
+                ret.append((superop, True))
+            elif k == nqbits:
+                ret.append((superop, False))
+            else:
+                raise PyQuantumKitError('The channel on ' + str(k) + ' qubits cannot be attached to gate "' +
+                                        gatestr + '" on ' + str(nqbits) + ' qubits!')
+        return ret
+
+    def get_readout_matrix(self, qbit : int) -> numpy.ndarray:
+        """
+        Return the 2x2 stochastic matrix P[read, actual] of the readout of a qubit, or None if no error
+        """
+        return self._readout.get(qbit, self._all_readout)
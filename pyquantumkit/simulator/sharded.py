@@ -0,0 +1,241 @@
+# simulator/sharded.py
+#    2026/10/19
+#    Author: Peixun Long
+#    Computing Center, Institute of High Energy Physics, CAS
+
+import multiprocessing, os
+from multiprocessing import resource_tracker, shared_memory
+import numpy
+from pyquantumkit import PyQuantumKitError
+from pyquantumkit.simulator.fusion import fuse_gates
+from pyquantumkit.simulator.statevector import apply_matrix_to_state, get_probabilities, \
+                                               measurement_is_terminal, counts_by_terminal_measure
+
+# NOTE: the statevector of n qubits is kept in one shared memory block and divided into P = 2^g shards.
+#   The g highest physical qubits are "global" (they select the shard), and the other n - g qubits are
+#   "local" (the index inside a shard). A gate on local qubits is applied by all workers in parallel,
+#   each on its own shard. A gate on a global qubit first exchanges the global qubit with a free local
+#   qubit (a qubit-swap between pairs of shards), and the mapping from logical to physical qubits is
+#   updated instead of swapping back.
+
+# Circuits with fewer qubits are simulated in the main process, where the process overhead dominates
+Min_Sharded_Qubits = 16
+
+
+# ---------- functions run in worker processes ----------
+
+_Attached = {}
+
+def _attach(name : str, nqbits : int) -> numpy.ndarray:
+    if name not in _Attached:
+        for shm in _Attached.values():
+            shm.close()
+        _Attached.clear()
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:       # Python < 3.13
+            shm = shared_memory.SharedMemory(name=name)
+        _Attached[name] = shm
+    return numpy.ndarray((2 ** nqbits,), dtype=complex, buffer=_Attached[name].buf)
+
+
+def _shard(name : str, nqbits : int, nglobal : int, shard : int) -> numpy.ndarray:
+    size = 2 ** (nqbits - nglobal)
+    return _attach(name, nqbits)[shard * size : (shard + 1) * size]
+
+
+def _task_apply(name : str, nqbits : int, nglobal : int, shard : int, mat : numpy.ndarray,
+                lqbits : list[int]) -> None:
+    v = _shard(name, nqbits, nglobal, shard)
+    v[:] = apply_matrix_to_state(v, mat, lqbits, nqbits - nglobal)
+
+
+def _task_swap(name : str, nqbits : int, nglobal : int, shard : int, gqbit : int, lqbit : int) -> None:
+    # <shard> has bit 0 on global qubit <gqbit>, exchange its part with local bit 1
+    #   and the part of its partner shard with local bit 0
+    nlocal = nqbits - nglobal
+    a = _shard(name, nqbits, nglobal, shard).reshape([2] * nlocal)
+    b = _shard(name, nqbits, nglobal, shard | (1 << (nglobal - 1 - gqbit))).reshape([2] * nlocal)
+    a = numpy.moveaxis(a, lqbit, 0)
+    b = numpy.moveaxis(b, lqbit, 0)
+    tmp = a[1].copy()
+    a[1] = b[0]
+    b[0] = tmp
+
+
+def _task_probs(name : str, nqbits : int, nglobal : int, shard : int, lqbits : list[int]) -> numpy.ndarray:
+    return get_probabilities(_shard(name, nqbits, nglobal, shard), lqbits, nqbits - nglobal)
+
+
+# ---------- simulator ----------
+
+class ShardedStatevectorSimulator:
+    """
+    Built-in statevector simulator for CircuitIO objects, of which the statevector is sharded over
+        local worker processes in shared memory
+
+        It can be used as a quantum machine: run_and_get_counts(ShardedStatevectorSimulator(4), cir_io, shots)
+        NOTE: call close() (or use the with-statement) to stop the worker processes.
+    """
+    def __init__(self, nworkers : int = None, seed : int = None,
+                 min_sharded_qubits : int = Min_Sharded_Qubits, fusion : int = None) -> None:
+        """
+        Construct a ShardedStatevectorSimulator object
+
+            nworkers : (optional, default None) the number of worker processes, None means the number of cores.
+                       The number of shards is the largest power of 2 not larger than <nworkers>.
+            seed     : (optional, default None) the seed of random sampling
+            min_sharded_qubits : (optional, default Min_Sharded_Qubits) the circuits with fewer qubits
+                                 are simulated in the main process
+            fusion   : (optional, default None) the maximum number of qubits of fused gate blocks,
+                       None means Default_Fusion_Qubits, 0 means no fusion (see simulator/fusion.py)
+        """
+        nworkers = os.cpu_count() if nworkers is None else nworkers
+        if nworkers < 1:
+            raise PyQuantumKitError('The number of workers must be positive!')
+        self._nglobal = nworkers.bit_length() - 1
+        self._nworkers = nworkers
+        self._min_qubits = min_sharded_qubits
+        self._fusion = fusion
+        self._pool = None
+        self._seed = seed
+        self._rng = numpy.random.default_rng(seed)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Stop the worker processes
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def get_seed(self) -> int:
+        """
+        Return the seed of random sampling (None means unseeded)
+        """
+        return self._seed
+
+    def get_rng(self) -> numpy.random.Generator:
+        """
+        Return the random generator of sampling
+        """
+        return self._rng
+
+    def get_nshards(self, nqbits : int) -> int:
+        """
+        Return the number of shards for a statevector of <nqbits> qubits
+        """
+        return 2 ** self.__nglobal(nqbits)
+
+    def __nglobal(self, nqbits : int) -> int:
+        return min(self._nglobal, nqbits - 3) if nqbits >= self._min_qubits else 0
+
+    def __get_pool(self):
+        if self._pool is None:
+            # Workers must share the resource tracker of the main process, otherwise (Python < 3.13)
+            #   each worker tracks the attached blocks and reports them as leaked at exit
+            if os.name == 'posix':
+                resource_tracker.ensure_running()
+            self._pool = multiprocessing.get_context().Pool(self._nworkers)
+        return self._pool
+
+    def __simulate(self, cir_io, subsdict : dict, collect) -> object:
+        # Evolve |00...0> by the gates of <cir_io>, then return collect(state, perm[, pool, shm name]),
+        #   where perm[logical qubit] = physical qubit
+        nqbits = cir_io.get_nqbits()
+        nglobal = self.__nglobal(nqbits)
+        if nglobal == 0:
+            psi = numpy.zeros(2 ** nqbits, dtype=complex)
+            psi[0] = 1.0
+            for (mat, qbits, *_) in fuse_gates(cir_io, self._fusion, subsdict):
+                if not isinstance(mat, str):
+                    psi = apply_matrix_to_state(psi, mat, qbits, nqbits)
+            return collect(psi, list(range(nqbits)))
+
+        pool = self.__get_pool()
+        shm = shared_memory.SharedMemory(create=True, size=(2 ** nqbits) * 16)
+        try:
+            state = numpy.ndarray((2 ** nqbits,), dtype=complex, buffer=shm.buf)
+            state[:] = 0
+            state[0] = 1.0
+            nshards = 2 ** nglobal
+            perm = list(range(nqbits))
+            for (mat, qbits, *_) in fuse_gates(cir_io, self._fusion, subsdict):
+                if isinstance(mat, str):        # measurement
+                    continue
+                for q in qbits:
+                    if perm[q] < nglobal:
+                        self.__exchange(pool, shm.name, nqbits, nglobal, perm, q, qbits)
+                lqbits = [perm[q] - nglobal for q in qbits]
+                pool.starmap(_task_apply, [(shm.name, nqbits, nglobal, s, mat, lqbits) for s in range(nshards)])
+            ret = collect(state, perm, pool, shm.name)
+            del state
+            return ret
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def __exchange(self, pool, name : str, nqbits : int, nglobal : int, perm : list[int],
+                   qbit : int, busy : list[int]) -> None:
+        # Move logical qubit <qbit> from a global physical qubit to a local one not used by the gate
+        busyphys = {perm[q] for q in busy}
+        gq = perm[qbit]
+        lq = max(p for p in range(nglobal, nqbits) if p not in busyphys)
+        tasks = [(name, nqbits, nglobal, s, gq, lq - nglobal) for s in range(2 ** nglobal)
+                 if not (s >> (nglobal - 1 - gq)) & 1]
+        pool.starmap(_task_swap, tasks)
+        other = perm.index(lq)
+        (perm[qbit], perm[other]) = (lq, gq)
+
+    def get_statevector(self, cir_io, subsdict : dict = None) -> numpy.ndarray:
+        """
+        Return the statevector generated by a CircuitIO object (measurements are ignored) from |00...0>
+        """
+        nqbits = cir_io.get_nqbits()
+        def collect(state, perm, *args):
+            return numpy.transpose(state.reshape([2] * nqbits), perm).reshape(-1).copy()
+        return self.__simulate(cir_io, subsdict, collect)
+
+    def run(self, cir_io, shots : int = 1, **kwargs) -> dict:
+        """
+        Run a CircuitIO object and get the counts dict (only terminal measurements are supported)
+
+            cir_io : the CircuitIO object
+            shots  : running shots
+
+        -> Return : the counts dict, where the i-th character of a key is the value of cbit i
+        """
+        if not measurement_is_terminal(cir_io):
+            raise PyQuantumKitError('ShardedStatevectorSimulator only supports terminal measurements!')
+        nqbits = cir_io.get_nqbits()
+
+        def collect(state, perm, pool=None, name=None):
+            if pool is None:
+                return counts_by_terminal_measure(lambda q : get_probabilities(state, [perm[x] for x in q], nqbits),
+                                                  cir_io, shots, self._rng)
+            nglobal = self.__nglobal(nqbits)
+
+            def probs_getter(qlist):
+                # Each shard returns the distribution of its local measured qubits,
+                #   then the global measured qubits are added as the highest axes
+                local = [q for q in qlist if perm[q] >= nglobal]
+                glob = [q for q in qlist if perm[q] < nglobal]
+                parts = pool.starmap(_task_probs, [(name, nqbits, nglobal, s, [perm[q] - nglobal for q in local])
+                                                   for s in range(2 ** nglobal)])
+                probs = numpy.array(parts).reshape([2] * nglobal + [2] * len(local))
+                others = tuple(p for p in range(nglobal) if p not in [perm[q] for q in glob])
+                if others:
+                    probs = probs.sum(axis=others)
+                # the remaining global axes are in increasing order of physical qubits
+                axes = sorted(glob, key=lambda q : perm[q]) + local
+                probs = numpy.transpose(probs, [axes.index(q) for q in qlist])
+                return probs.reshape(-1)
+            return counts_by_terminal_measure(probs_getter, cir_io, shots, self._rng)
+        return self.__simulate(cir_io, None, collect)
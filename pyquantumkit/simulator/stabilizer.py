@@ -0,0 +1,334 @@
+# simulator/stabilizer.py
+#    2026/10/19
+#    Author: Peixun Long
+#    Computing Center, Institute of High Energy Physics, CAS
+
+import math, numpy
+from pyquantumkit import PyQuantumKitError
+from pyquantumkit.simulator.gate import numeric_value
+from pyquantumkit.simulator.statevector import StatevectorSimulator
+
+# Tableau-based simulation of Clifford circuits (Aaronson and Gottesman, https://arxiv.org/abs/quant-ph/0406196)
+#
+# NOTE: the signs of tableau rows are kept as affine forms over GF(2) of the random measuring outcomes,
+#   column 0 is the constant and column k is the k-th random outcome. Since the X/Z bits of the tableau
+#   never depend on measuring outcomes, one pass of simulation gives the outcomes of all shots.
+
+# Primitive operations of the tableau
+Primitive_Clifford_Name = {'H', 'S', 'X', 'Y', 'Z', 'CX'}
+
+# Tolerance to identify the angles of multiples of pi/2
+CLIFFORD_ANGLE_TOLERANCE = 1e-9
+
+
+def _quarter_turns(theta, unit : float = math.pi / 2) -> int:
+    # Return k if theta == k * unit, otherwise raise
+    t = numeric_value(theta)
+    if isinstance(t, complex):
+        raise PyQuantumKitError('Complex angle is not supported!')
+    k = round(t / unit)
+    if abs(t - k * unit) > CLIFFORD_ANGLE_TOLERANCE:
+        raise PyQuantumKitError('The rotation of angle ' + str(theta) + ' is not a Clifford gate!')
+    return k
+
+
+def _rz_ops(q : int, k : int) -> list:
+    return [('S', [q])] * (k % 4)
+
+def _rx_ops(q : int, k : int) -> list:
+    return [('H', [q])] + _rz_ops(q, k) + [('H', [q])]
+
+def _ry_ops(q : int, k : int) -> list:
+    # RY = S RX S^dagger
+    return _rz_ops(q, 3) + _rx_ops(q, k) + _rz_ops(q, 1)
+
+def _rzz_ops(a : int, b : int, k : int) -> list:
+    return [('CX', [a, b])] + _rz_ops(b, k) + [('CX', [a, b])]
+
+def _crz_ops(c : int, t : int, m : int) -> list:
+    # CRZ(m pi) = diag(1, 1, e^(-i m pi / 2), e^(i m pi / 2))
+    m %= 4
+    if m == 0:
+        return []
+    if m == 2:
+        return [('Z', [c])]
+    cz = [('H', [t]), ('CX', [c, t]), ('H', [t])]
+    return _rz_ops(c, 3 if m == 1 else 1) + cz
+
+
+def clifford_decomposition(gatestr : str, qbits : list[int], paras : list = None) -> list:
+    """
+    Decompose a standard gate into the primitive operations of the tableau (up to a global phase)
+
+        Rotations are Clifford if their angles are multiples of pi/2 (multiples of pi for controlled ones)
+
+    -> Return : list of (primitive name, qbits); raise PyQuantumKitError if the gate is not Clifford
+    """
+    q = qbits
+    if gatestr == 'I':
+        return []
+    if gatestr in Primitive_Clifford_Name:
+        return [(gatestr, list(q))]
+    if gatestr == 'SD':
+        return _rz_ops(q[0], 3)
+    if gatestr == 'SX':
+        return _rx_ops(q[0], 1)
+    if gatestr == 'SXD':
+        return _rx_ops(q[0], 3)
+    if gatestr == 'CY':
+        return _rz_ops(q[1], 3) + [('CX', [q[0], q[1]])] + _rz_ops(q[1], 1)
+    if gatestr == 'CZ':
+        return [('H', [q[1]]), ('CX', [q[0], q[1]]), ('H', [q[1]])]
+    if gatestr == 'SW':
+        return [('CX', [q[0], q[1]]), ('CX', [q[1], q[0]]), ('CX', [q[0], q[1]])]
+    if gatestr == 'ISW':
+        return [('S', [q[0]]), ('S', [q[1]]), ('H', [q[0]]), ('CX', [q[0], q[1]]),
+                ('CX', [q[1], q[0]]), ('H', [q[1]])]
+    if gatestr in ('RZ', 'U1'):
+        return _rz_ops(q[0], _quarter_turns(paras[0]))
+    if gatestr == 'RX':
+        return _rx_ops(q[0], _quarter_turns(paras[0]))
+    if gatestr == 'RY':
+        return _ry_ops(q[0], _quarter_turns(paras[0]))
+    if gatestr == 'U3':
+        # U3(theta, phi, lambda) = RZ(phi) RY(theta) RZ(lambda) up to a global phase
+        return _rz_ops(q[0], _quarter_turns(paras[2])) + _ry_ops(q[0], _quarter_turns(paras[0])) + \
+               _rz_ops(q[0], _quarter_turns(paras[1]))
+    if gatestr == 'RZZ':
+        return _rzz_ops(q[0], q[1], _quarter_turns(paras[0]))
+    if gatestr == 'RXX':
+        h = [('H', [q[0]]), ('H', [q[1]])]
+        return h + _rzz_ops(q[0], q[1], _quarter_turns(paras[0])) + h
+    if gatestr == 'RYY':
+        sd = _rz_ops(q[0], 3) + _rz_ops(q[1], 3)
+        s = _rz_ops(q[0], 1) + _rz_ops(q[1], 1)
+        return sd + [('H', [q[0]]), ('H', [q[1]])] + _rzz_ops(q[0], q[1], _quarter_turns(paras[0])) + \
+               [('H', [q[0]]), ('H', [q[1]])] + s
+    if gatestr == 'CU1':
+        k = _quarter_turns(paras[0], math.pi)
+        return [('H', [q[1]]), ('CX', [q[0], q[1]]), ('H', [q[1]])] if k % 2 else []
+    if gatestr == 'CRZ':
+        return _crz_ops(q[0], q[1], _quarter_turns(paras[0], math.pi))
+    if gatestr == 'CRX':
+        h = [('H', [q[1]])]
+        return h + _crz_ops(q[0], q[1], _quarter_turns(paras[0], math.pi)) + h
+    if gatestr == 'CRY':
+        return _rz_ops(q[1], 3) + [('H', [q[1]])] + _crz_ops(q[0], q[1], _quarter_turns(paras[0], math.pi)) + \
+               [('H', [q[1]])] + _rz_ops(q[1], 1)
+    raise PyQuantumKitError('Gate "' + gatestr + '" is not a Clifford gate!')
+
+
+def is_clifford_circuit(cir_io) -> bool:
+    """
+    Return whether all gates in the CircuitIO object are Clifford gates (measurements are allowed)
+    """
+    try:
+        for item in cir_io:
+            if item[0] != 'M':
+                clifford_decomposition(item[0], item[1], item[2])
+    except PyQuantumKitError:
+        return False
+    return True
+
+
+class StabilizerTableau:
+    """
+    Stabilizer tableau of n qubits, rows 0 ~ n-1 are destabilizers and rows n ~ 2n-1 are stabilizers
+    """
+    def __init__(self, nqbits : int, nrandom : int = 0) -> None:
+        """
+        Construct the tableau of |00...0>
+
+            nqbits  : the number of qubits
+            nrandom : the maximum number of random measuring outcomes
+        """
+        n = nqbits
+        self._n = n
+        self._x = numpy.zeros((2 * n, n), dtype=bool)
+        self._z = numpy.zeros((2 * n, n), dtype=bool)
+        self._r = numpy.zeros((2 * n, 1 + nrandom), dtype=bool)
+        self._x[range(n), range(n)] = True
+        self._z[range(n, 2 * n), range(n)] = True
+        self._nrandom = 0
+
+    def get_nrandom(self) -> int:
+        """
+        Return the number of random outcomes which have been measured
+        """
+        return self._nrandom
+
+    def apply(self, op : str, qbits : list[int]) -> None:
+        """
+        Apply a primitive operation (see Primitive_Clifford_Name)
+        """
+        x = self._x
+        z = self._z
+        r = self._r[:, 0]
+        a = qbits[0]
+        if op == 'H':
+            r ^= x[:, a] & z[:, a]
+            x[:, a], z[:, a] = z[:, a].copy(), x[:, a].copy()
+        elif op == 'S':
+            r ^= x[:, a] & z[:, a]
+            z[:, a] ^= x[:, a]
+        elif op == 'X':
+            r ^= z[:, a]
+        elif op == 'Z':
+            r ^= x[:, a]
+        elif op == 'Y':
+            r ^= x[:, a] ^ z[:, a]
+        else:   # op == 'CX'
+            b = qbits[1]
+            r ^= x[:, a] & z[:, b] & ~(x[:, b] ^ z[:, a])
+            x[:, b] ^= x[:, a]
+            z[:, a] ^= z[:, b]
+
+    @staticmethod
+    def _sign_flip(x1, z1, x2, z2) -> numpy.ndarray:
+        # Whether the product of Pauli rows (x1, z1) * (x2, z2) gets a factor -1 (the exponent of i is 2)
+        x1 = x1.astype(numpy.int8)
+        z1 = z1.astype(numpy.int8)
+        x2 = x2.astype(numpy.int8)
+        z2 = z2.astype(numpy.int8)
+        g = x1 * z1 * (z2 - x2) + x1 * (1 - z1) * z2 * (2 * x2 - 1) + (1 - x1) * z1 * x2 * (1 - 2 * z2)
+        return (g.sum(axis=-1, dtype=numpy.int64) % 4) == 2
+
+    def _rowsum(self, rows : numpy.ndarray, i : int) -> None:
+        # Row h <- row i * row h for all h in <rows>
+        flip = self._sign_flip(self._x[i], self._z[i], self._x[rows], self._z[rows])
+        self._r[rows] ^= self._r[i]
+        self._r[rows, 0] ^= flip
+        self._x[rows] ^= self._x[i]
+        self._z[rows] ^= self._z[i]
+
+    def measure(self, a : int) -> numpy.ndarray:
+        """
+        Measure qubit <a> in Z basis
+
+        -> Return : the outcome as an affine form over GF(2) of the random outcomes (bool array)
+        """
+        n = self._n
+        candidates = numpy.nonzero(self._x[n:, a])[0]
+        if candidates.size > 0:
+            # Random outcome
+            p = n + int(candidates[0])
+            rows = numpy.nonzero(self._x[:, a])[0]
+            rows = rows[rows != p]
+            if rows.size > 0:
+                self._rowsum(rows, p)
+            self._x[p - n] = self._x[p]
+            self._z[p - n] = self._z[p]
+            self._r[p - n] = self._r[p]
+            self._x[p] = False
+            self._z[p] = False
+            self._z[p, a] = True
+            self._r[p] = False
+            self._nrandom += 1
+            if self._nrandom >= self._r.shape[1]:
+                self._r = numpy.concatenate([self._r, numpy.zeros((2 * n, self._r.shape[1]), dtype=bool)], axis=1)
+            self._r[p, self._nrandom] = True
+            return self._r[p].copy()
+
+        # Deterministic outcome: the product of stabilizers whose destabilizers anticommute with Z_a
+        sx = numpy.zeros(n, dtype=bool)
+        sz = numpy.zeros(n, dtype=bool)
+        sr = numpy.zeros(self._r.shape[1], dtype=bool)
+        for i in numpy.nonzero(self._x[:n, a])[0]:
+            k = n + int(i)
+            if self._sign_flip(self._x[k], self._z[k], sx, sz):
+                sr[0] ^= True
+            sr ^= self._r[k]
+            sx ^= self._x[k]
+            sz ^= self._z[k]
+        return sr
+
+
+class StabilizerSimulator:
+    """
+    Built-in stabilizer simulator for Clifford CircuitIO objects, in polynomial time of the number of qubits
+
+        It can be used as a quantum machine: run_and_get_counts(StabilizerSimulator(), cir_io, shots)
+    """
+    def __init__(self, seed : int = None, fallback : bool = True) -> None:
+        """
+        Construct a StabilizerSimulator object
+
+            seed     : (optional, default None) the seed of random sampling
+            fallback : (default True) whether to run non-Clifford circuits by StatevectorSimulator,
+                       otherwise raise PyQuantumKitError
+        """
+        self._seed = seed
+        self._rng = numpy.random.default_rng(seed)
+        self._fallback = fallback
+        self._statevector = None
+
+    def get_seed(self) -> int:
+        """
+        Return the seed of random sampling (None means unseeded)
+        """
+        return self._seed
+
+    def get_rng(self) -> numpy.random.Generator:
+        """
+        Return the random generator of sampling
+        """
+        return self._rng
+
+    def get_tableau(self, cir_io) -> StabilizerTableau:
+        """
+        Return the stabilizer tableau generated by a Clifford CircuitIO object (without measurements)
+        """
+        tableau = StabilizerTableau(cir_io.get_nqbits())
+        for item in cir_io:
+            if item[0] == 'M':
+                raise PyQuantumKitError('Measurement cannot be applied on a tableau, please use run()!')
+            for (op, qbits) in clifford_decomposition(item[0], item[1], item[2]):
+                tableau.apply(op, qbits)
+        return tableau
+
+    def run(self, cir_io, shots : int = 1, **kwargs) -> dict:
+        """
+        Run a CircuitIO object and get the counts dict
+
+            cir_io : the CircuitIO object
+            shots  : running shots
+
+        -> Return : the counts dict, where the i-th character of a key is the value of cbit i
+        """
+        if not is_clifford_circuit(cir_io):
+            if not self._fallback:
+                raise PyQuantumKitError('The CircuitIO object contains non-Clifford gates!')
+            if self._statevector is None:
+                self._statevector = StatevectorSimulator(self._rng.integers(2 ** 32))
+            return self._statevector.run(cir_io, shots, **kwargs)
+
+        nmeasure = sum(len(item[1]) for item in cir_io if item[0] == 'M')
+        tableau = StabilizerTableau(cir_io.get_nqbits(), nmeasure)
+        forms = []
+        cbits = []
+        ncbits = cir_io.get_ncbits()
+        for item in cir_io:
+            if item[0] != 'M':
+                for (op, qbits) in clifford_decomposition(item[0], item[1], item[2]):
+                    tableau.apply(op, qbits)
+                continue
+            for (q, c) in zip(item[1], item[2]):
+                forms.append(tableau.measure(q))
+                cbits.append(c)
+                ncbits = max(ncbits, c + 1)
+        if not forms:
+            return {}
+
+        # outcomes = constant + (random bits) * (coefficients) over GF(2)
+        nrandom = tableau.get_nrandom()
+        width = max(len(f) for f in forms)
+        forms = numpy.array([numpy.pad(f, (0, width - len(f))) for f in forms], dtype=numpy.int64)
+        randbits = self._rng.integers(0, 2, size=(shots, nrandom), dtype=numpy.int64)
+        outcomes = (forms[:, 0] + randbits @ forms[:, 1:nrandom + 1].T) % 2
+
+        # Later measurements into the same cbit overwrite the former ones
+        bits = numpy.zeros((shots, ncbits), dtype=numpy.int8)
+        for (k, c) in enumerate(cbits):
+            bits[:, c] = outcomes[:, k]
+        (rows, counts) = numpy.unique(bits, axis=0, return_counts=True)
+        return {''.join('1' if b else '0' for b in row) : int(n) for (row, n) in zip(rows, counts)}
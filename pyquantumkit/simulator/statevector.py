@@ -0,0 +1,328 @@
+# simulator/statevector.py
+#    2026/10/19
+#    Author: Peixun Long
+#    Computing Center, Institute of High Energy Physics, CAS
+
+import hashlib
+import numpy
+from pyquantumkit import PyQuantumKitError
+from pyquantumkit.simulator.fusion import fuse_gates, get_default_fusion_qubits
+
+# NOTE: the statevector of n qubits is a numpy array with length 2^n,
+#   and qubit 0 is the highest bit of the index (the same as CircuitIO.get_numpy_matrix()),
+#   i.e., state.reshape([2] * n) takes qubit i as axis i.
+
+
+def zero_state(nqbits : int) -> numpy.ndarray:
+    """
+    Return the statevector of |00...0> with <nqbits> qubits
+    """
+    ret = numpy.zeros(2 ** nqbits, dtype=complex)
+    ret[0] = 1.0
+    return ret
+
+
+def apply_matrix_to_state(state : numpy.ndarray, mat : numpy.ndarray, qbits : list[int],
+                          nqbits : int) -> numpy.ndarray:
+    """
+    Apply a k-qubit operator on several qubits of a statevector
+
+        state  : the statevector with length 2^n
+        mat    : the 2^k x 2^k matrix of the operator
+        qbits  : (list[int]) the index list of target qubits, the length must be k
+        nqbits : (int) the total number of qubits n
+
+    -> Return : the new statevector
+    """
+    k = len(qbits)
+    psi = state.reshape([2] * nqbits)
+    op = mat.reshape([2] * (2 * k))
+    psi = numpy.tensordot(op, psi, axes=(list(range(k, 2 * k)), list(qbits)))
+    psi = numpy.moveaxis(psi, list(range(k)), list(qbits))
+    return psi.reshape(-1)
+
+
+def get_probabilities(state : numpy.ndarray, qbits : list[int], nqbits : int) -> numpy.ndarray:
+    """
+    Return the probability distribution of measuring several qubits of a statevector
+
+        The index of returned array takes qbits[0] as the highest bit
+    """
+    probs = (numpy.abs(state) ** 2).reshape([2] * nqbits)
+    others = tuple(i for i in range(nqbits) if i not in qbits)
+    if others:
+        probs = probs.sum(axis=others)
+    # the remaining axes are in increasing order of qubits, permute them as <qbits>
+    order = sorted(qbits)
+    probs = numpy.transpose(probs, [order.index(q) for q in qbits])
+    return probs.reshape(-1)
+
+
+def project_qubit(state : numpy.ndarray, qbit : int, outcome : int, nqbits : int) -> tuple:
+    """
+    Project a statevector on the outcome of measuring one qubit
+
+    -> Return : (probability of the outcome, normalized projected statevector or None if probability is 0)
+    """
+    view = state.reshape([2] * nqbits).copy()
+    index = [slice(None)] * nqbits
+    index[qbit] = 1 - outcome
+    view[tuple(index)] = 0
+    view = view.reshape(-1)
+    prob = float(numpy.vdot(view, view).real)
+    if prob <= 0.0:
+        return 0.0, None
+    return prob, view / numpy.sqrt(prob)
+
+
+def swap_expectation(state : numpy.ndarray, qlist1 : list[int], qlist2 : list[int], nqbits : int) -> float:
+    """
+    Return <psi|SWAP|psi>, where SWAP exchanges qubit arrays <qlist1> and <qlist2>,
+        which equals tr(rho1 rho2) if the two arrays are in a product state rho1 x rho2
+    """
+    perm = list(range(nqbits))
+    for (a, b) in zip(qlist1, qlist2):
+        perm[a] = b
+        perm[b] = a
+    swapped = numpy.transpose(state.reshape([2] * nqbits), perm).reshape(-1)
+    return float(numpy.vdot(state, swapped).real)
+
+
+def measurement_is_terminal(cir_io) -> bool:
+    """
+    Return whether all measurements in the CircuitIO object are after all gates
+    """
+    measured = False
+    for item in cir_io:
+        if item[0] == 'M':
+            measured = True
+        elif measured:
+            return False
+    return True
+
+
+def _is_measure(item : list) -> bool:
+    # A fused block is [matrix, qbits], and a measurement is ['M', qbits, cbits]
+    return isinstance(item[0], str)
+
+
+def counts_by_terminal_measure(probs_getter : callable, cir_io, shots : int, rng) -> dict:
+    """
+    Sample the counts dict for a CircuitIO object whose measurements are terminal
+
+        probs_getter : (list[int] -> numpy array) return the distribution of measuring given qubits,
+                       of which the index takes the first qubit as the highest bit
+        cir_io       : the CircuitIO object
+        shots        : running shots
+        rng          : numpy random generator
+
+    -> Return : the counts dict, where the i-th character of a key is the value of cbit i
+    """
+    qlist = []
+    clist = []
+    for item in cir_io:
+        if item[0] == 'M':
+            qlist.extend(item[1])
+            clist.extend(item[2])
+    if not clist:
+        return {}
+    ncbits = max(cir_io.get_ncbits(), max(clist) + 1)
+    uniq = list(dict.fromkeys(qlist))
+    probs = probs_getter(uniq)
+    probs = probs / probs.sum()
+    samples = rng.multinomial(shots, probs)
+    ret = {}
+    for index in numpy.nonzero(samples)[0]:
+        bits = ['0'] * ncbits
+        for i in range(len(qlist)):
+            pos = uniq.index(qlist[i])
+            bits[clist[i]] = '1' if (int(index) >> (len(uniq) - 1 - pos)) & 1 else '0'
+        key = ''.join(bits)
+        ret[key] = ret.get(key, 0) + int(samples[index])
+    return ret
+
+
+class StatevectorSimulator:
+    """
+    Built-in statevector simulator for CircuitIO objects
+
+        It can be used as a quantum machine: run_and_get_counts(StatevectorSimulator(), cir_io, shots)
+    """
+    def __init__(self, seed : int = None, fusion : int = None, storage = None) -> None:
+        """
+        Construct a StatevectorSimulator object
+
+            seed    : (optional, default None) the seed of random sampling
+            fusion  : (optional, default None) the maximum number of qubits of fused gate blocks,
+                      None means Default_Fusion_Qubits, 0 means no fusion (see simulator/fusion.py)
+            storage : (optional, default None) the storage of statevectors and unitaries, None means in memory,
+                      or a MemmapStorage object for out-of-core simulation (see simulator/storage.py)
+        """
+        self._fusion = fusion
+        self._storage = storage
+        self._seed = seed
+        self._rng = numpy.random.default_rng(seed)
+
+    def get_rng(self) -> numpy.random.Generator:
+        """
+        Return the random generator of sampling
+        """
+        return self._rng
+
+    def get_seed(self) -> int:
+        """
+        Return the seed of random sampling (None means unseeded)
+        """
+        return self._seed
+
+    def evolve(self, cir_io, state : numpy.ndarray = None, subsdict : dict = None) -> numpy.ndarray:
+        """
+        Apply the gates of a CircuitIO object (without measurements) on a statevector
+
+            cir_io   : the CircuitIO object
+            state    : (optional, default None) the initial statevector, None means |00...0>
+            subsdict : (optional, default None) specify the substituted symbols.
+
+        -> Return : the final statevector
+        """
+        nqbits = cir_io.get_nqbits()
+        blocks = self.__blocks(cir_io, subsdict)
+        for item in blocks:
+            if _is_measure(item):
+                raise PyQuantumKitError('Measurement cannot be applied on a statevector, please use run()!')
+        if self._storage is not None:
+            # a checkpoint can only be resumed from |00...0>
+            key = self.__checkpoint_key(cir_io, 'state', subsdict) if state is None else None
+            return self._storage.evolve(blocks, nqbits, state, key)
+        psi = zero_state(nqbits) if state is None else numpy.array(state, dtype=complex)
+        for item in blocks:
+            psi = self.__apply_item(psi, item, nqbits)
+        return psi
+
+    def get_statevector(self, cir_io, subsdict : dict = None) -> numpy.ndarray:
+        """
+        Return the statevector generated by a CircuitIO object (without measurements) from |00...0>
+        """
+        return self.evolve(cir_io, None, subsdict)
+
+    def get_unitary(self, cir_io, subsdict : dict = None) -> numpy.ndarray:
+        """
+        Return the unitary matrix of a CircuitIO object (without measurements),
+            computed by evolving all columns at once (qubit 0 is the highest bit, as get_numpy_matrix())
+        """
+        nqbits = cir_io.get_nqbits()
+        blocks = self.__blocks(cir_io, subsdict)
+        for item in blocks:
+            if _is_measure(item):
+                raise PyQuantumKitError('Measurement cannot be applied on a unitary matrix!')
+        # The matrix is regarded as a statevector of 2n qubits, where the first n qubits are the row index
+        if self._storage is not None:
+            mat = self._storage.evolve(blocks, 2 * nqbits, 'identity',
+                                       self.__checkpoint_key(cir_io, 'unitary', subsdict))
+            return mat.reshape(2 ** nqbits, 2 ** nqbits)
+        mat = numpy.eye(2 ** nqbits, dtype=complex).reshape(-1)
+        for item in blocks:
+            mat = self.__apply_item(mat, item, 2 * nqbits)
+        return mat.reshape(2 ** nqbits, 2 ** nqbits)
+
+    def get_branches(self, cir_io, subsdict : dict = None, tol : float = 1e-12) -> list[tuple]:
+        """
+        Simulate a CircuitIO object from |00...0>, taking measurements as projections without sampling
+
+            cir_io   : the CircuitIO object
+            subsdict : (optional, default None) specify the substituted symbols.
+            tol      : (default 1e-12) the branches with probability not larger than <tol> are dropped
+
+        -> Return : the list of (probability, statevector) for all measuring outcomes,
+                    i.e., the final mixed state is sum(p |psi><psi|)
+        """
+        self.__check_in_memory('get_branches()')
+        nqbits = cir_io.get_nqbits()
+        branches = [(1.0, zero_state(nqbits))]
+        for item in self.__blocks(cir_io, subsdict):
+            if not _is_measure(item):
+                branches = [(p, self.__apply_item(psi, item, nqbits)) for (p, psi) in branches]
+                continue
+            for q in item[1]:
+                newbranches = []
+                for (p, psi) in branches:
+                    for outcome in (0, 1):
+                        (prob, phi) = project_qubit(psi, q, outcome, nqbits)
+                        if p * prob > tol:
+                            newbranches.append((p * prob, phi))
+                branches = newbranches
+        return branches
+
+    def get_swap_expectation(self, cir_io, qlist1 : list[int], qlist2 : list[int]) -> float:
+        """
+        Return the exact expectation of SWAP between qubit arrays <qlist1> and <qlist2> on the state
+            generated by a CircuitIO object, i.e., tr(rho1 rho2) for product states (see SWAP test)
+        """
+        nqbits = cir_io.get_nqbits()
+        return sum(p * swap_expectation(psi, qlist1, qlist2, nqbits) for (p, psi) in self.get_branches(cir_io))
+
+    def __blocks(self, cir_io, subsdict : dict) -> list[list]:
+        return fuse_gates(cir_io, self._fusion, subsdict)
+
+    def __checkpoint_key(self, cir_io, kind : str, subsdict : dict) -> str:
+        fusion = get_default_fusion_qubits() if self._fusion is None else self._fusion
+        raw = '|'.join([cir_io.get_hash(), kind, str(fusion), repr(sorted((str(k), str(v)) for (k, v) in
+                                                                      (subsdict or {}).items()))])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def __check_in_memory(self, name : str) -> None:
+        if self._storage is not None:
+            raise PyQuantumKitError(name + ' is not supported with an out-of-core storage!')
+
+    def __apply_item(self, psi : numpy.ndarray, item : list, nqbits : int) -> numpy.ndarray:
+        return apply_matrix_to_state(psi, item[0], item[1], nqbits)
+
+    def run(self, cir_io, shots : int = 1, **kwargs) -> dict:
+        """
+        Run a CircuitIO object and get the counts dict
+
+            cir_io : the CircuitIO object
+            shots  : running shots
+
+        -> Return : the counts dict, where the i-th character of a key is the value of cbit i
+        """
+        nqbits = cir_io.get_nqbits()
+        blocks = self.__blocks(cir_io, None)
+        if measurement_is_terminal(cir_io) and self._storage is not None:
+            psi = self._storage.evolve([b for b in blocks if not _is_measure(b)], nqbits, None,
+                                       self.__checkpoint_key(cir_io, 'run', None))
+            return counts_by_terminal_measure(lambda q : self._storage.get_probabilities(psi, q, nqbits),
+                                              cir_io, shots, self._rng)
+        if measurement_is_terminal(cir_io):
+            psi = zero_state(nqbits)
+            for item in blocks:
+                if not _is_measure(item):
+                    psi = self.__apply_item(psi, item, nqbits)
+            return counts_by_terminal_measure(lambda q : get_probabilities(psi, q, nqbits),
+                                              cir_io, shots, self._rng)
+
+        # Mid-circuit measurements: simulate each shot as a trajectory
+        self.__check_in_memory('Mid-circuit measurement')
+        ret = {}
+        ncbits = cir_io.get_ncbits()
+        for item in cir_io:
+            if item[0] == 'M':
+                ncbits = max(ncbits, max(item[2]) + 1)
+        for _ in range(shots):
+            psi = zero_state(nqbits)
+            bits = ['0'] * ncbits
+            for item in blocks:
+                if not _is_measure(item):
+                    psi = self.__apply_item(psi, item, nqbits)
+                    continue
+                for i in range(len(item[1])):
+                    psi, outcome = self.__measure_qubit(psi, item[1][i], nqbits)
+                    bits[item[2][i]] = str(outcome)
+            key = ''.join(bits)
+            ret[key] = ret.get(key, 0) + 1
+        return ret
+
+    def __measure_qubit(self, psi : numpy.ndarray, qbit : int, nqbits : int) -> tuple:
+        p1 = get_probabilities(psi, [qbit], nqbits)[1]
+        outcome = 1 if self._rng.random() < p1 else 0
+        return project_qubit(psi, qbit, outcome, nqbits)[1], outcome
@@ -0,0 +1,230 @@
+# simulator/storage.py
+#    2026/10/19
+#    Author: Peixun Long
+#    Computing Center, Institute of High Energy Physics, CAS
+
+import hashlib, json, os, shutil, tempfile
+import numpy
+from pyquantumkit.simulator.statevector import apply_matrix_to_state, get_probabilities
+
+# Out-of-core storage: the statevector (or a unitary regarded as a statevector of 2n qubits) is backed by
+#   numpy.memmap on local disk, and processed in contiguous chunks of 2^c amplitudes, where the chunk
+#   covers the c lowest qubits (n - c, ..., n - 1). A gate on h of the n - c "high" qubits is applied on
+#   groups of 2^h chunks, so the memory in use is about 2^(h + c) amplitudes whatever n is.
+
+# Default number of qubits of a chunk (2^20 amplitudes = 16 MiB)
+Default_Chunk_Qubits = 20
+
+
+def _chunk_indices(high : list[int], others : list[int], nhigh : int, rest : int) -> list[int]:
+    # The chunk indices of a group: the bits of <others> are given by <rest>, and the bits of <high> vary
+    base = 0
+    for (i, q) in enumerate(others):
+        if (rest >> (len(others) - 1 - i)) & 1:
+            base |= 1 << (nhigh - 1 - q)
+    ret = []
+    for combo in range(2 ** len(high)):
+        index = base
+        for (i, q) in enumerate(high):
+            if (combo >> (len(high) - 1 - i)) & 1:
+                index |= 1 << (nhigh - 1 - q)
+        ret.append(index)
+    return ret
+
+
+def apply_matrix_blocked(src : numpy.ndarray, dst : numpy.ndarray, mat : numpy.ndarray, qbits : list[int],
+                         nqbits : int, chunk_qubits : int = Default_Chunk_Qubits) -> None:
+    """
+    Apply a k-qubit operator on a statevector chunk by chunk, <dst> can be <src> (in-place)
+
+        src, dst     : the source and destination statevectors (numpy arrays or memmaps) with length 2^n
+        mat          : the 2^k x 2^k matrix of the operator
+        qbits        : (list[int]) the index list of target qubits
+        nqbits       : (int) the total number of qubits n
+        chunk_qubits : (int) the number of qubits of a chunk
+    """
+    c = min(chunk_qubits, nqbits)
+    size = 2 ** c
+    nhigh = nqbits - c
+    high = sorted(q for q in qbits if q < nhigh)
+    others = [q for q in range(nhigh) if q not in high]
+    # qubits of a group: the high target qubits (in increasing order), then the qubits of a chunk
+    local = [high.index(q) if q < nhigh else len(high) + q - nhigh for q in qbits]
+    for rest in range(2 ** len(others)):
+        chunks = _chunk_indices(high, others, nhigh, rest)
+        group = numpy.concatenate([src[i * size : (i + 1) * size] for i in chunks])
+        group = apply_matrix_to_state(group, mat, local, len(high) + c)
+        for (j, i) in enumerate(chunks):
+            dst[i * size : (i + 1) * size] = group[j * size : (j + 1) * size]
+
+
+def get_probabilities_blocked(state : numpy.ndarray, qbits : list[int], nqbits : int,
+                              chunk_qubits : int = Default_Chunk_Qubits) -> numpy.ndarray:
+    """
+    Return the probability distribution of measuring several qubits of a statevector, chunk by chunk
+
+        The index of returned array takes qbits[0] as the highest bit
+    """
+    c = min(chunk_qubits, nqbits)
+    size = 2 ** c
+    nhigh = nqbits - c
+    high = sorted(q for q in qbits if q < nhigh)
+    local = [q for q in qbits if q >= nhigh]
+    total = numpy.zeros([2] * (len(high) + len(local)))
+    for i in range(2 ** nhigh):
+        probs = get_probabilities(numpy.asarray(state[i * size : (i + 1) * size]),
+                                  [q - nhigh for q in local], c).reshape([2] * len(local))
+        index = tuple((i >> (nhigh - 1 - q)) & 1 for q in high)
+        total[index] += probs
+    axes = high + local
+    return numpy.transpose(total, [axes.index(q) for q in qbits]).reshape(-1)
+
+
+class MemmapStorage:
+    """
+    Storage of statevectors and unitaries for StatevectorSimulator, backed by numpy.memmap on local disk
+
+        e.g. StatevectorSimulator(storage=MemmapStorage('/scratch/sv')).get_statevector(cir_io)
+        NOTE: the returned memmap is overwritten by the next simulation with the same storage.
+    """
+    def __init__(self, directory : str = None, chunk_qubits : int = Default_Chunk_Qubits,
+                 checkpoint : bool = False) -> None:
+        """
+        Construct a MemmapStorage object
+
+            directory    : (optional, default None) the directory of data files, None means a temporary directory
+            chunk_qubits : (optional, default Default_Chunk_Qubits) the number of qubits of a chunk
+            checkpoint   : (optional, default False) whether to record a checkpoint after each gate block,
+                           so that an interrupted simulation of the same circuit resumes from the checkpoint.
+                           The state is then written into the other of two files alternately (twice disk space).
+        """
+        self._temporary = directory is None
+        self._directory = tempfile.mkdtemp(prefix='pqk_') if directory is None else directory
+        os.makedirs(self._directory, exist_ok=True)
+        self._chunk_qubits = chunk_qubits
+        self._checkpoint = checkpoint
+
+    def get_chunk_qubits(self) -> int:
+        return self._chunk_qubits
+
+    def get_probabilities(self, state : numpy.ndarray, qbits : list[int], nqbits : int) -> numpy.ndarray:
+        """
+        Return the probability distribution of measuring several qubits of a stored statevector
+        """
+        return get_probabilities_blocked(state, qbits, nqbits, self._chunk_qubits)
+
+    def __file(self, index : int) -> str:
+        return os.path.join(self._directory, 'state' + str(index) + '.bin')
+
+    def __meta_file(self) -> str:
+        return os.path.join(self._directory, 'checkpoint.json')
+
+    def __open(self, index : int, nqbits : int, mode : str) -> numpy.memmap:
+        return numpy.memmap(self.__file(index), dtype=complex, mode=mode, shape=(2 ** nqbits,))
+
+    def __init_name(self, init) -> str:
+        # The identity of the initial state recorded in the checkpoint
+        if init is None:
+            return 'zero'
+        if isinstance(init, str):
+            return init
+        digest = hashlib.sha256()
+        for start in range(0, len(init), 2 ** self._chunk_qubits):
+            digest.update(numpy.ascontiguousarray(init[start : start + 2 ** self._chunk_qubits], dtype=complex))
+        return 'state:' + digest.hexdigest()
+
+    def __load_checkpoint(self, key : str, nqbits : int, init : str) -> dict:
+        if key is None or not self._checkpoint or not os.path.exists(self.__meta_file()):
+            return None
+        with open(self.__meta_file(), 'r') as f:
+            meta = json.load(f)
+        if meta.get('key') != key or meta.get('nqbits') != nqbits or meta.get('init') != init:
+            return None
+        # the data file of the checkpoint must not have been rewritten with another size
+        current = self.__file(meta.get('current', 0))
+        if not os.path.exists(current) or os.path.getsize(current) != meta.get('size'):
+            return None
+        return meta
+
+    def __save_checkpoint(self, key : str, nqbits : int, init : str, done : int, current : int) -> None:
+        tmpfile = self.__meta_file() + '.tmp'
+        with open(tmpfile, 'w') as f:
+            json.dump({'key' : key, 'nqbits' : nqbits, 'init' : init, 'size' : 16 * 2 ** nqbits,
+                       'done' : done, 'current' : current}, f)
+        os.replace(tmpfile, self.__meta_file())
+
+    def __invalidate_checkpoint(self) -> None:
+        # The data files are about to be rewritten, so that the recorded checkpoint no longer holds
+        if os.path.exists(self.__meta_file()):
+            os.remove(self.__meta_file())
+
+    def __initialize(self, state : numpy.memmap, init) -> None:
+        size = 2 ** min(self._chunk_qubits, len(state).bit_length() - 1)
+        if isinstance(init, str) and init == 'identity':
+            # the unitary identity of n qubits as a statevector of 2n qubits
+            d = int(round(numpy.sqrt(len(state))))
+            for start in range(0, len(state), size):
+                state[start : start + size] = 0
+            state[numpy.arange(d) * (d + 1)] = 1.0
+        elif init is None:
+            for start in range(0, len(state), size):
+                state[start : start + size] = 0
+            state[0] = 1.0
+        else:
+            for start in range(0, len(state), size):
+                state[start : start + size] = init[start : start + size]
+
+    def evolve(self, blocks : list[list], nqbits : int, init = None, key : str = None) -> numpy.memmap:
+        """
+        Apply gate blocks on a stored statevector
+
+            blocks : the list of [matrix, qbits] (see simulator/fusion.py)
+            nqbits : the number of qubits
+            init   : (optional, default None) the initial state, None means |00...0>,
+                     'identity' means the identity matrix of nqbits / 2 qubits, or a statevector
+            key    : (optional, default None) the identity of this simulation for checkpoints,
+                     None means no checkpoint (and any recorded checkpoint is removed)
+
+        -> Return : the final statevector (numpy.memmap)
+        """
+        init_name = None if key is None or not self._checkpoint else self.__init_name(init)
+        meta = self.__load_checkpoint(key, nqbits, init_name)
+        if meta is not None:
+            (done, current) = (meta['done'], meta['current'])
+            src = self.__open(current, nqbits, 'r+')
+        else:
+            self.__invalidate_checkpoint()
+            (done, current) = (0, 0)
+            src = self.__open(0, nqbits, 'w+')
+            self.__initialize(src, init)
+        if not self._checkpoint:
+            for (mat, qbits) in blocks:
+                apply_matrix_blocked(src, src, mat, qbits, nqbits, self._chunk_qubits)
+            src.flush()
+            return src
+
+        dst = self.__open(1 - current, nqbits, 'r+' if os.path.exists(self.__file(1 - current)) and
+                          os.path.getsize(self.__file(1 - current)) == 16 * 2 ** nqbits else 'w+')
+        if key is not None and meta is None:
+            src.flush()
+            self.__save_checkpoint(key, nqbits, init_name, 0, current)
+        for i in range(done, len(blocks)):
+            (mat, qbits) = blocks[i]
+            apply_matrix_blocked(src, dst, mat, qbits, nqbits, self._chunk_qubits)
+            dst.flush()
+            (src, dst, current) = (dst, src, 1 - current)
+            if key is not None:
+                self.__save_checkpoint(key, nqbits, init_name, i + 1, current)
+        return src
+
+    def clear(self) -> None:
+        """
+        Remove the data files and checkpoint (and the directory if it is temporary)
+        """
+        if self._temporary:
+            shutil.rmtree(self._directory, ignore_errors=True)
+            return
+        for fname in ('state0.bin', 'state1.bin', 'checkpoint.json'):
+            path = os.path.join(self._directory, fname)
+            if os.path.exists(path):
+                os.remove(path)
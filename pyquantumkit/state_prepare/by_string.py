@@ -3,7 +3,7 @@
 #    Author: Peixun Long
 #    Computing Center, Institute of High Energy Physics, CAS
 
-from pyquantumkit.procedure.generic import apply_gate
+from pyquantumkit.procedure.generic import apply_gates
 from pyquantumkit.procedure.derivative import derivative
 
 def create_state_by_01pm(q_circuit, statestr : str, qbitlist : list[int]):
@@ -24,17 +24,18 @@ def create_state_by_01pm(q_circuit, statestr : str, qbitlist : list[int]):
     if len(statestr) != N:
         raise ValueError('the length of <statestr> must match the length of <qbitlist>!')
 
+    ops = []
     for i in range(0, N):
         if statestr[i] not in {'0', '1', '+', '-'}:
             raise ValueError('binstr must be 0/1/+/- string!')
         if statestr[i] == '1':
-            apply_gate(q_circuit, 'X', [qbitlist[i]])
+            ops.append(('X', [qbitlist[i]]))
         elif statestr[i] == '+':
-            apply_gate(q_circuit, 'H', [qbitlist[i]])
+            ops.append(('H', [qbitlist[i]]))
         elif statestr[i] == '-':
-            apply_gate(q_circuit, 'X', [qbitlist[i]])
-            apply_gate(q_circuit, 'H', [qbitlist[i]])
-    return q_circuit
+            ops.append(('X', [qbitlist[i]]))
+            ops.append(('H', [qbitlist[i]]))
+    return apply_gates(q_circuit, ops)
 
 def uncompute_state_by_01pm(q_circuit, statestr : str, qbitlist : list[int]):
     return derivative(q_circuit, qbitlist, create_state_by_01pm, False, True, statestr, qbitlist)
@@ -64,8 +65,7 @@ def create_state_by_sqgate_str(q_circuit, sqgate_str : str, qbitlist : list[int]
     for i in range(0, N):
         if s[i] not in {'I', 'X', 'Y', 'Z', 'S', 'T', 'H'}:
             raise ValueError('Only support I, X, Y, Z, S, T, H gate!')
-        apply_gate(q_circuit, s[i], [qbitlist[i]])
-    return q_circuit
+    return apply_gates(q_circuit, [(s[i], [qbitlist[i]]) for i in range(0, N)])
 
 def uncompute_state_by_sqgate_str(q_circuit, sqgate_str : str, qbitlist : list[int]):
     return derivative(q_circuit, qbitlist, create_state_by_sqgate_str, False, True, sqgate_str, qbitlist)
@@ -3,7 +3,8 @@
 #    Author: Peixun Long
 #    Computing Center, Institute of High Energy Physics, CAS
 
-from pyquantumkit.procedure.generic import apply_gate
+import numpy
+from pyquantumkit.procedure.generic import apply_gates
 from pyquantumkit.procedure.derivative import derivative
 
 def create_ket_int_le(q_circuit, number : int, qbitlist : list[int]):
@@ -24,14 +25,7 @@ def create_ket_int_le(q_circuit, number : int, qbitlist : list[int]):
         return q_circuit
     if number < 0:
         raise ValueError('<number> must be a non-negative integer!')
-    N = len(qbitlist)
-    temp = number
-
-    for i in range(0, N):
-        if ((temp & 1) == 1):
-            apply_gate(q_circuit, 'X', [qbitlist[i]])
-        temp >>= 1
-    return q_circuit
+    return apply_gates(q_circuit, ket_int_le_ops([number], qbitlist)[0])
 
 def create_ket_int_be(q_circuit, number : int, qbitlist : list[int]):
     """
@@ -102,26 +96,7 @@ def create_ket_int_plus_eiphi_neg_le(q_circuit, number : int, phi : float, qbitl
         return q_circuit
     if number < 0:
         raise ValueError('<number> must be a non-negative integer!')
-    N = len(qbitlist)
-    temp = number >> 1
-
-    apply_gate(q_circuit, 'H', [qbitlist[0]])
-    if ((number & 1) == 1):
-        apply_gate(q_circuit, 'U1', [qbitlist[0]], [phi])
-        for i in range(1, N):
-            if ((temp & 1) == 0):
-                apply_gate(q_circuit, 'X', [qbitlist[i]])
-            temp >>= 1
-            apply_gate(q_circuit, 'CX', [qbitlist[0], qbitlist[i]])
-    else:
-        apply_gate(q_circuit, 'U1', [qbitlist[0]], [-phi])
-        for i in range(1, N):
-            if ((temp & 1) == 1):
-                apply_gate(q_circuit, 'X', [qbitlist[i]])
-            temp >>= 1
-            apply_gate(q_circuit, 'CX', [qbitlist[0], qbitlist[i]])
-
-    return q_circuit
+    return apply_gates(q_circuit, ket_int_plus_eiphi_neg_le_ops([number], phi, qbitlist)[0])
 
 def create_ket_int_plus_eiphi_neg_be(q_circuit, number : int, phi : float, qbitlist : list[int]):
     """
@@ -195,17 +170,19 @@ def create_ket_int1_plus_eiphi_ket_int2_le(q_circuit, number1 : int, number2 : i
     temp2 = number2
     temp3 = 0
     difflist = []
+    ops = []
 
     for i in range(0, N):
         if ((temp1 & 1) == (temp2 & 1)):
             if ((temp1 & 1) == 1):
-                apply_gate(q_circuit, 'X', [qbitlist[i]])
+                ops.append(('X', [qbitlist[i]]))
         else:
             temp3 |= ((temp1 & 1) << len(difflist))
             difflist.append(i)
         temp1 >>= 1
         temp2 >>= 1
 
+    apply_gates(q_circuit, ops)
     if (len(difflist) > 0):
         create_ket_int_plus_eiphi_neg_le(q_circuit, temp3, phi, difflist)
     return q_circuit
@@ -257,3 +234,69 @@ def uncompute_ket_int1_plus_eiphi_ket_int2_be(q_circuit, number1 : int, number2
     -> Return : q_circuit
     """
     return derivative(q_circuit, qbitlist, create_ket_int1_plus_eiphi_ket_int2_le, True, True, number1, number2, phi, qbitlist)
+
+
+
+# ---------- Vectorized gate generators for many samples ----------
+
+def _int_bits_le(numbers, nbits : int) -> numpy.ndarray:
+    # The (NPoints, nbits) bool array of the low <nbits> bits of <numbers> in little-endian mode
+    arr = numbers if isinstance(numbers, numpy.ndarray) else numpy.array(numbers, dtype=object)
+    if arr.dtype == object:
+        try:
+            arr = arr.astype(numpy.int64)
+        except OverflowError:
+            pass
+    if arr.ndim != 1:
+        raise ValueError('<numbers> must be a 1-D array of integers!')
+    if arr.size > 0 and (arr < 0).any():
+        raise ValueError('<numbers> must be non-negative integers!')
+    if arr.dtype.kind in 'iu':
+        bits = numpy.zeros((arr.size, nbits), dtype=bool)
+        nshift = min(nbits, arr.dtype.itemsize * 8 - 1)
+        bits[:, :nshift] = (arr[:, None] >> numpy.arange(nshift, dtype=arr.dtype)) & 1
+        return bits
+    # Python integers of arbitrary size
+    return numpy.array([[(int(x) >> i) & 1 for i in range(nbits)] for x in numbers], dtype=bool).reshape(-1, nbits)
+
+def ket_int_le_ops(numbers, qbitlist : list[int]) -> list[list]:
+    """
+    Return the gates of create_ket_int_le for each of several integers, as the sequences which can be
+        applied by apply_gates
+
+        numbers   : (1-D NumPy array or list of int) the integers to describe the states
+        qbitlist  : index list of the target qubit array
+
+    -> Return : list of gate sequences, one for each integer
+    """
+    if qbitlist is None or len(qbitlist) <= 0:
+        return [[] for _ in range(len(numbers))]
+    qarr = numpy.asarray(qbitlist)
+    return [[('X', [q]) for q in qarr[row].tolist()] for row in _int_bits_le(numbers, len(qbitlist))]
+
+def ket_int_plus_eiphi_neg_le_ops(numbers, phi : float, qbitlist : list[int]) -> list[list]:
+    """
+    Return the gates of create_ket_int_plus_eiphi_neg_le for each of several integers, as the sequences
+        which can be applied by apply_gates
+
+        numbers   : (1-D NumPy array or list of int) the integers x
+        phi       : φ
+        qbitlist  : index of target qubits
+
+    -> Return : list of gate sequences, one for each integer
+    """
+    if qbitlist is None or len(qbitlist) <= 0:
+        return [[] for _ in range(len(numbers))]
+    bits = _int_bits_le(numbers, len(qbitlist))
+    q0 = qbitlist[0]
+    # An X gate is applied on the qubits whose bit differs from the lowest bit
+    flips = bits[:, 1:] != bits[:, :1]
+    ret = []
+    for (b0, flip) in zip(bits[:, 0].tolist(), flips.tolist()):
+        ops = [('H', [q0]), ('U1', [q0], [phi if b0 else -phi])]
+        for i in range(1, len(qbitlist)):
+            if flip[i - 1]:
+                ops.append(('X', [qbitlist[i]]))
+            ops.append(('CX', [q0, qbitlist[i]]))
+        ret.append(ops)
+    return ret
@@ -3,7 +3,8 @@
 #    Author: Peixun Long
 #    Computing Center, Institute of High Energy Physics, CAS
 
-from pyquantumkit.procedure.generic import apply_gate
+import numpy
+from pyquantumkit.procedure.generic import apply_gates
 from pyquantumkit.procedure.derivative import derivative
 
 PauliZ_1    = 0
@@ -13,6 +14,14 @@ PauliX_Neg1 = 3
 PauliY_1    = 4
 PauliY_Neg1 = 5
 
+# The gates to create (and to uncompute) each Pauli eigenstate from |0>
+_Pauli_Eigenstate_Gates = (
+    (), ('X',), ('H',), ('X', 'H'), ('H', 'S'), ('H', 'SD'),
+)
+_Pauli_Eigenstate_Inverse_Gates = (
+    (), ('X',), ('H',), ('H', 'X'), ('SD', 'H'), ('S', 'H'),
+)
+
 def create_pauli_eigenstate(q_circuit, paulilist : list[int], qbitlist : list[int]):
     """
      Apply a quantum circuit to create multi-qubit Pauli eigenstate, where each index takes from 0 to 5
@@ -37,25 +46,7 @@ def create_pauli_eigenstate(q_circuit, paulilist : list[int], qbitlist : list[in
     if N != len(paulilist):
         raise ValueError('<paulilist> and <qbitlist> must be have same length!')
 
-    for i in range(0, N):
-        if paulilist[i] > 5 or paulilist[i] < 0:
-            raise ValueError('elements in <paulilist> must in [0,1,2,3,4,5]')
-        #if paulilist[i] == PauliZ_1:
-        #    pass
-        if paulilist[i] == PauliZ_Neg1:
-            apply_gate(q_circuit, 'X', [qbitlist[i]])
-        elif paulilist[i] == PauliX_1:
-            apply_gate(q_circuit, 'H', [qbitlist[i]])
-        elif paulilist[i] == PauliX_Neg1:
-            apply_gate(q_circuit, 'X', [qbitlist[i]])
-            apply_gate(q_circuit, 'H', [qbitlist[i]])
-        elif paulilist[i] == PauliY_1:
-            apply_gate(q_circuit, 'H', [qbitlist[i]])
-            apply_gate(q_circuit, 'S', [qbitlist[i]])
-        elif paulilist[i] == PauliY_Neg1:
-            apply_gate(q_circuit, 'H', [qbitlist[i]])
-            apply_gate(q_circuit, 'SD', [qbitlist[i]])
-    return q_circuit
+    return apply_gates(q_circuit, pauli_eigenstate_ops([paulilist], qbitlist)[0])
 
 def uncompute_pauli_eigenstate(q_circuit, paulilist : list[int], qbitlist : list[int]):
     """
@@ -76,3 +67,36 @@ def uncompute_pauli_eigenstate(q_circuit, paulilist : list[int], qbitlist : list
     -> Return : q_circuit
     """
     return derivative(q_circuit, qbitlist, create_pauli_eigenstate, False, True, paulilist, qbitlist)
+
+
+def pauli_eigenstate_ops(paulis, qbitlist : list[int], uncompute : bool = False) -> list[list]:
+    """
+    Return the gates of create_pauli_eigenstate (or uncompute_pauli_eigenstate) for each of several
+        samples, as the sequences which can be applied by apply_gates
+
+        paulis    : (2-D NumPy array or nested list of int) the (NPoints, len(qbitlist)) state numbers,
+                    where each row is the <paulilist> of a sample (see create_pauli_eigenstate)
+        qbitlist  : the index of target qubits
+        uncompute : (default False) whether return the gates of uncompute_pauli_eigenstate
+
+    -> Return : list of gate sequences, one for each sample
+    """
+    arr = numpy.asarray(paulis, dtype=int)
+    if qbitlist is None or len(qbitlist) <= 0:
+        return [[] for _ in range(len(arr))]
+    if arr.ndim != 2 or arr.shape[1] != len(qbitlist):
+        raise ValueError('<paulilist> and <qbitlist> must be have same length!')
+    if arr.size > 0 and ((arr > 5) | (arr < 0)).any():
+        raise ValueError('elements in <paulilist> must in [0,1,2,3,4,5]')
+
+    table = _Pauli_Eigenstate_Inverse_Gates if uncompute else _Pauli_Eigenstate_Gates
+    # Each (state number, qubit) is translated into its gates once
+    gates = [[[(g, [q]) for g in table[p]] for q in qbitlist] for p in range(6)]
+    order = range(len(qbitlist) - 1, -1, -1) if uncompute else range(len(qbitlist))
+    ret = []
+    for row in arr.tolist():
+        ops = []
+        for i in order:
+            ops += gates[row[i]][i]
+        ret.append(ops)
+    return ret
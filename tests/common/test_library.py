@@ -0,0 +1,137 @@
+# test: common/test_library.py
+#    2026/10/19
+#    Author: Peixun Long
+#    Computing Center, Institute of High Energy Physics, CAS
+
+import unittest as UT
+from .common import *
+from pyquantumkit import *
+from pyquantumkit.library.kernel import *
+from pyquantumkit.library.qft import *
+from pyquantumkit.library.swaptest import *
+from pyquantumkit.simulator.statevector import StatevectorSimulator
+
+
+def kernel_feature_map(x, q_circuit):
+    n = len(x)
+    for i in range(n):
+        apply_gate(q_circuit, 'H', [i])
+        apply_gate(q_circuit, 'U1', [i], [2.0 * x[i]])
+    for i in range(n - 1):
+        apply_gate(q_circuit, 'CX', [i, i + 1])
+        apply_gate(q_circuit, 'U1', [i + 1], [2.0 * (math.pi - x[i]) * (math.pi - x[i + 1])])
+        apply_gate(q_circuit, 'CX', [i, i + 1])
+
+def kernel_reference(X, Y) -> numpy.ndarray:
+    ret = numpy.zeros([len(X), len(Y)])
+    for i in range(len(X)):
+        for j in range(len(Y)):
+            cx = CircuitIO(len(X[i]))
+            cy = CircuitIO(len(Y[j]))
+            kernel_feature_map(X[i], cx)
+            kernel_feature_map(Y[j], cy)
+            vx = cx.get_numpy_matrix()[:, 0]
+            vy = cy.get_numpy_matrix()[:, 0]
+            ret[i, j] = abs(numpy.vdot(vy, vx)) ** 2
+    return ret
+
+
+class Test_library_kernel(UT.TestCase):
+    """
+    Test cases for subpackage "library/kernel"
+    """
+    def __init__(self, methodName = "runTest"):
+        super().__init__(methodName)
+        self._fm = ''
+        self._qvm = None
+    def setUp(self):
+        self.skipTest('Do not test base class')
+
+    def test_quantum_kernel_matrix(self):
+        X = [[0.1, 0.7], [1.3, 0.4], [2.2, 2.9]]
+        Y = [[0.5, 0.2], [0.1, 0.7]]
+        cases = {
+            'symmetric' : (X, None),
+            'general' : (X, Y),
+        }
+        for input in cases:
+            with self.subTest(input):
+                (dx, dy) = cases[input]
+                expected = kernel_reference(dx, dx if dy is None else dy)
+                result = quantum_kernel_matrix(self._qvm, kernel_feature_map, dx, dy, 4000)
+                self.assertEqual(result.shape, expected.shape)
+                self.assertTrue(numpy.allclose(result, expected, atol=0.05))
+                if dy is None:
+                    self.assertTrue(numpy.allclose(result, result.T))
+                    self.assertTrue(numpy.allclose(numpy.diag(result), 1.0))
+
+
+class Test_library_swaptest(UT.TestCase):
+    """
+    Test cases for the execution modes of subpackage "library/swaptest"
+    """
+    def _program(self, gates : list, measure : bool) -> CircuitIO:
+        cio = CircuitIO(2, 2)
+        for (g, q) in gates:
+            cio.apply_gate(g, [q])
+        if measure:
+            cio.apply_measure([0, 1], [0, 1])
+        return cio
+
+    def test_swaptest_probability_of_1(self):
+        cases = {
+            # (gates, measure) : probability of result 1
+            ((), False) : 0.0,
+            ((('X', 0),), False) : 0.5,
+            ((('H', 1),), False) : 0.25,
+            ((('H', 0), ('H', 1)), False) : 0.0,
+            ((('H', 0), ('H', 1)), True) : 0.25,
+            ((('H', 0),), True) : 0.25,
+        }
+        qvm = StatevectorSimulator(seed=5)
+        for input in cases:
+            with self.subTest(input):
+                prog = self._program(list(input[0]), input[1])
+                p1 = swaptest_probability_of_1(qvm, prog, [0], [1])
+                self.assertAlmostEqual(p1, cases[input])
+                self.assertEqual(run_swaptest(qvm, prog, [0], [1], 1000, 'exact'), round(1000 * cases[input]))
+                self.assertAlmostEqual(run_swaptest(qvm, prog, [0], [1], 4000, 'emulate') / 4000,
+                                       cases[input], delta=0.05)
+                self.assertAlmostEqual(run_swaptest(qvm, prog, [0], [1], 4000, 'sample') / 4000,
+                                       cases[input], delta=0.05)
+                self.assertEqual(check_tr_rho1_rho2_equals_1(qvm, prog, [0], [1], 20, 'exact'),
+                                 cases[input] == 0.0)
+
+    def test_swaptest_mode(self):
+        prog = self._program([('H', 1)], False)
+        self.assertRaises(PyQuantumKitError, run_swaptest, None, prog, [0], [1], 10, 'exact')
+        self.assertRaises(PyQuantumKitError, run_swaptest, StatevectorSimulator(), prog, [0], [1], 10, 'fast')
+        self.assertRaises(PyQuantumKitError, set_default_swaptest_mode, 'fast')
+
+
+class Test_library_qft(UT.TestCase):
+    """
+    Test cases for subpackage "library/qft"
+    """
+    def test_qft_matrix(self):
+        n = 3
+        N = 2 ** n
+        dft = numpy.array([[numpy.exp(2j * numpy.pi * j * k / N) for k in range(N)] for j in range(N)]) / numpy.sqrt(N)
+        # reverse the order of qubits
+        rev = numpy.zeros((N, N))
+        for i in range(N):
+            rev[int(format(i, '0' + str(n) + 'b')[::-1], 2), i] = 1
+        cases = {
+            pqk_qft_bibo : dft,
+            pqk_qft_bilo : rev @ dft,
+            pqk_qft_libo : dft @ rev,
+            pqk_qft_lilo : rev @ dft @ rev,
+            pqk_iqft_bibo : dft.conj().T,
+            pqk_iqft_libo : dft.conj().T @ rev,
+            pqk_iqft_bilo : rev @ dft.conj().T,
+            pqk_iqft_lilo : rev @ dft.conj().T @ rev,
+        }
+        for input in cases:
+            with self.subTest(input.__name__):
+                cio = input(CircuitIO(n), list(range(n)))
+                self.assertTrue(numpy.allclose(cio.get_numpy_matrix(), cases[input]))
@@ -4,12 +4,26 @@
 #    Computing Center, Institute of High Energy Physics, CAS
 
 import unittest as UT
+import asyncio, concurrent.futures, copy, io, json, math, pickle, tempfile, threading
+import numpy
 from .common import *
 from pyquantumkit import *
 from pyquantumkit.classical.run_result import *
 from pyquantumkit.classical.common import *
+from pyquantumkit._qframes.framework_map import gate_applying_code
 from pyquantumkit.procedure.generic import *
 from pyquantumkit.procedure.paulis import *
+from pyquantumkit.procedure.job import *
+from pyquantumkit.procedure.execution import *
+from pyquantumkit.procedure.result_cache import *
+from pyquantumkit.procedure.profiling import *
+from pyquantumkit.procedure.qasm import *
+from pyquantumkit.procedure.circuit_binary import *
+from pyquantumkit.library.qft import pqk_qft_bilo
+from pyquantumkit.library.swaptest import check_tr_rho1_rho2_equals_1
+from pyquantumkit.simulator.fake_backend import FakeBackend
+from pyquantumkit.simulator.statevector import StatevectorSimulator
+from pyquantumkit.simulator.gate import numeric_gate_matrix
 from pyquantumkit.program_check.program_relation import *
 
 
@@ -91,6 +105,96 @@ class Test_procedure_generic(UT.TestCase):
                 else:
                     T_run(self._fm, self._qvm, 4, apply_measure, qbits, cbits)
 
+    def test_run_and_get_counts_batch(self):
+        if self._qvm is None:
+            self.skipTest('Running is not supported')
+        cases = [
+            # X gates on qubits : result string
+            ((), '0000'),
+            ((0,), '1000'),
+            ((1, 3), '0101'),
+            ((0, 1, 2), '1110'),
+            ((2,), '0010'),
+        ]
+        fw_req_reverse = get_reverse_output_str(self._fm)
+        progs = []
+        for input in cases:
+            qc = new_program(self._fm, 4, 4)
+            multi_apply_sqgate(qc, 'X', list(input[0]))
+            apply_measure(qc, range(4), range(4))
+            progs.append(qc)
+        results = run_and_get_counts_batch(self._qvm, progs, Repeat_Times_Of_State_Check)
+        self.assertEqual(len(results), len(cases))
+        for i in range(len(cases)):
+            with self.subTest(cases[i]):
+                self.assertEqual(get_result_str_set(results[i], fw_req_reverse), {cases[i][1]})
+        self.assertEqual(run_and_get_counts_batch(self._qvm, [], 1), [])
+
+    def test_get_circuit_hash(self):
+        hashes = []
+        for extra in (False, False, True):
+            qc = new_program(self._fm, 3, 3)
+            apply_gate(qc, 'H', [0])
+            apply_gate(qc, 'RZ', [1], [0.25])
+            apply_gate(qc, 'CX', [0, 2])
+            if extra:
+                apply_gate(qc, 'X', [1])
+            apply_measure(qc, range(3), range(3))
+            hashes.append(get_circuit_hash(qc))
+        self.assertEqual(hashes[0], hashes[1])
+        self.assertNotEqual(hashes[0], hashes[2])
+
+    def test_import_circuit(self):
+        ops = [('H', [0]), ('RZ', [1], [0.25]), ('CX', [0, 2]), ('CU1', [2, 1], [-1.5]), ('SXD', [2]),
+               ('U3', [1], [0.5, 1.5, 2.5]), ('CSW', [1, 0, 2]), ('ISW', [0, 1]), ('CCZ', [2, 0, 1]),
+               ('RYY', [0, 2], [0.7]), ('CH', [2, 1]), ('CSD', [0, 2])]
+        qc = apply_gates(new_circuit(self._fm, 3), ops)
+        cio = import_circuit(qc)
+        self.assertIsInstance(cio, CircuitIO)
+        self.assertEqual((cio.get_nqbits(), cio.get_ncbits()), (3, 0))
+        self.assertTrue(numeric_equivalence_check(get_circuit_matrix(qc),
+                                                  apply_gates(CircuitIO(3), ops).get_numpy_matrix()))
+
+        qp = apply_measure(new_program(self._fm, 3, 3), [0, 2], [2, 1])
+        cio = import_circuit(qp)
+        self.assertEqual((cio.get_nqbits(), cio.get_ncbits()), (3, 3))
+        measured = {(q, c) for item in cio for (q, c) in zip(item[1], item[2])}
+        self.assertEqual(measured, {(0, 2), (2, 1)})
+
+    def test_profile(self):
+        with profile() as p:
+            qc = new_program(self._fm, 2, 2)
+            apply_gate(qc, 'cnot', [0, 1])
+            apply_gates(qc, [('H', [0]), ('CX', [1, 0])])
+        apply_gate(qc, 'X', [0])
+        stats = p.to_dict()['stats']
+        self.assertEqual(stats['NEW'][self._fm]['count'], 1)
+        self.assertEqual(stats['GATE'][self._fm]['count'], 1)
+        if self._fm != 'pyquantumkit':
+            # the code of gates is generated and executed only for the frameworks
+            self.assertEqual(stats['GATE.codegen'][self._fm]['count'], 1)
+            self.assertEqual(stats['GATE.exec'][self._fm]['count'], 1)
+        self.assertEqual(stats['GATES'][self._fm]['count'], 1)
+        self.assertEqual(p.to_dict()['gates'], {self._fm : {'CX' : 2, 'H' : 1}})
+
+    def test_apply_gates(self):
+        ops = [('H', [0]), ('RZ', [1], [0.25]), ('CX', [0, 2]), ('CU1', [2, 1], [-1e-05]),
+               ('U3', [1], [0.5, 1.5, 2.5]), ('CSW', [1, 0, 2], None), ('M', [0, 1, 2], [0, 1, 2])]
+        qc = new_program(self._fm, 3, 3)
+        for op in ops:
+            apply_gate(qc, *op)
+        expected = get_circuit_hash(qc)
+        qc = new_program(self._fm, 3, 3)
+        self.assertIs(apply_gates(qc, ops), qc)
+        self.assertEqual(get_circuit_hash(qc), expected)
+
+        arr = numpy.array([('H', [0, -1], numpy.nan), ('RZ', [1, -1], 0.25), ('CX', [0, 2], numpy.nan)],
+                          dtype=[('gate', 'U4'), ('qbits', 'i4', 2), ('paras', 'f8')])
+        qc1 = new_circuit(self._fm, 3)
+        qc2 = new_circuit(self._fm, 3)
+        apply_gates(qc1, ops[0:3])
+        apply_gates(qc2, arr)
+        self.assertEqual(get_circuit_hash(qc1), get_circuit_hash(qc2))
 
 
 class Test_procedure_paulis(UT.TestCase):
@@ -166,3 +270,657 @@ class Test_procedure_circuit_io(UT.TestCase):
                 qc = input('pyquantumkit')
                 result = qc.contains_measure()
                 self.assertEqual(result, cases[input])
+
+    def test_CircuitIO_export_parameterized(self):
+        t = sympy.Symbol('t')
+        s = sympy.Symbol('s', real = True)
+        cio = CircuitIO(2)
+        cio.apply_gate('H', [0])
+        cio.apply_gate('RX', [0], [2 * t])
+        cio.apply_gate('CRZ', [0, 1], [sympy.sin(s) + t])
+        cio.apply_gate('U3', [1], [t, 0.5, s / 2])
+        self.assertEqual(cio.get_free_symbols(), {t, s})
+
+        cases = {
+            (0.3, 1.2),
+            (-2.0, 0.0),
+            (1.5, -0.7),
+        }
+        pc = cio.export_parameterized('pyquantumkit', False)
+        self.assertEqual(pc.get_symbols(), [s, t])
+        for input in cases:
+            with self.subTest(input):
+                expected = cio.get_numpy_matrix({t : input[0], s : input[1]})
+                by_dict = pc.bind({t : input[0], s : input[1]}).get_numpy_matrix()
+                by_list = pc.bind([input[1], input[0]]).get_numpy_matrix()
+                self.assertTrue(numpy.allclose(expected, by_dict))
+                self.assertTrue(numpy.allclose(expected, by_list))
+        self.assertRaises(PyQuantumKitError, pc.bind, {t : 1.0})
+        self.assertRaises(PyQuantumKitError, pc.bind, [1.0])
+
+    def test_CircuitIO_write_circuit_code(self):
+        t = sympy.Symbol('t')
+        cio = CircuitIO(3, 3)
+        cio.apply_gate('H', [0])
+        cio.apply_gate('CX', [0, 2])
+        cio.apply_gate('RX', [1], [0.25])
+        cio.apply_gate('CRZ', [2, 1], [2 * t])
+        cio.apply_gate('U3', [1], [1.0, -0.5, 3])
+        cio.apply_gate('RY', [0], [-1.75])
+        cio.apply_measure(range(3), range(3))
+        # the code languages cannot write symbolic parameters, so they are substituted
+        cases = {
+            'QSharp' : [{t : 0.5}],
+            'isQ' : [{t : 0.5}],
+            'qiskit' : [None, {t : 0.5}],
+            'pyqpanda3' : [{t : -1.25}],
+        }
+        for input in cases:
+            for subsdict in cases[input]:
+                with self.subTest((input, subsdict)):
+                    expected = ''
+                    for (g, qbits, paras) in cio:
+                        if subsdict is not None and paras is not None:
+                            paras = [x.subs(subsdict) if hasattr(x, 'subs') else x for x in paras]
+                        expected += gate_applying_code(input, 'qc', None, g, qbits, paras) + '\n'
+                    self.assertEqual(cio.get_circuit_code(input, 'qc', subsdict=subsdict), expected)
+                    self.assertEqual(''.join(cio.iter_circuit_code(input, 'qc', subsdict=subsdict)), expected)
+                    f = io.StringIO()
+                    nchars = cio.write_circuit_code(f, input, 'qc', subsdict=subsdict, buffer_lines=2)
+                    self.assertEqual(f.getvalue(), expected)
+                    self.assertEqual(nchars, len(expected))
+
+    def test_CircuitIO_append_remapped(self):
+        t = sympy.Symbol('t', real = True)
+        src = CircuitIO(2, 2)
+        src.apply_gate('S', [0])
+        src.apply_gate('CRZ', [0, 1], [2 * t])
+        src.apply_gate('U3', [1], [0.5, 1.0, 1.5])
+        cio = CircuitIO(4).append_circuit_io(src, [3, 1], None, True)
+        self.assertEqual(list(cio), [['U3', [1], [-0.5, -1.5, -1.0]], ['CRZ', [3, 1], [-2 * t]], ['SD', [3], None]])
+        self.assertEqual(list(src)[0], ['S', [0], None])
+
+        src.apply_measure(range(2), range(2))
+        par = parallel_programs(src, src)
+        self.assertEqual((par.get_nqbits(), par.get_ncbits()), (4, 4))
+        self.assertEqual(list(par)[3], ['M', [0, 1], [0, 1]])
+        self.assertEqual(list(par)[7], ['M', [2, 3], [2, 3]])
+        self.assertEqual(list(par)[5], ['CRZ', [2, 3], [2 * t]])
+        par._gatelist[5][1][0] = 0          # the gate records are not shared
+        par._gatelist[5][2][0] = t
+        self.assertEqual(list(src)[1], ['CRZ', [0, 1], [2 * t]])
+        self.assertEqual(list(src)[3], ['M', range(2), range(2)])
+
+        cio = CircuitIO(2) << src
+        self.assertEqual(list(cio), list(src))
+        self.assertEqual(len(cio << cio), 2 * len(src))
+        self.assertRaises(PyQuantumKitError, cio.append_circuit_io, src, 1.5)
+        # nothing is appended if a measurement cannot be inversed
+        src = CircuitIO(2, 1)
+        src.apply_gate('H', [0])
+        src.apply_measure([0], [0])
+        src.apply_gate('X', [1])
+        cio = CircuitIO(2)
+        cio.apply_gate('Z', [1])
+        self.assertRaises(PyQuantumKitError, cio.append_circuit_io, src, None, None, True)
+        self.assertEqual(list(cio), [['Z', [1], None]])
+
+    def test_CircuitIO_apply_gates(self):
+        cio = CircuitIO(3, 2)
+        cio.apply_gates([('h', [0]), ('RX', [1], [0.5]), ('M', range(2), [1, 0])])
+        self.assertEqual(list(cio), [['H', [0], None], ['RX', [1], [0.5]], ['M', range(2), [1, 0]]])
+
+        arr = numpy.zeros(3, dtype=[('gate', 'S3'), ('qbits', 'i8')])
+        arr['gate'] = [b'X', b'SD', b'T']
+        arr['qbits'] = [2, 0, 1]
+        cio = apply_gates(CircuitIO(3), arr)
+        self.assertEqual(list(cio), [['X', [2], None], ['SD', [0], None], ['T', [1], None]])
+
+        # The library routines produce the same gates as before
+        cio = pqk_qft_bilo(CircuitIO(3), [0, 1, 2])
+        self.assertEqual([item[0] for item in cio], ['H', 'CU1', 'CU1', 'H', 'CU1', 'H'])
+        self.assertEqual(cio._gatelist[2], ['CU1', [2, 0], [math.pi / 4]])
+        cio = apply_exp_pauli(CircuitIO(3), 'XYZ', 0.5, [0, 1, 2])
+        self.assertEqual([item[0] for item in cio],
+                         ['H', 'SD', 'H', 'CX', 'CX', 'RZ', 'CX', 'CX', 'H', 'H', 'S'])
+
+    def test_CircuitIO_pickle(self):
+        t = sympy.Symbol('t', real = True)
+        cio = CircuitIO(3, 2)
+        cio.apply_gate('H', [0])
+        cio.apply_gate('RX', [1], [2 * t + 1])
+        cio.apply_gate('CRZ', [1, 2], [2 * t + 1])
+        cio.apply_gate('U3', [2], [1, sympy.sin(t), 0.5])
+        cio.apply_measure(range(2), [1, 0])
+        data = pickle.dumps(cio)
+        loaded = pickle.loads(data)
+        self.assertNotIn('_gatelist', loaded.__dict__)       # not decoded yet
+        self.assertEqual((loaded.get_nqbits(), loaded.get_ncbits()), (3, 2))
+        self.assertEqual(pickle.dumps(loaded), data)
+        self.assertEqual(loaded.get_canonical_text(), cio.get_canonical_text())
+        self.assertIn('_gatelist', loaded.__dict__)
+        self.assertEqual(list(loaded)[1][2][0], 2 * t + 1)
+        loaded.apply_gate('X', [0])
+        self.assertEqual(len(loaded), len(cio) + 1)
+        self.assertRaises(AttributeError, getattr, loaded, '_packed')
+        # numerical parameters come back as float
+        self.assertIsInstance(list(loaded)[3][2][0], float)
+
+        # the other attributes are kept
+        labeled = CircuitIO(2)
+        labeled.apply_gate('CX', [0, 1])
+        labeled.label = 'bell'
+        loaded = pickle.loads(pickle.dumps(labeled))
+        self.assertEqual(loaded.label, 'bell')
+        self.assertEqual(list(loaded), list(labeled))
+
+        copied = copy.deepcopy(cio)
+        self.assertEqual(list(copied), list(cio))
+        self.assertIsNot(copied._gatelist[0], cio._gatelist[0])
+        self.assertIsInstance(copied._gatelist[3][2][0], int)
+
+
+class _BlockingSimulator:
+    # StatevectorSimulator whose runs wait until <gate> is set, and then until <parties> runs are in flight
+    #   (the timeouts only guard against deadlocks)
+    def __init__(self, parties : int = 1, gate : threading.Event = None) -> None:
+        self._barrier = threading.Barrier(parties, timeout=30)
+        self._gate = gate
+        self._simulator = StatevectorSimulator(1)
+
+    def run(self, cir_io, shots : int = 1, **kwargs) -> dict:
+        if self._gate is not None and not self._gate.wait(30):
+            raise RuntimeError('The gate is not opened!')
+        self._barrier.wait()
+        return self._simulator.run(cir_io, shots, **kwargs)
+
+
+class Test_procedure_job(UT.TestCase):
+    """
+    Test cases for subpackage "procedure/job"
+    """
+    def _programs(self, n : int) -> list:
+        progs = []
+        for i in range(n):
+            cio = CircuitIO(2, 2)
+            if i % 2 == 1:
+                cio.apply_gate('X', [0])
+            cio.apply_gate('X', [1])
+            cio.apply_measure([0, 1], [0, 1])
+            progs.append(cio)
+        return progs
+
+    def test_JobHandle(self):
+        # the jobs cannot finish before the gate is opened, and finish in pairs (so they overlap)
+        gate = threading.Event()
+        qvm = FakeBackend(simulator=_BlockingSimulator(2, gate))
+        jobs = submit_jobs(qvm, self._programs(4), 10)
+        self.assertFalse(jobs[0].done())
+        self.assertRaises(PyQuantumKitError, jobs[0].submit)
+        self.assertRaises(concurrent.futures.TimeoutError, jobs[0].result, 0.01)
+        self.assertFalse(any(job.done() for job in jobs))
+        gate.set()
+        results = [job.result() for job in jobs]
+        self.assertEqual(results, [{'01' : 10}, {'11' : 10}, {'01' : 10}, {'11' : 10}])
+        self.assertTrue(all(job.done() for job in jobs))
+        self.assertGreater(qvm.get_max_concurrency(), 1)
+
+    def test_run_and_get_counts_async(self):
+        progs = self._programs(8)
+        # each run waits until 4 runs are in flight, so the batch completes only if the jobs overlap
+        qvm = FakeBackend(simulator=_BlockingSimulator(4))
+        results = asyncio.run(run_and_get_counts_batch_async(qvm, progs, 10, max_concurrency=4))
+        self.assertEqual(results, [{'01' : 10}, {'11' : 10}] * 4)
+        self.assertEqual(qvm.get_n_submissions(), 8)
+        self.assertEqual(qvm.get_max_concurrency(), 4)
+
+        # the jobs on a machine without parallel runs never overlap
+        qvm = FakeBackend(0.02, parallel=False)
+        self.assertFalse(support_parallel_jobs(qvm))
+        self.assertTrue(support_parallel_jobs(FakeBackend()))
+        self.assertTrue(support_parallel_jobs(StatevectorSimulator()))
+        jobs = submit_jobs(qvm, progs[:4], 10)
+        self.assertEqual([job.result() for job in jobs], [{'01' : 10}, {'11' : 10}] * 2)
+        results = asyncio.run(run_and_get_counts_batch_async(qvm, progs, 10, max_concurrency=4))
+        self.assertEqual(results, [{'01' : 10}, {'11' : 10}] * 4)
+        self.assertEqual(qvm.get_n_submissions(), 12)
+        self.assertEqual(qvm.get_max_concurrency(), 1)
+
+        result = asyncio.run(run_and_get_counts_async(FakeBackend(0.0), progs[1], 5))
+        self.assertEqual(result, {'11' : 5})
+        self.assertRaises(asyncio.TimeoutError, asyncio.run,
+                          run_and_get_counts_async(FakeBackend(0.5), progs[0], 5, timeout=0.05))
+
+
+class Test_procedure_execution(UT.TestCase):
+    """
+    Test cases for subpackage "procedure/execution"
+    """
+    def setUp(self):
+        self._prog = CircuitIO(1, 1)
+        self._prog.apply_gate('X', [0])
+        self._prog.apply_measure([0], [0])
+        self._policy = RetryPolicy(max_retries=2, base_delay=0.01)
+        reset_run_metrics()
+
+    def test_retry(self):
+        result = run_and_get_counts(FakeBackend(failures=2), self._prog, 10, retry_policy=self._policy)
+        self.assertEqual(result, {'1' : 10})
+        metrics = get_run_metrics()
+        self.assertEqual((metrics['attempts'], metrics['retried'], metrics['succeeded'], metrics['failed']),
+                         (3, 2, 1, 0))
+
+        qvm = FakeBackend(failures=3)
+        self.assertRaises(TransientRunError, run_and_get_counts, qvm, self._prog, 10, self._policy)
+        self.assertEqual(qvm.get_n_submissions(), 3)
+        self.assertEqual(get_run_metrics()['failed'], 1)
+
+    def test_error_types(self):
+        qvm = FakeBackend(failures=1, error_type=ValueError)
+        with self.assertRaises(QuantumRunError) as cm:
+            run_and_get_counts_batch(qvm, [self._prog, self._prog], 10, retry_policy=self._policy)
+        self.assertNotIsInstance(cm.exception, TransientRunError)
+        self.assertIsInstance(cm.exception.__cause__, ValueError)
+        self.assertEqual(qvm.get_n_submissions(), 1)
+
+        policy = RetryPolicy(max_retries=0, timeout=0.05)
+        self.assertRaises(RunTimeoutError, run_and_get_counts, FakeBackend(0.5), self._prog, 10, policy)
+        self.assertTrue(issubclass(RunTimeoutError, TimeoutError))
+        self.assertIsInstance(classify_error(concurrent.futures.TimeoutError()), TransientRunError)
+        self.assertEqual(get_run_metrics()['timeouts'], 1)
+
+    def test_backoff_delay(self):
+        policy = RetryPolicy(base_delay=1.0, backoff=2.0, max_delay=5.0, jitter=0.0)
+        self.assertEqual([policy.get_delay(k) for k in range(1, 5)], [1.0, 2.0, 4.0, 5.0])
+
+
+class Test_procedure_result_cache(UT.TestCase):
+    """
+    Test cases for subpackage "procedure/result_cache"
+    """
+    def _program(self, angle) -> CircuitIO:
+        cio = CircuitIO(2, 2)
+        cio.apply_gate('RY', [0], [angle])
+        cio.apply_gate('CX', [0, 1])
+        cio.apply_measure([0, 1], [0, 1])
+        return cio
+
+    def test_CircuitIO_hash(self):
+        self.assertEqual(self._program(1).get_hash(), self._program(1.0).get_hash())
+        self.assertEqual(self._program(1).get_hash(), self._program(numpy.float64(1)).get_hash())
+        self.assertEqual(self._program(sympy.Integer(1)).get_hash(), self._program(1).get_hash())
+        self.assertNotEqual(self._program(1).get_hash(), self._program(1.5).get_hash())
+        self.assertEqual(get_circuit_hash(self._program(0.5)), self._program(0.5).get_hash())
+
+    def test_cache(self):
+        cache = ResultCache(maxsize=2)
+        qvm = FakeBackend(seed=7, reseed=True)
+        first = run_and_get_counts(qvm, self._program(1.0), 100, cache=cache)
+        second = run_and_get_counts(qvm, self._program(1.0), 100, cache=cache)
+        self.assertEqual(first, second)
+        self.assertEqual(qvm.get_n_submissions(), 1)
+        run_and_get_counts(qvm, self._program(1.0), 50, cache=cache)
+        self.assertEqual(qvm.get_n_submissions(), 2)
+
+        results = run_and_get_counts_batch(qvm, [self._program(1.0), self._program(2.0)], 100, cache=cache)
+        self.assertEqual(results[0], first)
+        self.assertEqual(qvm.get_n_submissions(), 3)
+        self.assertEqual((cache.hits, cache.misses), (2, 3))
+
+        unseeded = FakeBackend()
+        run_and_get_counts(unseeded, self._program(1.0), 100, cache=cache)
+        run_and_get_counts(unseeded, self._program(1.0), 100, cache=cache)
+        self.assertEqual(unseeded.get_n_submissions(), 2)
+
+    def test_cache_repeated_runs(self):
+        # The seeded built-in simulators give fresh samples in repeated runs, which are not cached
+        cache = ResultCache()
+        cio = CircuitIO(1, 1)
+        cio.apply_gate('H', [0])
+        cio.apply_measure([0], [0])
+        for qvm in (StatevectorSimulator(seed=3), FakeBackend(seed=3)):
+            with self.subTest(type(qvm).__name__):
+                outputs = {tuple(run_and_get_counts(qvm, cio, 1, cache=cache)) for _ in range(20)}
+                self.assertEqual(outputs, {('0',), ('1',)})
+        self.assertEqual((cache.hits, cache.misses), (0, 0))
+
+        set_default_result_cache(cache)
+        try:
+            # tr(rho1 rho2) = 0.5 for |0> and |+>
+            state = apply_gate(CircuitIO(2), 'H', [1])
+            self.assertFalse(check_tr_rho1_rho2_equals_1(StatevectorSimulator(seed=5), state, [0], [1], 50,
+                                                         mode='sample'))
+        finally:
+            set_default_result_cache(None)
+
+    def test_disk_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            first = run_and_get_counts(FakeBackend(seed=7, reseed=True), self._program(1.0), 100,
+                                       cache=ResultCache(directory=directory))
+            qvm = FakeBackend(seed=7, reseed=True)
+            second = run_and_get_counts(qvm, self._program(1.0), 100, cache=ResultCache(directory=directory))
+            self.assertEqual(first, second)
+            self.assertEqual(qvm.get_n_submissions(), 0)
+
+
+class Test_procedure_profiling(UT.TestCase):
+    """
+    Test cases for subpackage "procedure/profiling"
+    """
+    def test_profile(self):
+        cio = CircuitIO(2, 2)
+        with profile() as p:
+            with profile(trace=False) as q:
+                apply_gate(cio, 'H', [0])
+            apply_gates(cio, [('CX', [0, 1]), ('RZ', [1], [0.5])])
+            apply_measure(cio, [0, 1], [0, 1])
+        apply_gate(cio, 'X', [0])
+        self.assertEqual(p.to_dict(), json.loads(p.to_json()))
+        stats = p.to_dict()['stats']
+        self.assertEqual({name : stats[name]['pyquantumkit']['count'] for name in stats}, {'GATE' : 2, 'GATES' : 1})
+        self.assertEqual(p.to_dict()['gates'], {'pyquantumkit' : {'H' : 1, 'CX' : 1, 'RZ' : 1, 'M' : 1}})
+        self.assertEqual(q.to_dict()['gates'], {'pyquantumkit' : {'H' : 1}})
+        self.assertTrue(all(item['time'] >= 0 for fms in stats.values() for item in fms.values()))
+
+        events = json.loads(p.to_chrome_trace())['traceEvents']
+        self.assertEqual([e['name'] for e in events], ['GATE', 'GATES', 'GATE'])
+        self.assertTrue(all(e['ph'] == 'X' and e['cat'] == 'pyquantumkit' for e in events))
+        self.assertEqual(json.loads(q.to_chrome_trace())['traceEvents'], [])
+        self.assertEqual(len(p.summary().splitlines()), 3)
+
+        with tempfile.TemporaryDirectory() as dirname:
+            fname = dirname + '/trace.json'
+            text = p.to_chrome_trace(fname)
+            with open(fname) as f:
+                self.assertEqual(f.read(), text)
+
+
+class Test_procedure_qasm(UT.TestCase):
+    """
+    Test cases for subpackage "procedure/qasm"
+    """
+    def _circuit(self) -> CircuitIO:
+        cio = CircuitIO(4, 3)
+        for g in ['I', 'X', 'Y', 'Z', 'S', 'T', 'H', 'SD', 'TD', 'SX', 'SXD']:
+            cio.apply_gate(g, [1])
+        for g in ['CX', 'CY', 'CZ', 'CH', 'SW', 'ISW', 'CS', 'CSD']:
+            cio.apply_gate(g, [2, 0])
+        for g in ['CCX', 'CCZ', 'CSW']:
+            cio.apply_gate(g, [3, 1, 0])
+        for (i, g) in enumerate(['RX', 'RY', 'RZ', 'U1']):
+            cio.apply_gate(g, [i], [0.1 * i - 1.3])
+        for (i, g) in enumerate(['RXX', 'RYY', 'RZZ', 'CRX', 'CRY', 'CRZ', 'CU1']):
+            cio.apply_gate(g, [i % 4, (i + 1) % 4], [2.5 - 0.7 * i])
+        cio.apply_gate('U3', [2], [0.25, -1e-05, 3])
+        cio.apply_measure([0, 2, 3], [2, 0, 1])
+        return cio
+
+    def test_library_gates(self):
+        def controlled(mat, ncontrols):
+            ret = numpy.eye(2 ** ncontrols * len(mat), dtype=complex)
+            ret[-len(mat):, -len(mat):] = mat
+            return ret
+        paras = [0.3, 1.1, -0.7]
+        cases = {
+            'u0(0.5) q[0];' : numpy.eye(2),
+            'cu3(0.3,1.1,-0.7) q[0],q[1];' : controlled(numeric_gate_matrix('U3', paras), 1),
+            'cu(0.3,1.1,-0.7,0.5) q[0],q[1];' : controlled(numpy.exp(0.5j) * numeric_gate_matrix('U3', paras), 1),
+            'csx q[0],q[1];' : controlled(numeric_gate_matrix('SX'), 1),
+            'c3x q[0],q[1],q[2],q[3];' : controlled(numeric_gate_matrix('X'), 3),
+            'c3sqrtx q[0],q[1],q[2],q[3];' : controlled(numeric_gate_matrix('SX'), 3),
+            'c4x q[0],q[1],q[2],q[3],q[4];' : controlled(numeric_gate_matrix('X'), 4),
+        }
+        for (input, output) in cases.items():
+            with self.subTest(input):
+                nqbits = int(math.log2(len(output)))
+                text = 'OPENQASM 2.0;\ninclude "qelib1.inc";\nqreg q[' + str(nqbits) + '];\n' + input
+                self.assertTrue(numpy.allclose(circuit_from_qasm(text).get_numpy_matrix(), output))
+        # rccx is the Toffoli gate up to the relative phases
+        mat = circuit_from_qasm('qreg q[3];\nrccx q[0],q[1],q[2];').get_numpy_matrix()
+        self.assertTrue(numpy.allclose(abs(mat), controlled(numeric_gate_matrix('X'), 2)))
+        # The library gates can be redefined
+        cio = circuit_from_qasm('qreg q[2];\ngate csx a, b { cx a, b; }\ncsx q[1],q[0];')
+        self.assertEqual(list(cio), [['CX', [1, 0], None]])
+
+    def test_round_trip(self):
+        cio = self._circuit()
+        for version in (2, 3):
+            with self.subTest(version):
+                text = circuit_to_qasm(cio, version)
+                self.assertEqual(circuit_from_qasm(text).get_canonical_text(), cio.get_canonical_text())
+                with tempfile.TemporaryDirectory() as directory:
+                    fname = directory + '/circuit.qasm'
+                    save_qasm(cio, fname, version)
+                    self.assertEqual(load_qasm(fname).get_hash(), cio.get_hash())
+
+    def test_gate_definitions(self):
+        # The definitions written into OpenQASM, expanded under other names
+        from pyquantumkit._qframes.extra._qasm import QASM2_Gate_Name, QASM2_Gate_Definition, QASM3_Gate_Definition
+        from pyquantumkit.simulator.gate import numeric_gate_matrix
+        for definitions in (QASM2_Gate_Definition, QASM3_Gate_Definition):
+            for g in definitions:
+                with self.subTest(definitions[g]):
+                    name = QASM2_Gate_Name[g]
+                    expected = numeric_gate_matrix(g, [0.7])
+                    nqbits = len(expected).bit_length() - 1
+                    text = 'OPENQASM 2.0;\nqreg q[' + str(nqbits) + '];\n'
+                    text += definitions[g].replace('gate ' + name, 'gate my_' + name) + '\n'
+                    text += 'my_' + name + ('(0.7) ' if '(' in definitions[g].split('{')[0] else ' ')
+                    text += ', '.join('q[' + str(i) + ']' for i in range(nqbits)) + ';\n'
+                    mat = circuit_from_qasm(text).get_numpy_matrix()
+                    k = numpy.argmax(abs(expected))
+                    phase = mat.flat[k] / expected.flat[k]
+                    self.assertAlmostEqual(abs(phase), 1.0)
+                    self.assertTrue(numpy.allclose(mat, phase * expected))
+
+    def test_read(self):
+        text = """OPENQASM 2.0;
+include "qelib1.inc";   // standard gates
+/* two quantum registers
+   and one classical register */
+qreg a[2]; qreg b[1];
+creg c[3];
+gate rot(theta, phi) x, y { rz(theta / 2) x; cx x, y; u2(phi, -pi) y; }
+h a;
+rot(pi/2, 2*pi^2) a[1], b[0];
+cx a, b;
+barrier a, b;
+measure a -> c[0:1]
+"""
+        self.assertRaises(PyQuantumKitError, circuit_from_qasm, text)
+        text = text.replace('c[0:1]\n', 'c;\n').replace('creg c[3]', 'creg c[2]; creg d[1]')
+        text = text.replace('measure a -> c;', 'measure a -> c;\nmeasure b[0] -> d[0];')
+        cio = circuit_from_qasm(text)
+        expected = [['H', [0], None], ['H', [1], None], ['RZ', [1], [numpy.pi / 4]], ['CX', [1, 2], None],
+                    ['U3', [2], [numpy.pi / 2, 2 * numpy.pi ** 2, -numpy.pi]],
+                    ['CX', [0, 2], None], ['CX', [1, 2], None], ['M', [0, 1, 2], [0, 1, 2]]]
+        self.assertEqual((cio.get_nqbits(), cio.get_ncbits()), (3, 3))
+        self.assertEqual(len(cio), len(expected))
+        for (item, exp) in zip(cio, expected):
+            self.assertEqual(item[:2], exp[:2])
+            if exp[2] is None:
+                self.assertIsNone(item[2])
+            else:
+                self.assertTrue(numpy.allclose(item[2], exp[2]))
+
+        text3 = 'OPENQASM 3.0;\ninclude "stdgates.inc";\nqubit[2] q;\nbit[2] c;\nh q[0];\ncp(pi/4) q[0], q[1];\n' \
+                'c[1] = measure q[0];\nc[0] = measure q[1];\n'
+        self.assertEqual(list(circuit_from_qasm(text3)),
+                         [['H', [0], None], ['CU1', [0, 1], [numpy.pi / 4]], ['M', [0, 1], [1, 0]]])
+        cases = [
+            'qreg q[1];\nfoo q[0];\n',          # undefined gate
+            'qreg q[1];\nh q[1];\n',            # index out of range
+            'qreg q[2];\ncx q[0];\n',           # wrong number of qubits
+            'qreg q[1];\nrx(theta) q[0];\n',    # undefined identifier
+            'qreg q[1];\nreset q[0];\n',        # unsupported statement
+            'qreg q[1];\nh q[0]',               # incomplete statement
+        ]
+        for input in cases:
+            with self.subTest(input):
+                self.assertRaises(PyQuantumKitError, circuit_from_qasm, input)
+
+    def test_symbolic(self):
+        t = sympy.Symbol('t', real = True)
+        cio = CircuitIO(2)
+        cio.apply_gate('RX', [0], [2 * t])
+        cio.apply_gate('CRZ', [0, 1], [sympy.sin(t) + 1])
+        self.assertRaises(PyQuantumKitError, circuit_to_qasm, cio, 2)
+        text = circuit_to_qasm(cio, 3)
+        self.assertIn('input float[64] t;', text)
+        self.assertEqual(circuit_from_qasm(text).get_canonical_text(), cio.get_canonical_text())
+        f = io.StringIO()
+        nchars = write_qasm(cio, f, 2, subsdict = {t : 0.5})
+        self.assertEqual(nchars, len(f.getvalue()))
+        self.assertTrue(numpy.allclose(circuit_from_qasm(f.getvalue()).get_numpy_matrix(),
+                                       cio.get_numpy_matrix({t : 0.5})))
+
+
+class Test_procedure_qasm_qiskit(UT.TestCase):
+    """
+    Test cases for subpackage "procedure/qasm" on the OpenQASM texts emitted by qiskit
+    """
+    def setUp(self):
+        self.skipTest('Do not test base class')
+
+    def test_qiskit_qasm2(self):
+        import qiskit
+        from qiskit.circuit.random import random_circuit
+        from qiskit.quantum_info import Operator
+        for seed in range(30):
+            with self.subTest(seed):
+                qc = random_circuit(4, 8, seed=seed)
+                cio = circuit_from_qasm(qiskit.qasm2.dumps(qc))
+                # qubit 0 of qiskit is the lowest bit
+                self.assertTrue(numeric_equivalence_check(cio.get_numpy_matrix(),
+                                                          Operator(qc.reverse_bits()).data))
+
+
+class Test_procedure_parameterized_qiskit(UT.TestCase):
+    """
+    Test cases for subpackage "procedure/parameterized" with the native parameters of qiskit
+    """
+    def setUp(self):
+        self.skipTest('Do not test base class')
+
+    def test_export_parameterized(self):
+        import qiskit
+        from qiskit_aer import Aer
+        t = sympy.Symbol('t')
+        s = sympy.Symbol('s', real = True)
+        cio = CircuitIO(2)
+        cio.apply_gate('H', [0])
+        cio.apply_gate('RX', [0], [2 * t])
+        cio.apply_gate('CRZ', [0, 1], [sympy.sin(s) + t])
+        cio.apply_gate('U3', [1], [t, 0.5, s / 2])
+
+        pc = cio.export_parameterized('qiskit', False)
+        self.assertTrue(pc.is_native())
+        self.assertEqual(pc.get_symbols(), [s, t])
+        params = pc.get_parameters()
+        self.assertTrue(all(isinstance(params[x], qiskit.circuit.Parameter) for x in (s, t)))
+        self.assertEqual(set(pc.get_circuit().parameters), set(params.values()))
+        transpiled = qiskit.transpile(pc.get_circuit(), Aer.get_backend('aer_simulator'))
+        for input in ((0.3, 1.2), (-2.0, 0.0), (1.5, -0.7)):
+            with self.subTest(input):
+                expected = cio.get_numpy_matrix({t : input[0], s : input[1]})
+                by_dict = pc.bind({t : input[0], s : input[1]})
+                by_list = pc.bind([input[1], input[0]])
+                self.assertEqual(len(by_dict.parameters), 0)
+                self.assertTrue(numeric_equivalence_check(get_circuit_matrix(by_dict), expected))
+                self.assertTrue(numeric_equivalence_check(get_circuit_matrix(by_list), expected))
+                bound = pc.bind([input[1], input[0]], transpiled)
+                self.assertEqual(len(bound.parameters), 0)
+                self.assertTrue(numeric_equivalence_check(get_circuit_matrix(bound), expected))
+        self.assertEqual(len(pc.get_circuit().parameters), 2)       # the exported circuit is not modified
+        self.assertRaises(PyQuantumKitError, pc.bind, {t : 1.0})
+
+
+class Test_procedure_import_qiskit(UT.TestCase):
+    """
+    Test cases for importing the native circuits of qiskit (procedure/generic.import_circuit)
+    """
+    def setUp(self):
+        self.skipTest('Do not test base class')
+
+    def test_global_phase(self):
+        import qiskit
+        from qiskit.quantum_info import Operator
+        qc = qiskit.QuantumCircuit(2, global_phase=0.3)
+        qc.h(0)
+        qc.cx(0, 1)
+        (cio, gphase) = import_circuit(qc, True)
+        self.assertAlmostEqual(gphase, 0.3)
+        self.assertIsInstance(import_circuit(qc), CircuitIO)
+        self.assertTrue(numeric_equivalence_check(get_circuit_matrix(qc, little_endian=True), Operator(qc).data,
+                                                  ignore_global_phase=False))
+
+        t = qiskit.circuit.Parameter('t')
+        qc = qiskit.QuantumCircuit(1, global_phase=t / 2)
+        qc.rz(t, 0)
+        self.assertTrue(numeric_equivalence_check(get_circuit_matrix(qc, {'t' : 0.8}),
+                                                  Operator(qc.assign_parameters({t : 0.8})).data,
+                                                  ignore_global_phase=False))
+
+
+    def test_definition_phase(self):
+        import qiskit
+        from qiskit.circuit.library import UnitaryGate
+        from qiskit.quantum_info import Operator, random_unitary
+        qc = qiskit.QuantumCircuit(3)
+        qc.ecr(0, 2)
+        qc.append(UnitaryGate(random_unitary(4, seed=7)), [2, 1])
+        qc.append(UnitaryGate(random_unitary(2, seed=8)), [0])
+        self.assertTrue(numeric_equivalence_check(get_circuit_matrix(qc, little_endian=True), Operator(qc).data,
+                                                  ignore_global_phase=False))
+
+class Test_procedure_circuit_binary(UT.TestCase):
+    """
+    Test cases for subpackage "procedure/circuit_binary"
+    """
+    def _circuit(self) -> CircuitIO:
+        t = sympy.Symbol('t', real = True)
+        cio = CircuitIO(300, 4)
+        cio.apply_gate('H', [0])
+        cio.apply_gate('CX', [0, 299])
+        cio.apply_gate('RX', [128], [0.25])
+        cio.apply_gate('U3', [5], [2 * t, -1e-300, sympy.pi / 3])
+        cio.apply_gate('CRZ', [7, 3], [2 * t])
+        cio.apply_gate('RZZ', [1, 2], [3])
+        cio.apply_measure(range(4), [3, 2, 1, 0])
+        return cio
+
+    def test_varints(self):
+        values = [0, 1, 127, 128, 255, 300, 16383, 16384, 2 ** 35 + 7, 2 ** 64 - 1]
+        data = encode_varints(values)
+        self.assertEqual(len(data), 1 + 1 + 1 + 2 + 2 + 2 + 2 + 3 + 6 + 10)
+        self.assertEqual(decode_varints(data), values)
+        self.assertEqual(decode_varints(encode_varints([])), [])
+
+    def test_round_trip(self):
+        cases = [self._circuit(), CircuitIO(3), CircuitIO()]
+        for input in cases:
+            with self.subTest(input.get_canonical_text()):
+                data = circuit_to_bytes(input)
+                output = circuit_from_bytes(data)
+                self.assertEqual(output.get_canonical_text(), input.get_canonical_text())
+                self.assertEqual(circuit_from_bytes(bytearray(data)).get_hash(), input.get_hash())
+        self.assertEqual(list(circuit_from_bytes(circuit_to_bytes(self._circuit())))[3][2][2], sympy.pi / 3)
+
+    def test_reader(self):
+        cio = self._circuit()
+        for _ in range(200):
+            cio.apply_gate('RY', [200], [0.5])
+        with tempfile.TemporaryDirectory() as directory:
+            fname = directory + '/circuit.pqkc'
+            save_circuit_binary(cio, fname)
+            self.assertEqual(load_circuit_binary(fname).get_hash(), cio.get_hash())
+            with CircuitBinaryReader(fname, chunk_bytes = 5) as reader:
+                self.assertEqual((reader.get_nqbits(), reader.get_ncbits(), len(reader)), (300, 4, len(cio)))
+                expected = [[g, list(qbits), paras] for (g, qbits, paras) in cio]
+                self.assertEqual(list(reader), expected)
+
+        data = circuit_to_bytes(cio)
+        cases = [b'', b'XXXX' + data[4:], data[:-3]]
+        for input in cases:
+            with self.subTest(input[:4]):
+                self.assertRaises(PyQuantumKitError, circuit_from_bytes, input)
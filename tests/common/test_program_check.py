@@ -3,12 +3,14 @@
 #    Author: Peixun Long
 #    Computing Center, Institute of High Energy Physics, CAS
 
+import itertools, random
 import unittest as UT
 from .common import *
 from pyquantumkit import *
 from pyquantumkit.classical.run_result import *
 from pyquantumkit.classical.common import *
 from pyquantumkit.procedure.generic import *
+from pyquantumkit.program_check.state_based import *
 
 
 class Test_program_check_program_relation(UT.TestCase):
@@ -22,6 +24,16 @@ class Test_program_check_program_relation(UT.TestCase):
     def setUp(self):
         self.skipTest('Do not test base class')
 
+    def test_random_seed(self):
+        from pyquantumkit.program_check.program_relation import _random_paulis
+        random.seed(11)
+        paulis = _random_paulis(5, 3)
+        numpy.random.seed(0)
+        random.seed(11)
+        self.assertEqual(_random_paulis(5, 3).tolist(), paulis.tolist())
+        random.seed(11)
+        self.assertEqual(paulis.tolist(), [[random.randint(0, 5) for _ in range(3)] for _ in range(5)])
+
     def test_run_equivalence_check(self):
         cases = {
             # PASS cases
@@ -219,3 +231,133 @@ class Test_program_check_matrix_based(UT.TestCase):
                 mat = p.get_numpy_matrix()
                 output = numeric_identity_check(mat, ign_gp)
                 self.assertEqual(output, cases[input])
+
+    def test_numeric_equivalence_check_blocks(self):
+        rng = numpy.random.default_rng(2)
+        (q, _) = numpy.linalg.qr(rng.normal(size=(32, 32)) + 1j * rng.normal(size=(32, 32)))
+        noise = 1e-3 * (rng.normal(size=(32, 32)) + 1j * rng.normal(size=(32, 32)))
+        cases = {
+            # (matrix 2, ignore global phase) : expected norm of difference
+            'equal' : (q * numpy.exp(0.7j), True),
+            'phase' : (q * numpy.exp(0.7j), False),
+            'noise' : (q + noise, True),
+        }
+        norms = [numpy_frobenius_norm, numpy_1_norm, numpy_inf_norm, numpy_2_norm]
+        for input in cases:
+            (mat2, ign_gp) = cases[input]
+            factor = mat2[numpy.unravel_index(numpy.argmax(numpy.abs(mat2)), mat2.shape)]
+            factor = q[numpy.unravel_index(numpy.argmax(numpy.abs(mat2)), mat2.shape)] / factor if ign_gp else 1.0
+            backup = mat2.copy()
+            for norm in norms:
+                with self.subTest((input, norm.__name__)):
+                    expected = norm(q - factor * mat2)
+                    tols = (expected * 0.999, expected * 1.001) if expected > 1e-9 else (1e-9,)
+                    for tol in tols:
+                        for block_size in (None, 100, 32 * 5):
+                            output = numeric_equivalence_check(q, mat2, ign_gp, tol, norm, block_size)
+                            self.assertEqual(output, expected <= tol)
+                    self.assertTrue(numpy.array_equal(mat2, backup))
+        self.assertTrue(numeric_equivalence_check(q, q * 1j, True, 1e-9, numpy_2_norm, 64, 'trace'))
+        self.assertRaises(PyQuantumKitError, numeric_equivalence_check, q, q, True, 0.1, numpy.linalg.norm, 64)
+
+    def test_numeric_identity_check_blocks(self):
+        rng = numpy.random.default_rng(3)
+        noise = 1e-3 * (rng.normal(size=(32, 32)) + 1j * rng.normal(size=(32, 32)))
+        matid = numpy.eye(32, dtype=complex)
+        norms = [numpy_frobenius_norm, numpy_1_norm, numpy_inf_norm, numpy_2_norm]
+        for mat in (matid * numpy.exp(0.7j), matid + noise, numpy.exp(0.7j) * (matid + noise)):
+            for (norm, ign_gp, phase) in itertools.product(norms, (True, False), ('entry', 'trace')):
+                expected = [numeric_equivalence_check(matid, mat, ign_gp, tol, norm, None, phase)
+                            for tol in (1e-9, 1e-2)]
+                with self.subTest((norm.__name__, ign_gp, phase)):
+                    for block_size in (None, 100, 32 * 5):
+                        self.assertEqual([numeric_identity_check(mat, ign_gp, tol, norm, block_size, phase)
+                                          for tol in (1e-9, 1e-2)], expected)
+
+    def test_get_circuit_matrix(self):
+        cio = CircuitIO(3)
+        apply_gates(cio, [('H', [0]), ('CX', [0, 2]), ('RY', [1], [0.3]), ('CRZ', [2, 1], [0.9]), ('T', [2])])
+        mat = get_circuit_matrix(cio)
+        self.assertTrue(numpy.allclose(mat, cio.get_numpy_matrix()))
+        # In little-endian mode, the matrix is the same as the circuit with the reversed qubits
+        rev = CircuitIO(3).append_circuit_io(cio, [2, 1, 0])
+        self.assertTrue(numpy.allclose(get_circuit_matrix(cio, little_endian=True), rev.get_numpy_matrix()))
+        apply_measure(cio, [0], [0])
+        self.assertRaises(PyQuantumKitError, get_circuit_matrix, cio)
+
+
+class Test_program_check_state_based(UT.TestCase):
+    """
+    Test cases for subpackage "program_check/state_based"
+    """
+    def test_circuit_equivalence_check(self):
+        cases = {
+            # PASS cases
+            (EmptyCir, CancelCir, False) : True,
+            (EmptyCir, CancelCir, True) : True,
+            (EmptyCir, OnlyGlobalPhase, True) : True,   # Eq when ignore the global phase
+            (Cir1A, Cir1B, False) : True,
+            (Cir1A, Cir1C, False) : True,
+            (Cir1A, Cir1B, True) : True,
+            (Cir1A, Cir1C, True) : True,
+            (U1gate, Rzgate, True) : True,
+
+            # special pass cases: equivalence gates
+            (Rxx_Normal, Rxx_Decomposition, False) : True,
+            (Ryy_Normal, Ryy_Decomposition, False) : True,
+            (Rzz_Normal, Rzz_Decomposition, False) : True,
+            (iSWAP_Normal, iSWAP_Decomposition, False) : True,
+            (CH_Normal, CH_Decomposition, False) : True,
+            (CS_Normal, CS_Decomposition, False) : True,
+            (CSD_Normal, CSD_Decomposition, False) : True,
+            (CU1_Normal, CU1_Decomposition, False) : True,
+            (SqrtX_Normal, SqrtX_Decomposition, False) : True,
+            (SqrtXdag_Normal, SqrtXdag_Decomposition, False) : True,
+            (Fredkin_Normal, Fredkin_Decomposition, False) : True,
+            (U3_Normal, U3_Decomposition, False) : True,
+            
+            # FAIL cases
+            (EmptyCir, OnlyGlobalPhase, False) : False,   # A difference about global phase
+            (EmptyCir, Empty_bug2, False) : False,
+            (EmptyCir, Empty_bug2, True) : False,
+            (Cir1B, Cir1A_bug1, False) : False,
+            (Cir1B, Cir1A_bug2, False) : False,
+            (Cir1B, Cir1A_bug3, False) : False,
+            (Cir1B, Cir1A_bug4, False) : False,
+            (Cir1B, Cir1A_bug1, True) : False,
+            (Cir1B, Cir1A_bug2, True) : False,
+            (Cir1B, Cir1A_bug3, True) : False,
+            (Cir1B, Cir1A_bug4, True) : False,
+            (U1gate, Rzgate, False) : False,
+        }
+        for input in cases:
+            with self.subTest(input):
+                p1 = input[0]('pyquantumkit')
+                p2 = input[1]('pyquantumkit')
+                ign_gp = input[2]
+                self.assertEqual(circuit_equivalence_check(p1, p2, ign_gp, seed=1), cases[input])
+                self.assertEqual(circuit_equivalence_check(p1, p2, ign_gp, states='stabilizer', nstates=16,
+                                                           seed=1), cases[input])
+                self.assertEqual(unitary_equivalence_check(p1, p2, ign_gp), cases[input])
+
+    def test_fidelity(self):
+        cio1 = CircuitIO(3)
+        cio1.apply_gate('H', [0])
+        cio1.apply_gate('CX', [0, 1])
+        cio1.apply_gate('RZ', [2], [0.4])
+        cio2 = CircuitIO(3)
+        cio2.apply_gate('H', [0])
+        cio2.apply_gate('CX', [0, 1])
+        cio2.apply_gate('RZ', [2], [0.6])
+        expected = math.cos(0.1) ** 2
+        (ret, fidelity) = unitary_equivalence_check(cio1, cio2, return_fidelity=True)
+        self.assertFalse(ret)
+        self.assertAlmostEqual(fidelity, expected)
+        (ret, fidelity) = circuit_equivalence_check(cio1, cio2, tolerance=0.2, nstates=200, seed=3,
+                                                    return_fidelity=True)
+        self.assertTrue(ret)
+        self.assertAlmostEqual(fidelity, expected, delta=0.02)
+
+        measured = CircuitIO(3, 1)
+        measured.apply_measure([0], [0])
+        self.assertRaises(PyQuantumKitError, circuit_equivalence_check, cio1, measured)
@@ -3,6 +3,7 @@
 #    Author: Peixun Long
 #    Computing Center, Institute of High Energy Physics, CAS
 
+import importlib
 import unittest as UT
 from pyquantumkit._qframes.code_translate import *
 from .common import is_exception
@@ -49,3 +50,37 @@ class Test_qframes_code_translate(UT.TestCase):
                 else:
                     self.assertEqual(get_standard_gatename(input), cases[input])
 
+
+class Test_qframes_import(UT.TestCase):
+    def test_import_gate_name(self):
+        for framework in ('qiskit', 'pyqpanda3', 'quafu', 'cqlib'):
+            names = importlib.import_module('pyquantumkit._qframes._' + framework).IMPORT_GATE_NAME
+            for (name, g) in names.items():
+                with self.subTest((framework, name)):
+                    records = g([0, 1, 2], [0.5, 1.5, 2.5]) if callable(g) else [(g, None, None)]
+                    for record in records:
+                        self.assertEqual(get_standard_gatename(record[0]), record[0])
+
+    def test_import_pyqpanda3_subcircuit(self):
+        # The daggered or controlled sub-circuits of pyqpanda3 are rejected (walked without pyqpanda3)
+        from pyquantumkit import PyQuantumKitError
+        translate = importlib.import_module('pyquantumkit._qframes._pyqpanda3')
+        class QCircuit:
+            def __init__(self, dagger, controls):
+                (self._dagger, self._controls) = (dagger, controls)
+            def is_dagger(self):
+                return self._dagger
+            def control_qubits(self):
+                return self._controls
+            def operations(self):
+                return []
+        class QProg:
+            def __init__(self, ops):
+                self._ops = ops
+            def operations(self):
+                return self._ops
+        for sub in (QCircuit(True, []), QCircuit(False, [1]), QProg([QCircuit(True, [0])])):
+            env = dict(qc=QProg([sub]), names=translate.IMPORT_GATE_NAME, ignored=translate.IMPORT_IGNORED,
+                       PyQuantumKitError=PyQuantumKitError)
+            with self.subTest(type(sub).__name__):
+                self.assertRaises(PyQuantumKitError, exec, translate.IMPORT(), env)
@@ -0,0 +1,490 @@
+# test: common/test_simulator.py
+#    2026/10/19
+#    Author: Peixun Long
+#    Computing Center, Institute of High Energy Physics, CAS
+
+import json, os, tempfile
+import unittest as UT
+from .common import *
+from pyquantumkit import *
+from pyquantumkit.simulator.gate import *
+from pyquantumkit.simulator.statevector import *
+from pyquantumkit.simulator.stabilizer import *
+from pyquantumkit.simulator.noise import *
+from pyquantumkit.simulator.density_matrix import *
+from pyquantumkit.simulator.mps import *
+from pyquantumkit.simulator.sharded import *
+from pyquantumkit.simulator.fusion import *
+from pyquantumkit.procedure.paulis import apply_exp_pauli
+from pyquantumkit.simulator.storage import *
+
+
+def random_state(nqbits : int, seed : int) -> numpy.ndarray:
+    rng = numpy.random.default_rng(seed)
+    v = rng.normal(size=2 ** nqbits) + 1j * rng.normal(size=2 ** nqbits)
+    return v / numpy.linalg.norm(v)
+
+
+class Test_simulator_gate(UT.TestCase):
+    """
+    Test cases for subpackage "simulator/gate"
+    """
+    def test_numeric_gate_matrix(self):
+        for input in Standard_Gate_Name:
+            with self.subTest(input):
+                if input == 'M':
+                    self.assertRaises(PyQuantumKitError, numeric_gate_matrix, input)
+                else:
+                    paras = [0.5, 0.6, 0.7]
+                    expected = numpy.array(symbol_gate_matrix(input, paras).evalf(), dtype=complex)
+                    self.assertTrue(numpy.allclose(numeric_gate_matrix(input, paras), expected))
+
+
+class Test_simulator_statevector(UT.TestCase):
+    """
+    Test cases for subpackage "simulator/statevector"
+    """
+    def test_evolve(self):
+        cases = {
+            Cir1A, Cir1C, CancelCir, CancelCir2, OnlyGlobalPhase, Rxx_Decomposition, Ryy_Decomposition,
+            iSWAP_Normal, CH_Decomposition, CU1_Normal, Fredkin_Decomposition, U3_Normal, SqrtX_Normal,
+        }
+        sim = StatevectorSimulator()
+        for input in cases:
+            with self.subTest(input):
+                cio = input('pyquantumkit')
+                v = random_state(cio.get_nqbits(), 7)
+                expected = cio.get_numpy_matrix() @ v
+                self.assertTrue(numpy.allclose(sim.evolve(cio, v), expected))
+
+    def test_run(self):
+        cases = {
+            # (nqbits, measure qbits, measure cbits) : result strings
+            (3, (0, 1, 2), (0, 1, 2)) : {'0010', '1110'},
+            (3, (2, 0), (0, 3)) : {'1000', '1001'},
+            (3, (1,), (2,)) : {'0000', '0010'},
+        }
+        sim = StatevectorSimulator(2026)
+        for input in cases:
+            with self.subTest(input):
+                cio = CircuitIO(input[0], 4)
+                cio.apply_gate('H', [0])
+                cio.apply_gate('CX', [0, 1])
+                cio.apply_gate('X', [2])
+                cio.apply_measure(list(input[1]), list(input[2]))
+                counts = run_and_get_counts(sim, cio, 200)
+                self.assertEqual(sum(counts.values()), 200)
+                self.assertEqual(get_result_str_set(counts), cases[input])
+
+    def test_run_mid_circuit_measure(self):
+        sim = StatevectorSimulator(2026)
+        cio = CircuitIO(2, 2)
+        cio.apply_gate('H', [0])
+        cio.apply_measure([0], [0])
+        cio.apply_gate('CX', [0, 1])
+        cio.apply_measure([1], [1])
+        counts = run_and_get_counts(sim, cio, 100)
+        self.assertEqual(sum(counts.values()), 100)
+        self.assertEqual(get_result_str_set(counts), {'00', '11'})
+
+
+class Test_simulator_stabilizer(UT.TestCase):
+    """
+    Test cases for subpackage "simulator/stabilizer"
+    """
+    def test_clifford_decomposition(self):
+        cases = {
+            'I' : ([0], None), 'X' : ([0], None), 'Y' : ([0], None), 'Z' : ([0], None),
+            'H' : ([0], None), 'S' : ([0], None), 'SD' : ([0], None), 'SX' : ([0], None),
+            'SXD' : ([0], None), 'CX' : ([1, 0], None), 'CY' : ([0, 1], None), 'CZ' : ([1, 0], None),
+            'SW' : ([0, 1], None), 'ISW' : ([1, 0], None), 'RX' : ([0], [math.pi / 2]),
+            'RY' : ([0], [-math.pi / 2]), 'RZ' : ([0], [3 * math.pi / 2]), 'U1' : ([0], [math.pi]),
+            'U3' : ([0], [math.pi / 2, math.pi, -math.pi / 2]), 'RXX' : ([0, 1], [math.pi / 2]),
+            'RYY' : ([1, 0], [math.pi / 2]), 'RZZ' : ([0, 1], [-math.pi / 2]), 'CU1' : ([1, 0], [math.pi]),
+            'CRX' : ([0, 1], [math.pi]), 'CRY' : ([1, 0], [-math.pi]), 'CRZ' : ([0, 1], [3 * math.pi]),
+        }
+        for input in cases:
+            with self.subTest(input):
+                (qbits, paras) = cases[input]
+                expected = CircuitIO(2)
+                expected.apply_gate(input, qbits, paras)
+                cio = CircuitIO(2)
+                for (op, q) in clifford_decomposition(input, qbits, paras):
+                    cio.apply_gate(op, q)
+                self.assertTrue(numeric_equivalence_check(expected.get_numpy_matrix(), cio.get_numpy_matrix()))
+        self.assertRaises(PyQuantumKitError, clifford_decomposition, 'T', [0])
+        self.assertRaises(PyQuantumKitError, clifford_decomposition, 'RX', [0], [0.3])
+
+    def test_run(self):
+        n = 120
+        cio = CircuitIO(n, n)
+        cio.apply_gate('H', [0])
+        for i in range(n - 1):
+            cio.apply_gate('CX', [i, i + 1])
+        cio.apply_measure(list(range(n)), list(range(n)))
+        self.assertTrue(is_clifford_circuit(cio))
+        counts = run_and_get_counts(StabilizerSimulator(1), cio, 1000)
+        self.assertEqual(set(counts), {'0' * n, '1' * n})
+        self.assertAlmostEqual(counts['0' * n] / 1000, 0.5, delta=0.1)
+
+        cio = CircuitIO(3, 3)
+        cio.apply_gate('H', [0])
+        cio.apply_measure([0], [0])
+        cio.apply_gate('CX', [0, 1])
+        cio.apply_gate('SX', [2])
+        cio.apply_gate('CY', [1, 2])
+        cio.apply_measure([1, 2], [1, 2])
+        counts = run_and_get_counts(StabilizerSimulator(2), cio, 1000)
+        self.assertEqual(get_result_str_set(counts), get_result_str_set(run_and_get_counts(StatevectorSimulator(2), cio, 1000)))
+        self.assertEqual(sum(counts.values()), 1000)
+
+        cio.apply_gate('T', [0])
+        self.assertFalse(is_clifford_circuit(cio))
+        self.assertEqual(sum(run_and_get_counts(StabilizerSimulator(3), cio, 10).values()), 10)
+        self.assertRaises(PyQuantumKitError, run_and_get_counts, StabilizerSimulator(3, False), cio, 10)
+
+    def test_program_check(self):
+        n = 100
+        cio = CircuitIO(n)
+        for i in range(n - 1):
+            cio.apply_gate('CX', [i, i + 1])
+            cio.apply_gate('S', [i])
+        for i in reversed(range(n - 1)):
+            cio.apply_gate('SD', [i])
+            cio.apply_gate('CX', [i, i + 1])
+        self.assertTrue(run_identity_check(StabilizerSimulator(), cio, 5))
+        self.assertTrue(run_keep_basis_check(StabilizerSimulator(), cio, 2, 3))
+        cio.apply_gate('H', [n - 1])
+        self.assertFalse(run_identity_check(StabilizerSimulator(), cio, 20))
+
+
+class Test_simulator_density_matrix(UT.TestCase):
+    """
+    Test cases for subpackage "simulator/density_matrix"
+    """
+    def test_noiseless(self):
+        cases = {
+            Cir1A, Cir1C, CancelCir, Rxx_Decomposition, iSWAP_Normal, CH_Decomposition, Fredkin_Decomposition,
+        }
+        for input in cases:
+            with self.subTest(input):
+                cio = input('pyquantumkit')
+                psi = StatevectorSimulator().get_statevector(cio)
+                rho = DensityMatrixSimulator().get_density_matrix(cio)
+                self.assertTrue(numpy.allclose(rho, numpy.outer(psi, psi.conj())))
+
+    def test_noise_channels(self):
+        for input in (depolarizing_kraus(0.1), depolarizing_kraus(0.2, 2), amplitude_damping_kraus(0.3),
+                      phase_damping_kraus(0.4)):
+            check_kraus(input)
+        self.assertRaises(PyQuantumKitError, depolarizing_kraus, 1.5)
+        self.assertRaises(PyQuantumKitError, NoiseModel().add_gate_noise, [numpy.eye(2) * 2])
+
+        cio = CircuitIO(3)
+        cio.apply_gate('H', [0])
+        cio.apply_gate('CX', [0, 1])
+        cio.apply_gate('CX', [1, 2])
+        noise = NoiseModel().add_gate_noise(depolarizing_kraus(0.1), 'H').add_gate_noise(depolarizing_kraus(0.05, 2), 'CX')
+        rho = DensityMatrixSimulator(noise).get_density_matrix(cio)
+        self.assertAlmostEqual(numpy.trace(rho).real, 1.0)
+        self.assertTrue(numpy.allclose(rho, rho.conj().T))
+        self.assertLess(numpy.trace(rho @ rho).real, 0.99)
+        self.assertRaises(PyQuantumKitError, DensityMatrixSimulator(NoiseModel().add_gate_noise(
+                          depolarizing_kraus(0.1, 2))).get_density_matrix, cio)
+
+        cio = CircuitIO(1)
+        cio.apply_gate('X', [0])
+        rho = DensityMatrixSimulator(NoiseModel().add_gate_noise(amplitude_damping_kraus(0.3), 'X')).get_density_matrix(cio)
+        self.assertTrue(numpy.allclose(rho, numpy.diag([0.3, 0.7])))
+
+    def test_run(self):
+        cio = CircuitIO(2, 2)
+        cio.apply_gate('X', [0])
+        cio.apply_measure([0, 1], [0, 1])
+        noise = NoiseModel().add_readout_error(0.1, 0.2)
+        counts = run_and_get_counts(DensityMatrixSimulator(noise, 2026), cio, 4000)
+        self.assertEqual(sum(counts.values()), 4000)
+        self.assertAlmostEqual(counts.get('10', 0) / 4000, 0.8 * 0.9, delta=0.05)
+        self.assertAlmostEqual(counts.get('01', 0) / 4000, 0.2 * 0.1, delta=0.02)
+
+        cio = CircuitIO(2, 2)
+        cio.apply_gate('H', [0])
+        cio.apply_measure([0], [0])
+        cio.apply_gate('CX', [0, 1])
+        cio.apply_measure([1], [1])
+        counts = run_and_get_counts(DensityMatrixSimulator(seed=2026), cio, 200)
+        self.assertEqual(sum(counts.values()), 200)
+        self.assertEqual(get_result_str_set(counts), {'00', '11'})
+
+    def test_swap_expectation(self):
+        cio = CircuitIO(3)
+        cio.apply_gate('RY', [0], [0.4])
+        cio.apply_gate('RY', [1], [0.4])
+        self.assertAlmostEqual(DensityMatrixSimulator().get_swap_expectation(cio, [0], [1]), 1.0)
+        noise = NoiseModel().add_gate_noise(depolarizing_kraus(0.5), 'RY')
+        # tr(rho^2) = (1 + (1 - p)^2) / 2 for depolarized pure states
+        self.assertAlmostEqual(DensityMatrixSimulator(noise).get_swap_expectation(cio, [0], [1]), 0.625)
+
+
+class Test_simulator_mps(UT.TestCase):
+    """
+    Test cases for subpackage "simulator/mps"
+    """
+    def test_get_statevector(self):
+        cases = {
+            Cir1A, Cir1C, CancelCir, Rxx_Decomposition, iSWAP_Normal, CH_Decomposition, Fredkin_Decomposition,
+            CU1_Normal, U3_Normal,
+        }
+        for input in cases:
+            with self.subTest(input):
+                cio = input('pyquantumkit')
+                expected = StatevectorSimulator().get_statevector(cio)
+                self.assertTrue(numpy.allclose(MPSSimulator(max_bond=None).get_statevector(cio), expected))
+
+    def test_truncation(self):
+        cio = CircuitIO(6)
+        for i in range(6):
+            cio.apply_gate('H', [i])
+        for i in range(5):
+            cio.apply_gate('CRX', [i, 5 - i], [0.3 * i + 0.5])
+            cio.apply_gate('CU1', [5 - i, i], [0.7 * i + 0.4])
+            cio.apply_gate('RZZ', [i, i + 1], [0.9])
+        sim = MPSSimulator(max_bond=None)
+        mps = sim.get_mps(cio)
+        self.assertAlmostEqual(sim.get_truncation_error(), 0.0)
+        sim = MPSSimulator(max_bond=2)
+        mps = sim.get_mps(cio)
+        self.assertLessEqual(max(mps.get_bond_dimensions()), 2)
+        self.assertGreater(sim.get_truncation_error(), 0.0)
+        self.assertAlmostEqual(abs(mps.inner(mps)), 1.0)
+
+    def test_run(self):
+        n = 60
+        cio = CircuitIO(n, n)
+        cio.apply_gate('H', [0])
+        for i in range(1, n):
+            cio.apply_gate('CX', [0, i])
+        cio.apply_measure(list(range(n)), list(range(n)))
+        counts = run_and_get_counts(MPSSimulator(seed=1), cio, 1000)
+        self.assertEqual(set(counts), {'0' * n, '1' * n})
+        self.assertAlmostEqual(counts['0' * n] / 1000, 0.5, delta=0.1)
+
+        cio = CircuitIO(3, 3)
+        cio.apply_gate('H', [0])
+        cio.apply_measure([0], [0])
+        cio.apply_gate('CX', [0, 2])
+        cio.apply_measure([2, 1], [1, 2])
+        counts = run_and_get_counts(MPSSimulator(seed=2), cio, 100)
+        self.assertEqual(sum(counts.values()), 100)
+        self.assertEqual(get_result_str_set(counts), {'000', '110'})
+
+    def test_swap_expectation(self):
+        cio = CircuitIO(4, 1)
+        cio.apply_gate('RY', [0], [0.8])
+        cio.apply_gate('CX', [0, 1])
+        cio.apply_gate('H', [2])
+        cio.apply_measure([1], [0])
+        cio.apply_gate('RX', [3], [0.5])
+        expected = StatevectorSimulator().get_swap_expectation(cio, [0, 1], [2, 3])
+        self.assertAlmostEqual(MPSSimulator().get_swap_expectation(cio, [0, 1], [2, 3]), expected)
+        branches = MPSSimulator().get_branches(cio)
+        self.assertEqual(len(branches), 2)
+        self.assertAlmostEqual(sum(p for (p, mps) in branches), 1.0)
+
+    def test_program_check(self):
+        n = 12
+        cio = CircuitIO(n)
+        for i in range(n - 1):
+            cio.apply_gate('RXX', [i, n - 1 - i], [0.3])
+            cio.apply_gate('CRZ', [i + 1, i], [0.5])
+        cio.inverse()
+        for i in range(n - 1):
+            cio.apply_gate('RXX', [i, n - 1 - i], [0.3])
+            cio.apply_gate('CRZ', [i + 1, i], [0.5])
+        self.assertTrue(run_identity_check(MPSSimulator(seed=3), cio, 5))
+        cio.apply_gate('H', [0])
+        self.assertFalse(run_identity_check(MPSSimulator(seed=3), cio, 20))
+
+
+class Test_simulator_sharded(UT.TestCase):
+    """
+    Test cases for subpackage "simulator/sharded"
+    """
+    def test_get_statevector(self):
+        cio = CircuitIO(6)
+        for i in range(6):
+            cio.apply_gate('H', [i])
+            cio.apply_gate('CRY', [i, 5 - i], [0.3 * i + 0.2])
+        cio.apply_gate('CCX', [0, 1, 5])
+        cio.apply_gate('CSW', [5, 0, 3])
+        cio.apply_gate('RZZ', [1, 0], [0.7])
+        expected = StatevectorSimulator().get_statevector(cio)
+        for nworkers in (1, 2, 4):
+            with self.subTest(nworkers):
+                with ShardedStatevectorSimulator(nworkers, min_sharded_qubits=4) as sim:
+                    self.assertEqual(sim.get_nshards(6), nworkers)
+                    self.assertTrue(numpy.allclose(sim.get_statevector(cio), expected))
+
+    def test_run(self):
+        cio = CircuitIO(5, 3)
+        cio.apply_gate('H', [0])
+        cio.apply_gate('CX', [0, 4])
+        cio.apply_gate('X', [2])
+        cio.apply_measure([4, 2, 1], [0, 1, 2])
+        with ShardedStatevectorSimulator(4, 2026, min_sharded_qubits=4) as sim:
+            counts = run_and_get_counts(sim, cio, 200)
+            self.assertEqual(sum(counts.values()), 200)
+            self.assertEqual(get_result_str_set(counts), {'010', '110'})
+            cio.apply_gate('H', [0])
+            self.assertRaises(PyQuantumKitError, sim.run, cio, 10)
+
+
+class Test_simulator_fusion(UT.TestCase):
+    """
+    Test cases for subpackage "simulator/fusion"
+    """
+    def test_fuse_gates(self):
+        cio = CircuitIO(5)
+        for layer in range(4):
+            multi_apply_sqgate(cio, 'RY', list(range(5)), [0.2 * layer + 0.1])
+            for i in range(layer % 2, 4, 2):
+                apply_exp_pauli(cio, 'XZ', 0.3, [i, i + 1])
+            cio.apply_gate('CCX', [4, 0, 2])
+            cio.apply_gate('I', [3])
+        expected = cio.get_numpy_matrix()
+        nblocks = []
+        for k in range(5):
+            with self.subTest(k):
+                blocks = fuse_gates(cio, k)
+                self.assertTrue(all(len(qbits) <= max(k, 3) for (_, qbits) in blocks))
+                mat = numpy.eye(32, dtype=complex).reshape(-1)
+                for (gatemat, qbits) in blocks:
+                    mat = apply_matrix_to_state(mat, gatemat, qbits, 10)
+                self.assertTrue(numpy.allclose(mat.reshape(32, 32), expected))
+                self.assertTrue(numpy.allclose(StatevectorSimulator(fusion=k).get_unitary(cio), expected))
+                nblocks.append(len(blocks))
+        self.assertEqual(nblocks[0], len(cio) - 4)
+        self.assertEqual(sorted(nblocks, reverse=True), nblocks)
+        self.assertLess(nblocks[3], nblocks[0] // 2)
+
+    def test_measure(self):
+        cio = CircuitIO(2, 2)
+        cio.apply_gate('H', [0])
+        cio.apply_gate('H', [1])
+        cio.apply_measure([0], [0])
+        cio.apply_gate('H', [0])
+        cio.apply_gate('CX', [0, 1])
+        cio.apply_measure([1], [1])
+        blocks = fuse_gates(cio, 2)
+        self.assertEqual([b[0] for b in blocks if isinstance(b[0], str)], ['M', 'M'])
+        self.assertTrue(isinstance(blocks[0][0], numpy.ndarray) and blocks[0][1] == [0])
+        for k in (0, 2):
+            with self.subTest(k):
+                counts = run_and_get_counts(StatevectorSimulator(2026, fusion=k), cio, 100)
+                self.assertEqual(sum(counts.values()), 100)
+                self.assertEqual(get_result_str_set(counts), {'00', '01', '10', '11'})
+
+
+class _Interrupted(Exception):
+    pass
+
+
+class _InterruptedBlocks(list):
+    def __init__(self, blocks : list, stop : int) -> None:
+        super().__init__(blocks)
+        self.stop = stop
+
+    def __getitem__(self, index):
+        if index == self.stop:
+            raise _Interrupted()
+        return super().__getitem__(index)
+
+
+class Test_simulator_storage(UT.TestCase):
+    """
+    Test cases for subpackage "simulator/storage"
+    """
+    def test_apply_matrix_blocked(self):
+        mat = numeric_gate_matrix('CSW')
+        for qbits in ([0, 1, 2], [4, 0, 5], [5, 3, 4], [1, 5, 0]):
+            with self.subTest(qbits):
+                v = random_state(6, 11)
+                expected = apply_matrix_to_state(v, mat, qbits, 6)
+                apply_matrix_blocked(v, v, mat, qbits, 6, 2)
+                self.assertTrue(numpy.allclose(v, expected))
+                self.assertTrue(numpy.allclose(get_probabilities_blocked(v, [5, 1, 3], 6, 2),
+                                               get_probabilities(v, [5, 1, 3], 6)))
+
+    def test_simulator(self):
+        cases = {
+            Cir1A, Cir1C, CancelCir, Rxx_Decomposition, iSWAP_Normal, CH_Decomposition, Fredkin_Decomposition,
+        }
+        for checkpoint in (False, True):
+            storage = MemmapStorage(chunk_qubits=1, checkpoint=checkpoint)
+            sim = StatevectorSimulator(storage=storage)
+            for input in cases:
+                with self.subTest((checkpoint, input)):
+                    cio = input('pyquantumkit')
+                    psi = sim.get_statevector(cio)
+                    self.assertIsInstance(psi, numpy.memmap)
+                    self.assertTrue(numpy.allclose(psi, StatevectorSimulator().get_statevector(cio)))
+                    self.assertTrue(numpy.allclose(sim.get_unitary(cio), cio.get_numpy_matrix()))
+            storage.clear()
+
+        cio = CircuitIO(4, 4)
+        cio.apply_gate('H', [0])
+        cio.apply_gate('CX', [0, 3])
+        cio.apply_gate('X', [2])
+        cio.apply_measure([3, 2, 1], [0, 1, 2])
+        storage = MemmapStorage(chunk_qubits=2)
+        counts = run_and_get_counts(StatevectorSimulator(2026, storage=storage), cio, 200)
+        self.assertEqual(get_result_str_set(counts), {'0100', '1100'})
+        cio.apply_gate('H', [0])
+        self.assertRaises(PyQuantumKitError, run_and_get_counts, StatevectorSimulator(storage=storage), cio, 10)
+        storage.clear()
+
+    def test_checkpoint(self):
+        cio = CircuitIO(5)
+        for i in range(5):
+            cio.apply_gate('H', [i])
+            cio.apply_gate('CRY', [i, (i + 2) % 5], [0.4 * i + 0.1])
+        blocks = fuse_gates(cio, 0)
+        expected = StatevectorSimulator().get_statevector(cio)
+        with tempfile.TemporaryDirectory() as directory:
+            storage = MemmapStorage(directory, chunk_qubits=2, checkpoint=True)
+            self.assertRaises(_Interrupted, storage.evolve, _InterruptedBlocks(blocks, 6), 5, None, 'cio')
+            with open(os.path.join(directory, 'checkpoint.json')) as f:
+                self.assertEqual(json.load(f)['done'], 6)
+            # resume from the checkpoint: the interrupted blocks are not applied again
+            psi = storage.evolve(_InterruptedBlocks(blocks, 3), 5, None, 'cio')
+            self.assertTrue(numpy.allclose(psi, expected))
+            del psi
+
+    def test_checkpoint_invalidated(self):
+        cio = CircuitIO(3)
+        cio.apply_gate('H', [0])
+        cio.apply_gate('CX', [0, 1])
+        cio.apply_gate('X', [2])
+        expected = StatevectorSimulator().get_statevector(cio)
+        other = CircuitIO(4)
+        other.apply_gate('H', [3])
+        with tempfile.TemporaryDirectory() as directory:
+            sim = StatevectorSimulator(storage=MemmapStorage(directory, chunk_qubits=1, checkpoint=True))
+            self.assertTrue(numpy.allclose(sim.get_statevector(cio), expected))
+            # an unkeyed evolve (with a given initial state) rewrites the files
+            init = numpy.zeros(8, dtype=complex)
+            init[7] = 1.0
+            self.assertFalse(numpy.allclose(sim.evolve(cio, state=init), expected))
+            self.assertTrue(numpy.allclose(sim.get_statevector(cio), expected))
+            # a simulation with another number of qubits resizes the files
+            sim.get_statevector(other)
+            self.assertTrue(numpy.allclose(sim.get_statevector(cio), expected))
+            storage = MemmapStorage(directory, chunk_qubits=1, checkpoint=True)
+            blocks = fuse_gates(cio, 0)
+            storage.evolve(blocks, 3, None, 'cio')
+            storage.evolve([], 4, None, 'other')
+            self.assertTrue(numpy.allclose(storage.evolve(blocks, 3, None, 'cio'), expected))
+            # the checkpoint records the initial state
+            psi = storage.evolve(blocks, 3, init, 'cio')
+            self.assertTrue(numpy.allclose(psi, StatevectorSimulator().evolve(cio, init)))
+            del psi
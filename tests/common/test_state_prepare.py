@@ -4,6 +4,7 @@
 #    Computing Center, Institute of High Energy Physics, CAS
 
 import unittest as UT
+import numpy
 from .common import *
 from pyquantumkit import *
 from pyquantumkit.classical.run_result import *
@@ -328,6 +329,22 @@ class Test_state_prepare_int_state(UT.TestCase):
                                                 num1, num2, phi, qbitlist)
                     self.assertTrue(result)
 
+    def test_ket_int_ops(self):
+        numbers = [22, 9, 0, 2 ** 70 + 3]
+        expected = [{'01101'}, {'10010'}, {'00000'}, {'11000'}]
+        ops = ket_int_le_ops(numpy.array(numbers[0:3]), range(5)) + ket_int_le_ops(numbers[3:], range(5))
+        for i in range(len(numbers)):
+            with self.subTest(numbers[i]):
+                result = T_measure_result(self._fm, self._qvm, 5, apply_gates, ops[i])
+                self.assertEqual(result, expected[i])
+        ops = ket_int_plus_eiphi_neg_le_ops(numbers, 2.0, range(5))
+        for i in range(len(numbers)):
+            with self.subTest(numbers[i]):
+                qc1 = apply_gates(new_circuit(self._fm, 5), ops[i])
+                qc2 = create_ket_int_plus_eiphi_neg_le(new_circuit(self._fm, 5), numbers[i], 2.0, range(5))
+                self.assertEqual(get_circuit_hash(qc1), get_circuit_hash(qc2))
+        self.assertRaises(ValueError, ket_int_le_ops, [3, -1], range(5))
+
 
 
 class Test_state_prepare_by_string(UT.TestCase):
@@ -513,3 +530,17 @@ class Test_state_prepare_pauli_eigenstate(UT.TestCase):
                                                 create_pauli_eigenstate, uncompute_pauli_eigenstate,
                                                 paulilist, qbitlist)
                     self.assertTrue(result)
+
+    def test_pauli_eigenstate_ops(self):
+        paulis = numpy.array([[0, 1, 2, 3, 4, 5], [5, 4, 3, 2, 1, 0], [4, 4, 5, 5, 3, 2]])
+        ops = pauli_eigenstate_ops(paulis, range(6))
+        unops = pauli_eigenstate_ops(paulis, range(6), uncompute=True)
+        for i in range(len(paulis)):
+            with self.subTest(i):
+                qc = create_pauli_eigenstate(new_circuit(self._fm, 6), list(paulis[i]), range(6))
+                self.assertEqual(get_circuit_hash(apply_gates(new_circuit(self._fm, 6), ops[i])),
+                                 get_circuit_hash(qc))
+                result = T_identity_mp(self._fm, self._qvm, 6, [apply_gates, apply_gates], [[ops[i]], [unops[i]]])
+                self.assertTrue(result)
+        self.assertRaises(ValueError, pauli_eigenstate_ops, [[0, 6]], range(2))
+        self.assertRaises(ValueError, pauli_eigenstate_ops, [[0, 1, 2]], range(2))
@@ -5,10 +5,16 @@
 
 import unittest as UT
 from tests.common.test_classical import Test_classical_common, Test_classical_run_result
-from tests.common.test_qframes import Test_qframes_code_translate
-from tests.common.test_procedure import Test_procedure_circuit_io
+from tests.common.test_qframes import Test_qframes_code_translate, Test_qframes_import
+from tests.common.test_procedure import Test_procedure_circuit_io, Test_procedure_job, \
+                                      Test_procedure_execution, Test_procedure_result_cache, Test_procedure_qasm, \
+                                      Test_procedure_circuit_binary, Test_procedure_profiling
 from tests.common.test_symbol import Test_symbol_gate, Test_symbol_circuit
-from tests.common.test_program_check import Test_program_check_matrix_based
+from tests.common.test_program_check import Test_program_check_matrix_based, Test_program_check_state_based
+from tests.common.test_simulator import Test_simulator_gate, Test_simulator_statevector, Test_simulator_stabilizer, \
+                                     Test_simulator_density_matrix, Test_simulator_mps, \
+                                     Test_simulator_sharded, Test_simulator_fusion, Test_simulator_storage
+from tests.common.test_library import Test_library_swaptest, Test_library_qft
 
 if __name__ == '__main__':
     UT.main()
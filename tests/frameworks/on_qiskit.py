@@ -8,6 +8,7 @@ import unittest as UT
 import tests.common.test_procedure as T_P
 import tests.common.test_state_prepare as T_SP
 import tests.common.test_program_check as T_PC
+import tests.common.test_library as T_L
 
 RUN_TEST_FRAMEWORK = 'qiskit'
 RUN_TEST_MACHINE = Aer.get_backend('aer_simulator')
@@ -22,6 +23,18 @@ class On_qiskit_Test_procedure_paulis(T_P.Test_procedure_paulis):
     def setUp(self):
         self._fm = RUN_TEST_FRAMEWORK
         self._qvm = RUN_TEST_MACHINE
+
+class On_qiskit_Test_procedure_qasm(T_P.Test_procedure_qasm_qiskit):
+    def setUp(self):
+        pass
+
+class On_qiskit_Test_procedure_import(T_P.Test_procedure_import_qiskit):
+    def setUp(self):
+        pass
+
+class On_qiskit_Test_procedure_parameterized(T_P.Test_procedure_parameterized_qiskit):
+    def setUp(self):
+        pass
 # END ---------- procedure ----------
 
 # BEGIN ---------- state_prepare ----------
@@ -48,5 +61,12 @@ class On_qiskit_Test_program_check_program_relation(T_PC.Test_program_check_prog
         self._qvm = RUN_TEST_MACHINE
 # END ---------- program_check ----------
 
+# BEGIN ---------- library ----------
+class On_qiskit_Test_library_kernel(T_L.Test_library_kernel):
+    def setUp(self):
+        self._fm = RUN_TEST_FRAMEWORK
+        self._qvm = RUN_TEST_MACHINE
+# END ---------- library ----------
+
 if __name__ == '__main__':
     UT.main()
@@ -0,0 +1,67 @@
+# test: frameworks/on_simulator.py
+#    2026/10/19
+#    Author: Peixun Long
+#    Computing Center, Institute of High Energy Physics, CAS
+
+from pyquantumkit.simulator.statevector import StatevectorSimulator
+from pyquantumkit.simulator.mps import MPSSimulator
+import unittest as UT
+import tests.common.test_procedure as T_P
+import tests.common.test_state_prepare as T_SP
+import tests.common.test_program_check as T_PC
+import tests.common.test_library as T_L
+
+RUN_TEST_FRAMEWORK = 'pyquantumkit'
+RUN_TEST_MACHINE = StatevectorSimulator()
+RUN_TEST_MACHINE_MPS = MPSSimulator()
+
+# BEGIN ---------- procedure ----------
+class On_simulator_Test_procedure_generic(T_P.Test_procedure_generic):
+    def setUp(self):
+        self._fm = RUN_TEST_FRAMEWORK
+        self._qvm = RUN_TEST_MACHINE
+
+class On_simulator_Test_procedure_paulis(T_P.Test_procedure_paulis):
+    def setUp(self):
+        self._fm = RUN_TEST_FRAMEWORK
+        self._qvm = RUN_TEST_MACHINE
+# END ---------- procedure ----------
+
+# BEGIN ---------- state_prepare ----------
+class On_simulator_Test_state_prepare_int_state(T_SP.Test_state_prepare_int_state):
+    def setUp(self):
+        self._fm = RUN_TEST_FRAMEWORK
+        self._qvm = RUN_TEST_MACHINE
+
+class On_simulator_Test_state_prepare_by_string(T_SP.Test_state_prepare_by_string):
+    def setUp(self):
+        self._fm = RUN_TEST_FRAMEWORK
+        self._qvm = RUN_TEST_MACHINE
+
+class On_simulator_Test_state_prepare_pauli_eigenstate(T_SP.Test_state_prepare_pauli_eigenstate):
+    def setUp(self):
+        self._fm = RUN_TEST_FRAMEWORK
+        self._qvm = RUN_TEST_MACHINE
+# END ---------- state_prepare ----------
+
+# BEGIN ---------- program_check ----------
+class On_simulator_Test_program_check_program_relation(T_PC.Test_program_check_program_relation):
+    def setUp(self):
+        self._fm = RUN_TEST_FRAMEWORK
+        self._qvm = RUN_TEST_MACHINE
+
+class On_simulator_mps_Test_program_check_program_relation(T_PC.Test_program_check_program_relation):
+    def setUp(self):
+        self._fm = RUN_TEST_FRAMEWORK
+        self._qvm = RUN_TEST_MACHINE_MPS
+# END ---------- program_check ----------
+
+# BEGIN ---------- library ----------
+class On_simulator_Test_library_kernel(T_L.Test_library_kernel):
+    def setUp(self):
+        self._fm = RUN_TEST_FRAMEWORK
+        self._qvm = RUN_TEST_MACHINE
+# END ---------- library ----------
+
+if __name__ == '__main__':
+    UT.main()